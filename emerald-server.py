@@ -7,22 +7,360 @@ No data leaves. No telemetry. No tracking. No sharing.
 Personal information is non-negotiable.
 """
 
+import argparse
+import html
 import http.server
+import io
+import json
 import os
+import signal
+import socket
 import sys
+import threading
+import time
+import urllib.parse
+from bisect import bisect_left
+from collections import OrderedDict
 
 PORT = 7777
 SERVE_DIR = os.path.expanduser('~')
+SCRIPT = os.path.abspath(__file__)
 
 os.chdir(SERVE_DIR)
 
 BRIEF_PATH = os.path.expanduser('~/.l7/state/health-brief.txt')
+BRIEF_POLL_SECONDS = 1.0
+SSE_KEEPALIVE_SECONDS = 15
+BRIEF_MISSING = 'Heart has not generated a brief yet. Waiting for first system check.'
+LISTING_PAGE_SIZE = 500
+LISTING_PAGE_MAX = 5000
+LISTING_CACHE_DIRS = 256
+# Only these paths are ever recorded by name; everything else is a route class.
+METRIC_PATHS = {'/brief': 'brief', '/brief/stream': 'brief_stream', '/metrics': 'metrics'}
+METRICS_CLIENTS = ('127.0.0.1', '::1', '::ffff:127.0.0.1')
+# With --workers, each worker's counters land here and /metrics sums them
+METRICS_DIR = os.path.expanduser('~/.l7/state/emerald-metrics')
+METRICS_FLUSH_SECONDS = 1.0
+DRAIN_SECONDS = 30
+# Set in a worker once it stops accepting; open streams wind down.
+DRAINING = threading.Event()
+
+
+class BriefWatcher:
+    """One shared watcher for the health brief.
+
+    Polls the file's mtime, reads it once per change and wakes every
+    /brief/stream subscriber. N listeners cost one stat per interval.
+    """
+
+    def __init__(self, path, interval=BRIEF_POLL_SECONDS):
+        self.path = path
+        self.interval = interval
+        self._cond = threading.Condition()
+        self._stamp = None
+        self._content = None
+        self._version = 0
+        self._thread = None
+
+    def start(self):
+        with self._cond:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name='brief-watcher', daemon=True)
+        self.poll()
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            self.poll()
+
+    def poll(self):
+        """Re-read the brief only if its mtime, size or inode changed."""
+        try:
+            st = os.stat(self.path)
+            stamp = (st.st_mtime_ns, st.st_size, st.st_ino)
+        except FileNotFoundError:
+            stamp = None
+        if stamp == self._stamp and self._version:
+            return
+        content = None
+        if stamp is not None:
+            try:
+                with open(self.path, 'r') as f:
+                    content = f.read()
+            except FileNotFoundError:
+                stamp = None
+        with self._cond:
+            if self._version and content == self._content:
+                self._stamp = stamp
+                return
+            self._stamp = stamp
+            self._content = content
+            self._version += 1
+            self._cond.notify_all()
+
+    def wait(self, version, timeout):
+        """Block until the brief moves past `version`. Returns (version, content)."""
+        self.start()
+        with self._cond:
+            self._cond.wait_for(lambda: self._version != version, timeout)
+            return self._version, self._content
+
+
+BRIEF = BriefWatcher(BRIEF_PATH)
+
+
+def sse_event(event, data, event_id=None):
+    """Encode one Server-Sent Event frame."""
+    lines = [f'event: {event}']
+    if event_id is not None:
+        lines.append(f'id: {event_id}')
+    lines.extend(f'data: {line}' for line in data.split('\n'))
+    return ('\n'.join(lines) + '\n\n').encode('utf-8')
+
+
+class DirectoryIndex:
+    """Directory listings via os.scandir, cached until the directory's mtime moves.
+
+    Adding, removing or renaming an entry bumps the directory mtime, so a
+    cached listing is exact until then. Least recently used directories are
+    evicted past `max_dirs`.
+    """
+
+    def __init__(self, max_dirs=LISTING_CACHE_DIRS):
+        self.max_dirs = max_dirs
+        self._lock = threading.Lock()
+        self._cache = OrderedDict()
+
+    def entries(self, path):
+        """Sorted (name, kind) pairs for `path`; kind is 'dir', 'file' or 'link'."""
+        mtime = os.stat(path).st_mtime_ns
+        with self._lock:
+            hit = self._cache.get(path)
+            if hit is not None and hit[0] == mtime:
+                self._cache.move_to_end(path)
+                return hit[1]
+        entries = []
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    if entry.is_symlink():
+                        kind = 'link'
+                    elif entry.is_dir():
+                        kind = 'dir'
+                    else:
+                        kind = 'file'
+                except OSError:
+                    continue
+                entries.append((entry.name, kind))
+        entries.sort(key=lambda e: e[0].lower())
+        with self._lock:
+            self._cache[path] = (mtime, entries)
+            self._cache.move_to_end(path)
+            while len(self._cache) > self.max_dirs:
+                self._cache.popitem(last=False)
+        return entries
+
+
+LISTINGS = DirectoryIndex()
+
+
+def log_linear_bounds(sub_bits, max_exp):
+    """Bucket upper bounds: each power of two split into 2**sub_bits steps."""
+    bounds = set()
+    for exp in range(max_exp):
+        base = 1 << exp
+        for i in range(1 << sub_bits):
+            bounds.add(base + ((base * (i + 1)) >> sub_bits))
+    return sorted(bounds)
+
+
+class LatencyHistogram:
+    """HDR-style log-linear histogram of microsecond latencies.
+
+    Every power of two is split into 8 linear buckets, so the relative
+    error stays under 12.5% from 1 µs up to ~1 hour.
+    """
+    BOUNDS = log_linear_bounds(3, 32)
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BOUNDS) + 1)
+        self.count = 0
+        self.sum_us = 0
+
+    def record(self, us):
+        self.counts[bisect_left(self.BOUNDS, us)] += 1
+        self.count += 1
+        self.sum_us += us
+
+    def cumulative(self):
+        """Yield (upper bound in seconds, cumulative count) for non-empty buckets."""
+        running = 0
+        for bound, n in zip(self.BOUNDS, self.counts):
+            if n:
+                running += n
+                yield bound / 1e6, running
+
+
+class Metrics:
+    """In-process request metrics. No client addresses, no arbitrary paths."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = {}
+        self.bytes_sent = {}
+        self.latency = {}
+        self.started = time.time()
+
+    def observe(self, route, status, nbytes, seconds):
+        status_class = f'{status // 100}xx' if status else 'none'
+        with self._lock:
+            key = (route, status_class)
+            self.requests[key] = self.requests.get(key, 0) + 1
+            self.bytes_sent[route] = self.bytes_sent.get(route, 0) + nbytes
+            hist = self.latency.get(route)
+            if hist is None:
+                hist = self.latency[route] = LatencyHistogram()
+            hist.record(int(seconds * 1e6))
+
+    def snapshot(self):
+        """Counters as plain JSON, for summing across workers."""
+        with self._lock:
+            return {
+                'started': self.started,
+                'requests': [[route, status, n] for (route, status), n in self.requests.items()],
+                'bytes_sent': dict(self.bytes_sent),
+                'latency': {route: {'counts': {i: n for i, n in enumerate(hist.counts) if n},
+                                    'count': hist.count, 'sum_us': hist.sum_us}
+                            for route, hist in self.latency.items()},
+            }
+
+    def merge(self, snap):
+        """Add another worker's snapshot() into these counters."""
+        with self._lock:
+            self.started = min(self.started, snap['started'])
+            for route, status, n in snap['requests']:
+                self.requests[(route, status)] = self.requests.get((route, status), 0) + n
+            for route, n in snap['bytes_sent'].items():
+                self.bytes_sent[route] = self.bytes_sent.get(route, 0) + n
+            for route, h in snap['latency'].items():
+                hist = self.latency.get(route)
+                if hist is None:
+                    hist = self.latency[route] = LatencyHistogram()
+                for i, n in h['counts'].items():
+                    hist.counts[int(i)] += n
+                hist.count += h['count']
+                hist.sum_us += h['sum_us']
+
+    def render(self):
+        """Prometheus text exposition format, version 0.0.4."""
+        out = []
+        with self._lock:
+            out.append('# HELP emerald_requests_total Requests served, by route class and status class.')
+            out.append('# TYPE emerald_requests_total counter')
+            for (route, status), n in sorted(self.requests.items()):
+                out.append(f'emerald_requests_total{{route="{route}",status="{status}"}} {n}')
+            out.append('# HELP emerald_response_bytes_total Bytes written to clients, by route class.')
+            out.append('# TYPE emerald_response_bytes_total counter')
+            for route, n in sorted(self.bytes_sent.items()):
+                out.append(f'emerald_response_bytes_total{{route="{route}"}} {n}')
+            out.append('# HELP emerald_request_duration_seconds Time to serve a request, by route class.')
+            out.append('# TYPE emerald_request_duration_seconds histogram')
+            for route, hist in sorted(self.latency.items()):
+                for le, n in hist.cumulative():
+                    out.append(f'emerald_request_duration_seconds_bucket{{route="{route}",le="{le:.6g}"}} {n}')
+                out.append(f'emerald_request_duration_seconds_bucket{{route="{route}",le="+Inf"}} {hist.count}')
+                out.append(f'emerald_request_duration_seconds_sum{{route="{route}"}} {hist.sum_us / 1e6:.6f}')
+                out.append(f'emerald_request_duration_seconds_count{{route="{route}"}} {hist.count}')
+        out.append('# HELP emerald_start_time_seconds Unix time the server started.')
+        out.append('# TYPE emerald_start_time_seconds gauge')
+        out.append(f'emerald_start_time_seconds {self.started:.0f}')
+        return '\n'.join(out) + '\n'
+
+
+METRICS = Metrics()
+# Set in a pre-fork worker: the directory its snapshots are flushed to
+METRICS_SHARED = None
+
+
+def write_snapshot(directory):
+    """Flush this process's counters to <directory>/<pid>.json."""
+    path = os.path.join(directory, f'{os.getpid()}.json')
+    with open(path + '.tmp', 'w') as f:
+        json.dump(METRICS.snapshot(), f)
+    os.replace(path + '.tmp', path)
+
+
+def all_workers(directory):
+    """Every worker's counters summed: live ones, and ones that have exited
+    or been replaced by a reload, so the totals never go backwards."""
+    total = Metrics()
+    own = f'{os.getpid()}.json'
+    for name in os.listdir(directory):
+        if not name.endswith('.json') or name == own:
+            continue
+        try:
+            with open(os.path.join(directory, name)) as f:
+                total.merge(json.load(f))
+        except (OSError, ValueError):
+            continue
+    total.merge(METRICS.snapshot())
+    return total
+
+
+class CountingWriter:
+    """Wraps the response stream to count bytes sent."""
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.count = 0
+
+    def write(self, data):
+        self.count += len(data)
+        return self.raw.write(data)
+
+    def __getattr__(self, name):
+        return getattr(self.raw, name)
+
+
+def query_int(query, name, default):
+    try:
+        return int(query.get(name, [default])[0])
+    except ValueError:
+        return default
+
 
 class SilentHandler(http.server.SimpleHTTPRequestHandler):
     """Serve files silently. No logging to stdout."""
     def log_message(self, format, *args):
         pass  # Silence
 
+    def setup(self):
+        super().setup()
+        self.wfile = CountingWriter(self.wfile)
+
+    def handle_one_request(self):
+        self.route = None
+        self.status = None
+        self.wfile.count = 0
+        # Reset per request: on a keep-alive connection the last request's
+        # line is still set when the client closes without another one
+        self.raw_requestline = b''
+        start = time.perf_counter()
+        super().handle_one_request()
+        if not self.raw_requestline:
+            return  # Connection closed without a request
+        METRICS.observe(self.route or 'file', self.status, self.wfile.count,
+                        time.perf_counter() - start)
+
+    def send_response(self, code, message=None):
+        self.status = code
+        path = urllib.parse.urlsplit(getattr(self, 'path', '')).path
+        if self.route is None:
+            self.route = METRIC_PATHS.get(path, 'other' if code >= 400 else 'file')
+        super().send_response(code, message)
+
     def end_headers(self):
         # Local network only — no CORS needed for external
         self.send_header('X-L7-Privacy', 'sacred-ground')
@@ -30,6 +368,10 @@ class SilentHandler(http.server.SimpleHTTPRequestHandler):
         super().end_headers()
 
     def do_GET(self):
+        if self.path == '/metrics':
+            return self.serve_metrics()
+        if self.path == '/brief/stream':
+            return self.stream_brief()
         if self.path == '/brief':
             try:
                 with open(BRIEF_PATH, 'r') as f:
@@ -44,13 +386,252 @@ class SilentHandler(http.server.SimpleHTTPRequestHandler):
                 self.send_response(503)
                 self.send_header('Content-Type', 'text/plain')
                 self.end_headers()
-                self.wfile.write(b'Heart has not generated a brief yet. Waiting for first system check.')
+                self.wfile.write(BRIEF_MISSING.encode('utf-8'))
             return
         return super().do_GET()
 
+    def serve_metrics(self):
+        """Prometheus metrics, localhost only. Others see a plain 404."""
+        if self.client_address[0] not in METRICS_CLIENTS:
+            self.route = 'other'
+            self.send_error(404, 'File not found')
+            return
+        metrics = all_workers(METRICS_SHARED) if METRICS_SHARED else METRICS
+        body = metrics.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def list_directory(self, path):
+        """Paginated listing from the cached index. ?page=N&per=M, ?format=json."""
+        self.route = 'listing'
+        try:
+            entries = LISTINGS.entries(path)
+        except OSError:
+            self.send_error(404, 'No permission to list directory')
+            return None
+        url = urllib.parse.urlsplit(self.path)
+        query = urllib.parse.parse_qs(url.query)
+        per = min(max(query_int(query, 'per', LISTING_PAGE_SIZE), 1), LISTING_PAGE_MAX)
+        pages = max(1, -(-len(entries) // per))
+        page = min(max(query_int(query, 'page', 1), 1), pages)
+        chunk = entries[(page - 1) * per:page * per]
+
+        if query.get('format', [''])[0] == 'json':
+            body = json.dumps({
+                'path': urllib.parse.unquote(url.path),
+                'page': page, 'pages': pages, 'per': per, 'total': len(entries),
+                'entries': [{'name': name, 'type': kind} for name, kind in chunk],
+            }).encode('utf-8')
+            ctype = 'application/json'
+        else:
+            body = self.render_listing(urllib.parse.unquote(url.path), chunk,
+                                       page, pages, per, len(entries))
+            ctype = 'text/html; charset=utf-8'
+
+        self.send_response(200)
+        self.send_header('Content-Type', ctype)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        return io.BytesIO(body)
+
+    def render_listing(self, displaypath, chunk, page, pages, per, total):
+        title = html.escape(f'Directory listing for {displaypath}', quote=False)
+        out = ['<!DOCTYPE HTML>', '<html lang="en">', '<head>',
+               '<meta charset="utf-8">', f'<title>{title}</title>', '</head>',
+               '<body>', f'<h1>{title}</h1>',
+               f'<p>{total} entries — page {page} of {pages}</p>', '<hr>', '<ul>']
+        for name, kind in chunk:
+            suffix = {'dir': '/', 'link': '@'}.get(kind, '')
+            href = urllib.parse.quote(name + ('/' if kind == 'dir' else ''), errors='surrogatepass')
+            out.append(f'<li><a href="{href}">{html.escape(name + suffix, quote=False)}</a></li>')
+        out.append('</ul>')
+        nav = []
+        if page > 1:
+            nav.append(f'<a href="?page={page - 1}&amp;per={per}">&larr; previous</a>')
+        if page < pages:
+            nav.append(f'<a href="?page={page + 1}&amp;per={per}">next &rarr;</a>')
+        if nav:
+            out.append('<p>' + ' | '.join(nav) + '</p>')
+        out.extend(['<hr>', '</body>', '</html>', ''])
+        return '\n'.join(out).encode('utf-8', 'surrogateescape')
+
+    def stream_brief(self):
+        """Hold an SSE connection open; push the brief only when it changes."""
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream; charset=utf-8')
+        self.end_headers()
+        self.close_connection = True
+        version = 0
+        try:
+            while not DRAINING.is_set():
+                latest, content = BRIEF.wait(version, SSE_KEEPALIVE_SECONDS)
+                if latest == version:
+                    self.wfile.write(b': keepalive\n\n')
+                elif content is None:
+                    version = latest
+                    self.wfile.write(sse_event('waiting', BRIEF_MISSING, version))
+                else:
+                    version = latest
+                    self.wfile.write(sse_event('brief', content, version))
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # Subscriber left (or we are draining; EventSource reconnects)
+
+
+class EmeraldServer(http.server.ThreadingHTTPServer):
+    """Threaded server that can rebind through TIME_WAIT and drain on exit.
+
+    Threaded because each /brief/stream subscriber holds its connection open.
+    """
+    allow_reuse_address = True
+
+    def __init__(self, server_address, handler, reuse_port=False, listen_fd=None):
+        self.reuse_port = reuse_port
+        self.active = 0
+        self._active_lock = threading.Lock()
+        super().__init__(server_address, handler, bind_and_activate=listen_fd is None)
+        if listen_fd is not None:
+            # Adopt the socket a previous master handed over across exec
+            self.socket.close()
+            self.socket = socket.socket(fileno=listen_fd)
+            self.server_address = self.socket.getsockname()
+
+    def server_bind(self):
+        if self.reuse_port and hasattr(socket, 'SO_REUSEPORT'):
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        super().server_bind()
+
+    def process_request_thread(self, request, client_address):
+        with self._active_lock:
+            self.active += 1
+        try:
+            super().process_request_thread(request, client_address)
+        finally:
+            with self._active_lock:
+                self.active -= 1
+
+    def drain(self, timeout=DRAIN_SECONDS):
+        """Wait for in-flight requests to finish, up to `timeout` seconds."""
+        DRAINING.set()
+        deadline = time.monotonic() + timeout
+        while self.active and time.monotonic() < deadline:
+            time.sleep(0.1)
+
+
+def run_worker(server):
+    """Serve on the shared socket until SIGTERM, then drain and exit.
+
+    The worker's metrics are flushed to METRICS_DIR every
+    METRICS_FLUSH_SECONDS and once more on exit.
+    """
+    global METRICS_SHARED
+    METRICS_SHARED = METRICS_DIR
+
+    def flush():
+        while True:
+            time.sleep(METRICS_FLUSH_SECONDS)
+            write_snapshot(METRICS_DIR)
+
+    def stop(signum, frame):
+        # shutdown() blocks until serve_forever returns, so not from this thread
+        threading.Thread(target=server.shutdown, daemon=True).start()
+    signal.signal(signal.SIGHUP, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    threading.Thread(target=flush, daemon=True).start()
+    server.serve_forever()
+    server.drain()
+    write_snapshot(METRICS_DIR)
+
+
+def spawn_worker(server):
+    pid = os.fork()
+    if pid:
+        return pid
+    try:
+        run_worker(server)
+    finally:
+        os._exit(0)
+
+
+def serve_prefork(server, workers):
+    """Master loop: N workers accept on one socket; dead workers are respawned.
+
+    SIGHUP re-executes this script in place (same PID, so old workers stay
+    our children), hands over the listening socket, starts fresh workers,
+    then tells the old ones to drain. The socket never closes, so no
+    connection is refused during a reload. Workers' metrics are summed
+    through METRICS_DIR, which a reload keeps and a fresh start clears.
+    """
+    retiring = {int(p) for p in os.environ.pop('EMERALD_RETIRE_PIDS', '').split(',') if p}
+    if not retiring:
+        # A fresh start, not a reload: the last run's counters are not ours
+        os.makedirs(METRICS_DIR, exist_ok=True)
+        for name in os.listdir(METRICS_DIR):
+            os.remove(os.path.join(METRICS_DIR, name))
+    flags = set()
+    signal.signal(signal.SIGHUP, lambda signum, frame: flags.add('reload'))
+    signal.signal(signal.SIGTERM, lambda signum, frame: flags.add('stop'))
+    signal.signal(signal.SIGINT, lambda signum, frame: flags.add('stop'))
+
+    live = {spawn_worker(server) for _ in range(workers)}
+    for pid in retiring:
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+
+    while True:
+        if 'stop' in flags:
+            for pid in live | retiring:
+                try:
+                    os.kill(pid, signal.SIGTERM)
+                except ProcessLookupError:
+                    pass
+            while True:
+                try:
+                    os.wait()
+                except ChildProcessError:
+                    return
+        if 'reload' in flags:
+            sys.stderr.write(f'[emerald] Reloading: replacing {len(live)} workers\n')
+            fd = server.socket.fileno()
+            os.set_inheritable(fd, True)
+            env = dict(os.environ, EMERALD_LISTEN_FD=str(fd),
+                       EMERALD_RETIRE_PIDS=','.join(str(p) for p in live | retiring))
+            os.execve(sys.executable, [sys.executable, SCRIPT] + sys.argv[1:], env)
+        try:
+            pid, _ = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            pid = 0
+        if pid in live:
+            live.discard(pid)
+            live.add(spawn_worker(server))
+        elif pid in retiring:
+            retiring.discard(pid)
+        if not pid:
+            time.sleep(0.2)
+
+
 if __name__ == '__main__':
-    with http.server.HTTPServer(('0.0.0.0', PORT), SilentHandler) as server:
-        sys.stderr.write(f'[emerald] Serving on port {PORT}\n')
-        sys.stderr.write(f'[emerald] Root: {SERVE_DIR}\n')
-        sys.stderr.write(f'[emerald] Privacy: sacred ground. No data shared.\n')
-        server.serve_forever()
+    parser = argparse.ArgumentParser(description='Emerald Tablet OS — local server')
+    parser.add_argument('--workers', type=int, default=0,
+                        help='pre-fork N worker processes on one socket (default: serve in-process)')
+    parser.add_argument('--reuse-port', action='store_true',
+                        help='set SO_REUSEPORT so other servers may bind the same port')
+    args = parser.parse_args()
+
+    listen_fd = os.environ.pop('EMERALD_LISTEN_FD', None)
+    with EmeraldServer(('0.0.0.0', PORT), SilentHandler, reuse_port=args.reuse_port,
+                       listen_fd=int(listen_fd) if listen_fd else None) as server:
+        if listen_fd is None:
+            sys.stderr.write(f'[emerald] Serving on port {PORT}\n')
+            sys.stderr.write(f'[emerald] Root: {SERVE_DIR}\n')
+            sys.stderr.write(f'[emerald] Privacy: sacred ground. No data shared.\n')
+        if args.workers > 0:
+            serve_prefork(server, args.workers)
+        else:
+            server.serve_forever()
@@ -12,13 +12,35 @@ Each topic cross-references related topics. Consistency is verified.
 Generated from: session transcript + git history + founding documents.
 
 Usage: python3 generate-appendix-pdf.py
+       python3 generate-appendix-pdf.py --bench-render   # check + time esc()
+       python3 generate-appendix-pdf.py --no-render-cache
+       python3 generate-appendix-pdf.py --full-rebuild      # ignore cached chapters
+       python3 generate-appendix-pdf.py --jobs 4            # render V and VII in 4 processes
+       python3 generate-appendix-pdf.py --bench-parallel    # serial vs --jobs timings
+       python3 generate-appendix-pdf.py --shard-pdf         # print chapters in parallel, merge
+       python3 generate-appendix-pdf.py --pdf-backend NAME  # devtools|chrome|wkhtmltopdf|weasyprint
+       python3 generate-appendix-pdf.py --stop-browser      # quit the persistent devtools browser
 """
 
+import base64
 import json
 import subprocess
 import html as htmlmod
+import functools
+import hashlib
 import os
 import re
+import shutil
+import socket
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+import urllib.request
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
 # ═══ Paths ═══
@@ -31,15 +53,54 @@ PUB_DIR = os.path.join(L7_DIR, "publications")
 OUT_HTML = os.path.join(PUB_DIR, "APPENDIX_LVIII_BOOK_OF_LIFE.html")
 OUT_PDF = os.path.join(PUB_DIR, "APPENDIX_LVIII_BOOK_OF_LIFE.pdf")
 CHROME = "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome"
+CHROME_NAMES = ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser",
+                "chrome", "headless_shell")
+CACHE_DIR = os.path.expanduser("~/.l7/cache/appendix")
+GIT_CACHE = os.path.join(CACHE_DIR, "git-history.json")
+RENDER_CACHE = os.path.join(CACHE_DIR, "render-cache.sqlite")
+CHAPTER_CACHE = os.path.join(CACHE_DIR, "chapters")
+CHAPTER_CHUNK = 200  # messages per cached run of Chapters V and VII
+PARALLEL_AHEAD = 4   # runs in flight per worker process in --jobs mode
+SHARD_DIR = os.path.join(CACHE_DIR, "shards")
+SHARD_GROUPS = {"title": "front", "toc": "front"}  # parts printed as one shard
+PDF_TIMEOUT = 120  # seconds, per print
+PDF_BACKENDS = ("devtools", "chrome", "wkhtmltopdf", "weasyprint")  # auto-detect order
+CHROME_PROFILE = os.path.join(CACHE_DIR, "chrome-profile")
 
 # ═══ Parse Transcript ═══
-def parse_transcript():
-    messages = []
-    with open(TRANSCRIPT) as f:
+try:
+    import orjson
+    _loads = orjson.loads
+    _DecodeError = orjson.JSONDecodeError
+except ImportError:
+    _loads = json.loads
+    _DecodeError = json.JSONDecodeError
+
+# Only user/assistant lines matter. A substring test on the raw bytes is far
+# cheaper than decoding the progress, summary and snapshot lines to drop them.
+_ROLE_MARKERS = (b'"type":"user"', b'"type":"assistant"',
+                 b'"type": "user"', b'"type": "assistant"')
+
+class Message:
+    """One transcript message. Slotted, so a long session stays compact."""
+    __slots__ = ("role", "ts", "text", "thinking", "tools")
+
+    def __init__(self, role, ts, text, thinking, tools):
+        self.role = role
+        self.ts = ts
+        self.text = text
+        self.thinking = thinking
+        self.tools = tools  # tuple of (name, summary)
+
+def iter_transcript(path=None):
+    """Yield Messages one at a time; memory does not grow with the file."""
+    with open(path or TRANSCRIPT, "rb") as f:
         for line in f:
+            if not any(marker in line for marker in _ROLE_MARKERS):
+                continue
             try:
-                obj = json.loads(line.strip())
-            except json.JSONDecodeError:
+                obj = _loads(line)
+            except _DecodeError:
                 continue
             mt = obj.get("type")
             if mt not in ("user", "assistant"):
@@ -62,20 +123,11 @@ def parse_transcript():
                         if t.strip():
                             thinks.append(t)
                     elif bt == "tool_use":
-                        tools.append({
-                            "name": b.get("name", ""),
-                            "summary": _tool_summary(b)
-                        })
+                        tools.append((b.get("name", ""), _tool_summary(b)))
             elif isinstance(content, str) and content.strip():
                 texts.append(content)
             if texts or thinks or tools:
-                messages.append({
-                    "role": mt, "ts": ts,
-                    "text": "\n\n".join(texts),
-                    "thinking": "\n\n".join(thinks),
-                    "tools": tools
-                })
-    return messages
+                yield Message(mt, ts, "\n\n".join(texts), "\n\n".join(thinks), tuple(tools))
 
 def _tool_summary(block):
     name = block.get("name", "")
@@ -91,23 +143,63 @@ def _tool_summary(block):
     return str(inp)[:100]
 
 # ═══ Git History ═══
-def get_git_history():
-    r = subprocess.run(
-        ["git", "log", "--format=%H|%aI|%s", "--reverse"],
-        capture_output=True, text=True, cwd=L7_DIR
+# One `git log` for every commit and its files; \x1e starts a commit header,
+# \x1f separates its fields, and the changed paths follow one per line.
+GIT_FORMAT = "%x1e%H%x1f%aI%x1f%s"
+
+def _git_log(revs):
+    """Stream (sha, date, message, files) from a single git log process."""
+    proc = subprocess.Popen(
+        ["git", "log", "--reverse", "--name-only", f"--format={GIT_FORMAT}"] + revs,
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, cwd=L7_DIR
     )
-    commits = []
-    for line in r.stdout.strip().split("\n"):
-        if "|" not in line:
-            continue
-        sha, date, msg = line.split("|", 2)
-        fr = subprocess.run(
-            ["git", "diff-tree", "--no-commit-id", "--name-only", "-r", sha],
-            capture_output=True, text=True, cwd=L7_DIR
+    current = None
+    for line in proc.stdout:
+        line = line.rstrip("\n")
+        if line.startswith("\x1e"):
+            if current:
+                yield current
+            sha, date, msg = line[1:].split("\x1f", 2)
+            current = (sha, date, msg, [])
+        elif line and current:
+            current[3].append(line)
+    if current:
+        yield current
+    if proc.wait() != 0:
+        raise subprocess.CalledProcessError(proc.returncode, "git log")
+
+def _load_git_cache():
+    try:
+        with open(GIT_CACHE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"head": None, "commits": []}
+
+def get_git_history():
+    """All commits, oldest first. Only commits after the cached head are read."""
+    cache = _load_git_cache()
+    head = cache.get("head")
+    if head and subprocess.run(
+        ["git", "merge-base", "--is-ancestor", head, "HEAD"],
+        capture_output=True, cwd=L7_DIR
+    ).returncode != 0:
+        # Cached head is gone or off this branch (rewritten history) — start over
+        cache, head = {"head": None, "commits": []}, None
+    try:
+        new = list(_git_log([f"^{head}", "HEAD"] if head else []))
+    except subprocess.CalledProcessError:
+        new = []
+    if new:
+        cache["commits"].extend(
+            {"sha": sha, "date": date, "message": msg, "files": files}
+            for sha, date, msg, files in new
         )
-        files = [f for f in fr.stdout.strip().split("\n") if f]
-        commits.append({"sha": sha[:8], "date": date, "message": msg, "files": files})
-    return commits
+        cache["head"] = new[-1][0]
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(GIT_CACHE + ".tmp", "w") as f:
+            json.dump(cache, f)
+        os.replace(GIT_CACHE + ".tmp", GIT_CACHE)
+    return [dict(c, sha=c["sha"][:8]) for c in cache["commits"]]
 
 # ═══ Read Founding Documents ═══
 def read_file(path):
@@ -118,8 +210,77 @@ def read_file(path):
         return ""
 
 # ═══ HTML Escaping with Markdown ═══
+_FENCE = re.compile(r'```(\w*)\n(.*?)```', re.DOTALL)
+_HEADER = re.compile(r'(#{1,6})\s+(.+)$')
+_HEADER_BARE = re.compile(r'#{1,6}\s*$')
+_BOLD = re.compile(r'\*\*(.+?)\*\*')
+_ITALIC = re.compile(r'(?<!\*)\*(?!\*)(.+?)(?<!\*)\*(?!\*)')
+_INLINE_CODE = re.compile(r'`([^`]+)`')
+_RULE = re.compile(r'---+$')
+_TABLE_SEP = re.compile(r'^[-:]+$')
+
+def _fence(m):
+    return f'<pre class="code"><code>{m.group(2)}</code></pre>'
+
 def esc(text):
-    """Escape and convert markdown to HTML."""
+    """Escape and convert markdown to HTML in a single pass over the lines.
+
+    Output is identical to esc_cascade(). The two constructs the cascade lets
+    run across lines — a bare '#' line (its whitespace match eats the newline)
+    and an unclosed inline backtick — are rare; such text is handed to it whole.
+    """
+    escaped = htmlmod.escape(text)
+    # Code blocks first: the only construct spanning lines
+    if '```' in escaped:
+        escaped = _FENCE.sub(_fence, escaped)
+    lines = escaped.split('\n')
+    last = len(lines) - 1
+    out = []
+    in_table = False
+    for n, line in enumerate(lines):
+        if line[:1] == '#':
+            if n < last and _HEADER_BARE.match(line):
+                return esc_cascade(text)
+            m = _HEADER.match(line)
+            if m:
+                level = min(len(m.group(1)) + 1, 6)
+                line = f'<h{level} class="md">{m.group(2)}</h{level}>'
+        if '*' in line:
+            if '**' in line:
+                line = _BOLD.sub(r'<strong>\1</strong>', line)
+            line = _ITALIC.sub(r'<em>\1</em>', line)
+        if '`' in line:
+            line = _INLINE_CODE.sub(r'<code class="inline">\1</code>', line)
+            if '`' in line and any('`' in later for later in lines[n + 1:]):
+                return esc_cascade(text)
+        if line[:3] == '---' and _RULE.match(line):
+            line = '<hr class="rule">'
+        # Tables (basic: detect | delimited lines)
+        if '|' in line:
+            stripped = line.strip()
+            if stripped.startswith('|') and stripped.endswith('|'):
+                cells = [c.strip() for c in stripped.split('|')[1:-1]]
+                if all(_TABLE_SEP.match(c) for c in cells):
+                    continue  # separator row
+                if not in_table:
+                    out.append('<table class="data-table"><tbody>')
+                    in_table = True
+                out.append('<tr>' + ''.join(f'<td>{c}</td>' for c in cells) + '</tr>')
+                continue
+        if in_table:
+            out.append('</tbody></table>')
+            in_table = False
+        out.append(line)
+    if in_table:
+        out.append('</tbody></table>')
+    # Line breaks (but not after </pre> or before a tag)
+    for n in range(len(out) - 1):
+        if not out[n].endswith('</pre>') and not out[n + 1].startswith('<'):
+            out[n] += '<br>'
+    return '\n'.join(out)
+
+def esc_cascade(text):
+    """Reference renderer: one regex pass per construct. esc() must match it."""
     text = htmlmod.escape(text)
     # Code blocks first (before line-level processing)
     text = re.sub(
@@ -168,6 +329,56 @@ def esc(text):
     text = re.sub(r'(?<!</pre>)\n(?!<)', '<br>\n', text)
     return text
 
+# Bump whenever esc() output changes; old cache entries then stop matching.
+RENDER_VERSION = "esc-1"
+
+class RenderCache:
+    """esc() output on disk, keyed by SHA-256 of renderer version + input.
+
+    Transcripts repeat themselves (quoted documents, re-sent tool output), and
+    a rebuild after a few new messages should only render the new blocks.
+    """
+
+    def __init__(self, path=RENDER_CACHE):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.execute("CREATE TABLE IF NOT EXISTS render (key TEXT PRIMARY KEY, html TEXT NOT NULL)")
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(text):
+        return hashlib.sha256(f"{RENDER_VERSION}\0{text}".encode("utf-8", "surrogatepass")).hexdigest()
+
+    def render(self, text):
+        k = self.key(text)
+        row = self.db.execute("SELECT html FROM render WHERE key = ?", (k,)).fetchone()
+        if row:
+            self.hits += 1
+            return row[0]
+        self.misses += 1
+        html = esc(text)
+        self.db.execute("INSERT OR REPLACE INTO render VALUES (?, ?)", (k, html))
+        return html
+
+    def close(self):
+        self.db.commit()
+        self.db.close()
+
+def bench_render(messages, bootstrap):
+    """Render every block with esc() and esc_cascade(); compare and time both."""
+    blocks = [bootstrap]
+    for m in messages:
+        blocks.extend(b for b in (m.text, m.thinking) if b)
+    mismatches = sum(1 for b in blocks if esc(b) != esc_cascade(b))
+    timings = {}
+    for fn in (esc_cascade, esc):
+        start = time.perf_counter()
+        for b in blocks:
+            fn(b)
+        timings[fn.__name__] = time.perf_counter() - start
+    return len(blocks), mismatches, timings
+
 def fmt_ts(ts):
     if not ts:
         return ""
@@ -481,37 +692,47 @@ def svg_tetragrammaton():
     svg.append('</svg>')
     return '\n'.join(svg)
 
-# ═══ BUILD THE SEED DOCUMENT ═══
-def build_document(commits, messages):
-    bootstrap = read_file(os.path.join(L7_DIR, "BOOTSTRAP.md"))
-
-    # Separate messages into categories
-    user_msgs = [m for m in messages if m["role"] == "user" and m["text"].strip()]
-    asst_msgs = [m for m in messages if m["role"] == "assistant" and m["text"].strip()]
-    think_msgs = [m for m in messages if m["thinking"].strip()]
-
-    # Find key responses by content signatures
-    def find_response(keyword, min_len=500):
-        for m in messages:
-            if m["role"] == "assistant" and keyword in m["text"] and len(m["text"]) > min_len:
-                return m
-        return None
-
-    physics_resp = find_response("Quantum Mechanics in the Execution")
-    convergence_resp = find_response("Universal Binary Convergence")
-    iqs888_resp = find_response("Infinity Quantum System 888") or find_response("The Three Matrices")
-    kabbalah_resp = find_response("Three-Tier Astrological")
-    decoherence_resp = find_response("Decoherence as Meta-Property")
-    council_resp = find_response("COUNCIL OF CORRESPONDENCES")
-
-    # Collect all thinking blocks
-    all_thinking = []
-    for m in messages:
-        if m["thinking"].strip():
-            all_thinking.append({"ts": m["ts"], "thinking": m["thinking"]})
-
-    # ═══ CSS ═══
-    css = """
+# ═══ Diagram Registry ═══
+# Each diagram is rendered once into a shared <defs> block as a <symbol>;
+# every appearance in the book is a small <use> reference to it.
+DIAGRAMS = {
+    "tol": svg_tree_of_life,
+    "dodec": svg_dodecahedron,
+    "yhvh": svg_tetragrammaton,
+    "forge": svg_forge_pipeline,
+    "bagua": svg_bagua_square,
+    "wheel": svg_king_wen_wheel,
+    "3mat": svg_three_matrices,
+    "q64d": svg_q64_encoding,
+}
+_SVG_OPEN = re.compile(r'<svg ([^>]*)>')
+_VIEWBOX = re.compile(r'viewBox="([^"]*)"')
+
+@functools.lru_cache(maxsize=None)
+def _diagram_parts(name):
+    """(outer <svg> attributes, viewBox, inner markup) of one rendered diagram."""
+    svg = DIAGRAMS[name]()
+    m = _SVG_OPEN.match(svg)
+    inner = svg[m.end():svg.rindex('</svg>')]
+    return m.group(1), _VIEWBOX.search(m.group(1)).group(1), inner
+
+def diagram_defs():
+    out = ['<svg width="0" height="0" style="position:absolute" aria-hidden="true"><defs>']
+    for name in DIAGRAMS:
+        _, viewbox, inner = _diagram_parts(name)
+        out.append(f'<symbol id="diagram-{name}" viewBox="{viewbox}">{inner}</symbol>')
+    out.append('</defs></svg>')
+    return '\n'.join(out)
+
+def diagram(name):
+    """Reference a diagram from the shared defs, sized like the original."""
+    attrs, _, _ = _diagram_parts(name)
+    return f'<svg {attrs}><use href="#diagram-{name}" xlink:href="#diagram-{name}"/></svg>'
+
+# ═══ Chapters ═══
+# Each part of the book is a function of its inputs only, so build_chapters
+# can hash those inputs and reuse last build's HTML for unchanged parts.
+CSS = """
     @page {
       size: letter;
       margin: 0.9in 0.75in;
@@ -798,14 +1019,20 @@ def build_document(commits, messages):
     }
     """
 
-    # ═══ Begin Document ═══
+def section_head():
+    """Doctype, stylesheet and the shared diagram <defs>."""
     H = []
     H.append(f'<!DOCTYPE html><html lang="en"><head>')
     H.append(f'<meta charset="UTF-8">')
     H.append(f'<title>L7 WAY — Appendix LVIII: The Book of Life</title>')
-    H.append(f'<style>{css}</style>')
+    H.append(f'<style>{CSS}</style>')
     H.append(f'</head><body>')
+    H.append(diagram_defs())
+    return "\n".join(H)
 
+def section_title_page():
+    """Title page. Carries the generation time, so it is never cached."""
+    H = []
     # ═══════════════════════════════════════════════════
     # TITLE PAGE
     # ═══════════════════════════════════════════════════
@@ -838,7 +1065,11 @@ def build_document(commits, messages):
       </div>
     </div>
     """)
+    return "\n".join(H)
 
+def section_toc():
+    """Table of contents."""
+    H = []
     # ═══════════════════════════════════════════════════
     # TABLE OF CONTENTS
     # ═══════════════════════════════════════════════════
@@ -857,7 +1088,11 @@ def build_document(commits, messages):
     <div class="divider">I (foundation) → II (language) → III (history) → IV (diagrams) → V (dialogue) → VI (consistency) → VII (deliberations)<br>
     The Philosopher's words in warm amber. Claude's in blue. Diagrams appear where concepts are first introduced.</div>
     """)
+    return "\n".join(H)
 
+def chapter_foundation(bootstrap, render):
+    """Chapter I — BOOTSTRAP.md in full."""
+    H = []
     # ═══════════════════════════════════════════════════
     # CHAPTER I — THE FOUNDATION
     # ═══════════════════════════════════════════════════
@@ -867,10 +1102,14 @@ def build_document(commits, messages):
     the self-initialization sequence — the document that any new instance of
     L7 reads first. It is presented here in full because it IS the foundation.</p>""")
     H.append(f'<div class="source-doc"><div class="label">Source: BOOTSTRAP.md (verified in repository)</div><br>')
-    H.append(esc(bootstrap))
+    H.append(render(bootstrap))
     H.append('</div>')
     H.append('<div class="xref">Cross-references: Chapter II (the 22 letters), Chapter VII (dimensional correspondences), Chapter VIII (critical evaluation)</div>')
+    return "\n".join(H)
 
+def chapter_aleph_bet():
+    """Chapter II — the 22 letters."""
+    H = []
     # ═══════════════════════════════════════════════════
     # CHAPTER II — THE ALEPH-BET
     # ═══════════════════════════════════════════════════
@@ -1596,7 +1835,11 @@ invoke → reflect → decompose → translate → dream → illuminate → bind
     Chapter VII (the Kabbalistic Tree of Life paths listed for each letter),
     Chapter IV (the paradigm these operations serve)</div>
     """)
+    return "\n".join(H)
 
+def chapter_repository(commits):
+    """Chapter III — every commit, grouped by day."""
+    H = []
     # ═══════════════════════════════════════════════════
     # CHAPTER III — THE REPOSITORY
     # ═══════════════════════════════════════════════════
@@ -1625,7 +1868,11 @@ invoke → reflect → decompose → translate → dream → illuminate → bind
         </div>""")
 
     H.append('<div class="xref">Cross-references: Every chapter draws from the work recorded in these commits</div>')
+    return "\n".join(H)
 
+def chapter_diagrams():
+    """Chapter IV — the reference diagrams."""
+    H = []
     # ═══════════════════════════════════════════════════
     # CHAPTER IV — REFERENCE DIAGRAMS
     # ═══════════════════════════════════════════════════
@@ -1638,40 +1885,44 @@ invoke → reflect → decompose → translate → dream → illuminate → bind
     H.append("""<p>The Kabbalistic Tree maps to L7's architecture: 10 Sephiroth are the system's
     organs, 22 paths are the 22 Prima operations (Chapter II). The three pillars —
     Mercy, Severity, and the Middle — are the three forces that balance every action.</p>""")
-    H.append(svg_tree_of_life())
+    H.append(diagram("tol"))
 
     H.append('<h2>The Dodecahedron — 12 Dimensions + Astrocyte</h2>')
     H.append("""<p>Every entity in L7 exists as a point in 12-dimensional space,
     each dimension governed by a planetary archetype. The Astrocyte (✦) is the 13th
     variable — not a dimension but a meta-variable that makes all coordinates probabilistic.</p>""")
-    H.append(svg_dodecahedron())
+    H.append(diagram("dodec"))
 
     H.append('<h2>The Tetragrammaton — יהוה — Four Stages of the Forge</h2>')
-    H.append(svg_tetragrammaton())
+    H.append(diagram("yhvh"))
 
     H.append('<h2>The Forge — Four Stages of Transmutation</h2>')
     H.append("""<p>All software entering L7 passes through the Forge (Law XXV).
     The four stages mirror the Tetragrammaton and the four alchemical phases.</p>""")
-    H.append(svg_forge_pipeline())
+    H.append(diagram("forge"))
 
     H.append('<h2>The Ba Gua Square — 64 Hexagrams in Tabular Form</h2>')
     H.append("""<p>Row = upper trigram, column = lower trigram. Direct access by (row, col).
     The spatial encoding: position carries meaning that does not need to be stored.</p>""")
-    H.append(svg_bagua_square())
+    H.append(diagram("bagua"))
 
     H.append('<h2>The King Wen Wheel — 64 Hexagrams in Circular Sequence</h2>')
     H.append("""<p>Adjacent hexagrams are semantically related (often inverses or complements).
     The temporal encoding: locality of reference for weights that transform together.</p>""")
-    H.append(svg_king_wen_wheel())
+    H.append(diagram("wheel"))
 
     H.append('<h2>The Three Matrices — Three Ways to Read the Same 64 States</h2>')
-    H.append(svg_three_matrices())
+    H.append(diagram("3mat"))
 
     H.append('<h2>Q64 Encoding — 18-Bit Unified Addressing</h2>')
     H.append("""<p>The five divination systems converge into a single 18-bit address space.
     Each address uniquely identifies a position in the Infinity Quantum System 888.</p>""")
-    H.append(svg_q64_encoding())
+    H.append(diagram("q64d"))
+    return "\n".join(H)
 
+def chapter_dialogue_open():
+    """Chapter V heading and legend."""
+    H = []
     # ═══════════════════════════════════════════════════
     # CHAPTER V — THE DIALOGUE (INTERLEAVED)
     # ═══════════════════════════════════════════════════
@@ -1685,81 +1936,54 @@ invoke → reflect → decompose → translate → dream → illuminate → bind
     <span style="color:#9b59b6;font-weight:bold;background:#f8f3fc;padding:2pt 6pt;border-left:3px dashed #9b59b6;">purple</span>.
     Tool calls are noted in grey. Nothing has been edited, redacted, or reordered.</p>""")
     H.append('<div class="divider">═ ═ ═ The Record Begins ═ ═ ═</div>')
+    return "\n".join(H)
 
-    # Track which diagrams have been inserted
-    diagrams_inserted = set()
-
-    msg_count = 0
-    for m in messages:
-        text = m["text"].strip()
-        thinking = m["thinking"].strip()
-        tools = m["tools"]
-
-        if not text and not thinking and not tools:
-            continue
-
-        msg_count += 1
-        ts_str = fmt_ts(m["ts"])
-        combined = text + " " + thinking
-
-        # Insert diagrams when concepts first appear in conversation
-        if "hexagram" in combined.lower() and "bagua" not in diagrams_inserted:
-            diagrams_inserted.add("bagua")
-            H.append('<div class="divider" style="margin:8pt 0;">diagram: Ba Gua Square</div>')
-            H.append(svg_bagua_square())
-        if ("three matrices" in combined.lower() or "lorentz cube" in combined.lower()) and "3mat" not in diagrams_inserted:
-            diagrams_inserted.add("3mat")
-            H.append('<div class="divider" style="margin:8pt 0;">diagram: The Three Matrices</div>')
-            H.append(svg_three_matrices())
-        if "q64" in combined.lower() and "q64d" not in diagrams_inserted:
-            diagrams_inserted.add("q64d")
-            H.append('<div class="divider" style="margin:8pt 0;">diagram: Q64 Encoding</div>')
-            H.append(svg_q64_encoding())
-        if ("tree of life" in combined.lower() or "kabbal" in combined.lower() or "sephir" in combined.lower()) and "tol" not in diagrams_inserted:
-            diagrams_inserted.add("tol")
-            H.append('<div class="divider" style="margin:8pt 0;">diagram: Tree of Life</div>')
-            H.append(svg_tree_of_life())
-        if ("12 dimension" in combined.lower() or "dodecahedron" in combined.lower()) and "dodec" not in diagrams_inserted:
-            diagrams_inserted.add("dodec")
-            H.append('<div class="divider" style="margin:8pt 0;">diagram: The Dodecahedron</div>')
-            H.append(svg_dodecahedron())
-        if ("forge" in combined.lower() and "transmut" in combined.lower()) and "forge" not in diagrams_inserted:
-            diagrams_inserted.add("forge")
-            H.append('<div class="divider" style="margin:8pt 0;">diagram: The Forge Pipeline</div>')
-            H.append(svg_forge_pipeline())
-        if ("tetragrammaton" in combined.lower() or "יהוה" in combined) and "yhvh" not in diagrams_inserted:
-            diagrams_inserted.add("yhvh")
-            H.append('<div class="divider" style="margin:8pt 0;">diagram: The Tetragrammaton</div>')
-            H.append(svg_tetragrammaton())
-        if ("king wen" in combined.lower() and "wheel" in combined.lower()) and "wheel" not in diagrams_inserted:
-            diagrams_inserted.add("wheel")
-            H.append('<div class="divider" style="margin:8pt 0;">diagram: King Wen Wheel</div>')
-            H.append(svg_king_wen_wheel())
-
-        if m["role"] == "user":
+def chapter_dialogue(entries, render):
+    """A run of Chapter V: (message, diagrams to insert before it) pairs."""
+    H = []
+    for m, inserts in entries:
+        text = m.text.strip()
+        thinking = m.thinking.strip()
+        tools = m.tools
+        ts_str = fmt_ts(m.ts)
+
+        # Diagrams open where their concept first appears
+        for key, label in inserts:
+            H.append(f'<div class="divider" style="margin:8pt 0;">diagram: {label}</div>')
+            H.append(diagram(key))
+
+        if m.role == "user":
             if text:
                 H.append(f'<div class="philosopher"><div class="who">The Philosopher</div><div class="when">{ts_str}</div>')
-                H.append(esc(text))
+                H.append(render(text))
                 H.append('</div>')
         else:
             # Thinking
             if thinking:
                 H.append(f'<div class="thinking"><div class="label">Claude — Internal Reasoning (Unedited)</div> <span style="float:right;font-size:8pt;color:#bbb;">{ts_str}</span>')
-                H.append(esc(thinking))
+                H.append(render(thinking))
                 H.append('</div>')
 
             # Tool calls
-            for tc in tools:
-                H.append(f'<div class="tool"><span class="tname">[{htmlmod.escape(tc["name"])}]</span> {htmlmod.escape(tc["summary"][:250])}</div>')
+            for name, summary in tools:
+                H.append(f'<div class="tool"><span class="tname">[{htmlmod.escape(name)}]</span> {htmlmod.escape(summary[:250])}</div>')
 
             # Response text
             if text:
                 H.append(f'<div class="claude"><div class="who">Claude</div><div class="when">{ts_str}</div>')
-                H.append(esc(text))
+                H.append(render(text))
                 H.append('</div>')
+    return "\n".join(H)
 
+def chapter_dialogue_close():
+    """End of Chapter V."""
+    H = []
     H.append('<div class="divider">═ ═ ═ The Record Ends ═ ═ ═</div>')
+    return "\n".join(H)
 
+def chapter_consistency():
+    """Chapter VI — corrections and clarifications."""
+    H = []
     # ═══════════════════════════════════════════════════
     # CHAPTER VI — CONSISTENCY CHECK
     # ═══════════════════════════════════════════════════
@@ -1780,7 +2004,11 @@ invoke → reflect → decompose → translate → dream → illuminate → bind
     Products are <strong>priced individually</strong>.<br>
     Personal use is <strong>always free</strong>.
     </div>""")
+    return "\n".join(H)
 
+def chapter_deliberations_open():
+    """Chapter VII heading."""
+    H = []
     # ═══════════════════════════════════════════════════
     # CHAPTER VII — THINKING BLOCKS
     # ═══════════════════════════════════════════════════
@@ -1788,12 +2016,20 @@ invoke → reflect → decompose → translate → dream → illuminate → bind
     H.append("""<p>Collected here are all of Claude's thinking blocks — the unedited internal
     reasoning that preceded each response. These are presented separately for focused
     reading, though they also appear inline in Chapter V.</p>""")
+    return "\n".join(H)
 
-    for i, t in enumerate(all_thinking):
+def chapter_deliberations(thinking, start, render):
+    """A run of Chapter VII, numbered from `start`."""
+    H = []
+    for i, t in enumerate(thinking, start):
         H.append(f'<div class="thinking"><div class="label">Deliberation #{i+1}</div> <span style="float:right;font-size:8pt;color:#bbb;">{fmt_ts(t["ts"])}</span>')
-        H.append(esc(t["thinking"]))
+        H.append(render(t["thinking"]))
         H.append('</div>')
+    return "\n".join(H)
 
+def section_colophon(msg_count, thinking_count, commit_count):
+    """Colophon and closing tags. Carries the generation time."""
+    H = []
     # ═══════════════════════════════════════════════════
     # COLOPHON
     # ═══════════════════════════════════════════════════
@@ -1809,8 +2045,8 @@ invoke → reflect → decompose → translate → dream → illuminate → bind
         <strong>The Philosopher</strong> — Alberto Valido Delgado, Founder<br>
         <strong>Claude</strong> — Opus 4.6, Anthropic<br><br>
         Messages in transcript: {msg_count}<br>
-        Thinking blocks: {len(all_thinking)}<br>
-        Commits in repository: {len(commits)}<br><br>
+        Thinking blocks: {thinking_count}<br>
+        Commits in repository: {commit_count}<br><br>
         ☰ The Creative above ☷ The Receptive below<br>
         Hexagram 11 — Peace (泰) — <em>"Heaven and Earth unite."</em><br><br>
         AVLI Cloud LLC — All Rights Reserved<br>
@@ -1824,6 +2060,593 @@ invoke → reflect → decompose → translate → dream → illuminate → bind
     H.append('</body></html>')
     return "\n".join(H)
 
+# Diagrams in Chapter V open before the first message that mentions them
+DIAGRAM_TRIGGERS = (
+    ("bagua", "Ba Gua Square", lambda c, low: "hexagram" in low),
+    ("3mat", "The Three Matrices", lambda c, low: "three matrices" in low or "lorentz cube" in low),
+    ("q64d", "Q64 Encoding", lambda c, low: "q64" in low),
+    ("tol", "Tree of Life", lambda c, low: "tree of life" in low or "kabbal" in low or "sephir" in low),
+    ("dodec", "The Dodecahedron", lambda c, low: "12 dimension" in low or "dodecahedron" in low),
+    ("forge", "The Forge Pipeline", lambda c, low: "forge" in low and "transmut" in low),
+    ("yhvh", "The Tetragrammaton", lambda c, low: "tetragrammaton" in low or "יהוה" in c),
+    ("wheel", "King Wen Wheel", lambda c, low: "king wen" in low and "wheel" in low),
+)
+
+def plan_dialogue(messages):
+    """Yield each shown message with the diagrams that open before it."""
+    inserted = set()
+    for m in messages:
+        text = m.text.strip()
+        thinking = m.thinking.strip()
+        if not text and not thinking and not m.tools:
+            continue
+        combined = text + " " + thinking
+        low = combined.lower()
+        inserts = []
+        for key, label, mentioned in DIAGRAM_TRIGGERS:
+            if key not in inserted and mentioned(combined, low):
+                inserted.add(key)
+                inserts.append((key, label))
+        yield m, tuple(inserts)
+
+def _message_inputs(m):
+    return (m.role, m.ts, m.text, m.thinking, repr(m.tools))
+
+class ChapterCache:
+    """Rendered chapter fragments on disk, keyed by a hash of their inputs.
+
+    A key covers this script's own source (any code change rebuilds
+    everything), the part's name and its inputs: a transcript slice, the
+    commits, BOOTSTRAP.md. Fragments no build asked for are pruned.
+    """
+
+    def __init__(self, path=CHAPTER_CACHE):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        with open(os.path.abspath(__file__), "rb") as f:
+            self.version = hashlib.sha256(f.read()).hexdigest()
+        self.used = set()
+        self.built = 0
+        self.reused = 0
+
+    def key(self, name, inputs):
+        """Fragment path for a part; marks it as used by this build."""
+        h = hashlib.sha256()
+        for part in (self.version, name, *inputs):
+            h.update(str(part).encode("utf-8", "surrogatepass"))
+            h.update(b"\0")
+        fname = h.hexdigest() + ".html"
+        self.used.add(fname)
+        return os.path.join(self.path, fname)
+
+    def get(self, path):
+        try:
+            with open(path, encoding="utf-8", errors="surrogatepass") as f:
+                html = f.read()
+        except FileNotFoundError:
+            return None
+        self.reused += 1
+        return html
+
+    def put(self, path, html):
+        with open(path + ".tmp", "w", encoding="utf-8", errors="surrogatepass") as f:
+            f.write(html)
+        os.replace(path + ".tmp", path)
+        self.built += 1
+
+    def fetch(self, name, inputs, build):
+        path = self.key(name, inputs)
+        html = self.get(path)
+        if html is None:
+            html = build()
+            self.put(path, html)
+        return html
+
+    def prune(self):
+        for fname in os.listdir(self.path):
+            if fname not in self.used:
+                os.remove(os.path.join(self.path, fname))
+
+# ═══ BUILD THE SEED DOCUMENT ═══
+def build_chapters(commits, messages, render=esc, cache=None, jobs=1):
+    """Yield (name, html) for every part of the book, in order.
+
+    With a ChapterCache, parts whose inputs are unchanged since the last
+    build are read back instead of rendered. The dialogue and deliberations
+    are split into runs of CHAPTER_CHUNK messages, so new messages at the
+    end of the transcript only dirty the last run.
+
+    `messages` is read once, as the dialogue runs are rendered, so it can
+    be iter_transcript(): only the run in hand (and, with a pool, the runs
+    ahead of it) and the thinking blocks kept for chapter VII are held.
+
+    With jobs > 1 those runs render in a pool of worker processes, a few
+    runs ahead of the caller, and come back in order. Workers use esc()
+    directly: `render` may hold a connection and cannot cross processes.
+    """
+    def part(name, build, *inputs):
+        if cache is None:
+            return name, build()
+        return name, cache.fetch(name, inputs, build)
+
+    def runs(work, pool):
+        """Parts for (name, fn, args, inputs) runs, rendered in `pool` if set."""
+        if pool is None:
+            for name, fn, args, inputs in work:
+                yield part(name, lambda: fn(*args, render), *inputs)
+            return
+        pending = deque()
+        def settle():
+            name, path, html = pending.popleft()
+            if not isinstance(html, str):
+                html = html.result()
+                if cache is not None:
+                    cache.put(path, html)
+            return name, html
+        for name, fn, args, inputs in work:
+            path = cache.key(name, inputs) if cache is not None else None
+            html = cache.get(path) if cache is not None else None
+            pending.append((name, path, html if html is not None else pool.submit(fn, *args, esc)))
+            while len(pending) > PARALLEL_AHEAD * jobs:
+                yield settle()
+        while pending:
+            yield settle()
+
+    bootstrap = read_file(os.path.join(L7_DIR, "BOOTSTRAP.md"))
+
+    # Thinking blocks are gathered while the dialogue streams past
+    all_thinking = []
+    shown = 0
+
+    def dialogue_runs():
+        nonlocal shown
+        run = []
+        for entry in plan_dialogue(messages):
+            m = entry[0]
+            if m.thinking.strip():
+                all_thinking.append({"ts": m.ts, "thinking": m.thinking})
+            run.append(entry)
+            if len(run) == CHAPTER_CHUNK:
+                yield dialogue_run(shown, run)
+                shown += len(run)
+                run = []
+        if run:
+            yield dialogue_run(shown, run)
+            shown += len(run)
+
+    def dialogue_run(i, run):
+        return (f"ch5-{i}", chapter_dialogue, (run,),
+                [x for m, inserts in run for x in (*_message_inputs(m), inserts)])
+
+    def thinking_runs():
+        for i in range(0, len(all_thinking), CHAPTER_CHUNK):
+            run = all_thinking[i:i + CHAPTER_CHUNK]
+            yield (f"ch7-{i}", chapter_deliberations, (run, i),
+                   [i, *(x for t in run for x in (t["ts"], t["thinking"]))])
+
+    yield part("head", section_head)
+    yield "title", section_title_page()
+    yield part("toc", section_toc)
+    yield part("ch1", lambda: chapter_foundation(bootstrap, render), bootstrap)
+    yield part("ch2", chapter_aleph_bet)
+    yield part("ch3", lambda: chapter_repository(commits), json.dumps(commits))
+    yield part("ch4", chapter_diagrams)
+    pool = ProcessPoolExecutor(jobs) if jobs > 1 else None
+    try:
+        yield part("ch5-open", chapter_dialogue_open)
+        yield from runs(dialogue_runs(), pool)
+        yield part("ch5-close", chapter_dialogue_close)
+        yield part("ch6", chapter_consistency)
+        yield part("ch7-open", chapter_deliberations_open)
+        yield from runs(thinking_runs(), pool)
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+    yield "colophon", section_colophon(shown, len(all_thinking), len(commits))
+
+def build_document(commits, messages, render=esc, cache=None, jobs=1):
+    return "\n".join(html for _, html in build_chapters(commits, messages, render, cache, jobs))
+
+def bench_parallel(commits, messages, jobs):
+    """Build the book serially and with each pool size; compare and time.
+    `messages` is read once per build, so it must be a list, not a stream."""
+    timings = {}
+    reference = None
+    mismatches = []
+    for n in (1, *jobs):
+        start = time.perf_counter()
+        html = [h for name, h in build_chapters(commits, messages, jobs=n)
+                if name not in ("title", "colophon")]
+        timings[n] = time.perf_counter() - start
+        if reference is None:
+            reference = html
+        elif html != reference:
+            mismatches.append(n)
+    return timings, mismatches
+
+def write_document(path, commits, messages, render=esc, cache=None, progress=print, jobs=1,
+                   shard_dir=None):
+    """Stream build_chapters() to `path`, one part at a time.
+
+    Only the part being rendered is held in memory, never the whole book.
+    The file is written beside `path` and moved into place when complete,
+    so a failed build leaves the previous HTML untouched. `progress` gets
+    one line per chapter (the runs of V and VII are summed).
+
+    With `shard_dir`, each chapter is also written there as a standalone
+    page (the head, then the chapter) for print_pdf_sharded(). Returns the
+    shard paths in book order.
+    """
+    tmp = path + ".tmp"
+    shards = []
+    if shard_dir:
+        os.makedirs(shard_dir, exist_ok=True)
+        for fname in os.listdir(shard_dir):
+            os.remove(os.path.join(shard_dir, fname))
+    chapter, size, spent = None, 0, 0.0
+    shard, shard_name, head_html, last = None, None, "", None
+    def report():
+        if chapter and progress:
+            progress(f"        {chapter:<9} {size:>12,} chars  {spent:6.2f}s")
+    def close_shard():
+        if shard:
+            if last != "colophon":
+                shard.write("\n</body></html>")
+            shard.close()
+    try:
+        with open(tmp, "w", buffering=1 << 20) as f:
+            clock = time.perf_counter()
+            for i, (name, html) in enumerate(build_chapters(commits, messages, render, cache, jobs)):
+                if i:
+                    f.write("\n")
+                f.write(html)
+                head = name.split("-")[0]
+                if head != chapter:
+                    report()
+                    chapter, size, spent = head, 0, 0.0
+                size += len(html)
+                if shard_dir:
+                    if name == "head":
+                        head_html = html
+                    else:
+                        group = SHARD_GROUPS.get(head, head)
+                        if group != shard_name:
+                            close_shard()
+                            shard_name = group
+                            shards.append(os.path.join(shard_dir, f"{len(shards):02d}-{group}.html"))
+                            shard = open(shards[-1], "w", buffering=1 << 20)
+                            shard.write(head_html)
+                        shard.write("\n")
+                        shard.write(html)
+                        last = name
+                now = time.perf_counter()
+                spent += now - clock
+                clock = now
+            report()
+    finally:
+        close_shard()
+    os.replace(tmp, path)
+    return shards
+
+
+# ═══ PDF ═══
+# pypdf is only needed to merge sharded output
+try:
+    import pypdf
+    from pypdf.generic import ArrayObject, DictionaryObject, NameObject
+except ImportError:
+    pypdf = None
+
+# WeasyPrint renders in-process; it needs Pango, so a broken install raises OSError
+try:
+    import weasyprint
+except (ImportError, OSError):
+    weasyprint = None
+
+def find_chrome():
+    """$L7_CHROME, the macOS app, then any Chrome/Chromium on PATH."""
+    for path in (os.environ.get("L7_CHROME"), CHROME):
+        if path and os.access(path, os.X_OK):
+            return path
+    for name in CHROME_NAMES:
+        path = shutil.which(name)
+        if path:
+            return path
+    return None
+
+class ChromePrinter:
+    """One headless Chrome process per print."""
+    name = "chrome"
+
+    def __init__(self, binary):
+        self.binary = binary
+
+    def __call__(self, html_path, pdf_path, timeout=PDF_TIMEOUT):
+        with tempfile.TemporaryDirectory(prefix="l7-chrome-") as profile:
+            result = subprocess.run([
+                self.binary,
+                "--headless",
+                "--disable-gpu",
+                f"--user-data-dir={profile}",
+                f"--print-to-pdf={pdf_path}",
+                "--no-pdf-header-footer",
+                "--print-to-pdf-no-header",
+                f"file://{html_path}"
+            ], capture_output=True, text=True, timeout=timeout)
+        if not os.path.exists(pdf_path):
+            raise RuntimeError(f"Chrome stderr: {result.stderr[:300]}")
+
+class WkhtmltopdfPrinter:
+    name = "wkhtmltopdf"
+
+    def __init__(self, binary):
+        self.binary = binary
+
+    def __call__(self, html_path, pdf_path, timeout=PDF_TIMEOUT):
+        # Exits 1 on harmless load warnings, so judge by the output file
+        result = subprocess.run([
+            self.binary, "--quiet", "--enable-local-file-access",
+            "--page-size", "Letter", "--print-media-type",
+            html_path, pdf_path
+        ], capture_output=True, text=True, timeout=timeout)
+        if not os.path.exists(pdf_path):
+            raise RuntimeError(f"wkhtmltopdf stderr: {result.stderr[:300]}")
+
+class WeasyPrintPrinter:
+    name = "weasyprint"
+
+    def __call__(self, html_path, pdf_path, timeout=PDF_TIMEOUT):
+        weasyprint.HTML(filename=html_path).write_pdf(pdf_path)
+
+class DevToolsSession:
+    """A Chrome DevTools Protocol connection: a minimal RFC 6455 client.
+
+    Only what CDP needs: masked text frames out, unmasked text frames in.
+    Events that arrive while waiting for a reply are kept for wait_event().
+    """
+
+    def __init__(self, ws_url, timeout=PDF_TIMEOUT):
+        url = urllib.parse.urlsplit(ws_url)
+        self.sock = socket.create_connection((url.hostname, url.port), timeout=timeout)
+        key = base64.b64encode(os.urandom(16)).decode()
+        self.sock.sendall((f"GET {url.path} HTTP/1.1\r\nHost: {url.netloc}\r\n"
+                           "Upgrade: websocket\r\nConnection: Upgrade\r\n"
+                           f"Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n").encode())
+        self.file = self.sock.makefile("rb")
+        status = self.file.readline()
+        if b" 101 " not in status:
+            raise RuntimeError(f"DevTools handshake failed: {status[:80]!r}")
+        while self.file.readline() not in (b"\r\n", b""):
+            pass
+        self.next_id = 0
+        self.events = []
+
+    def send(self, method, **params):
+        self.next_id += 1
+        data = json.dumps({"id": self.next_id, "method": method, "params": params}).encode()
+        n = len(data)
+        if n < 126:
+            header = bytes([0x81, 0x80 | n])
+        elif n < 1 << 16:
+            header = bytes([0x81, 0x80 | 126]) + n.to_bytes(2, "big")
+        else:
+            header = bytes([0x81, 0x80 | 127]) + n.to_bytes(8, "big")
+        mask = os.urandom(4)
+        masked = (int.from_bytes(data, "big") ^
+                  int.from_bytes((mask * (n // 4 + 1))[:n], "big")).to_bytes(n, "big")
+        self.sock.sendall(header + mask + masked)
+        return self.next_id
+
+    def recv(self):
+        message = b""
+        while True:
+            head = self.file.read(2)
+            if len(head) < 2:
+                raise ConnectionError("DevTools connection closed")
+            n = head[1] & 0x7f
+            if n == 126:
+                n = int.from_bytes(self.file.read(2), "big")
+            elif n == 127:
+                n = int.from_bytes(self.file.read(8), "big")
+            payload = self.file.read(n)
+            opcode = head[0] & 0x0f
+            if opcode == 8:
+                raise ConnectionError("DevTools connection closed")
+            if opcode in (9, 10):
+                continue
+            message += payload
+            if head[0] & 0x80:
+                return json.loads(message)
+
+    def call(self, method, **params):
+        msg_id = self.send(method, **params)
+        while True:
+            msg = self.recv()
+            if msg.get("id") == msg_id:
+                if "error" in msg:
+                    raise RuntimeError(f"{method}: {msg['error'].get('message')}")
+                return msg.get("result", {})
+            if "method" in msg:
+                self.events.append(msg)
+
+    def wait_event(self, method):
+        while True:
+            for msg in self.events:
+                if msg["method"] == method:
+                    self.events.remove(msg)
+                    return msg.get("params", {})
+            msg = self.recv()
+            if "method" in msg:
+                self.events.append(msg)
+
+    def close(self):
+        self.file.close()
+        self.sock.close()
+
+class DevToolsPrinter:
+    """Prints through one long-lived headless Chrome, driven over CDP.
+
+    The browser is started detached with its profile in CHROME_PROFILE and
+    left running, so later prints, including the next build's, skip the
+    cold start. Each print is its own tab, so sharded prints run side by
+    side. --stop-browser shuts it down.
+    """
+    name = "devtools"
+
+    def __init__(self, binary, profile=CHROME_PROFILE):
+        self.binary = binary
+        self.profile = profile
+        self.lock = threading.Lock()
+
+    def _running(self):
+        """Debugging port of a live browser on our profile, else None."""
+        try:
+            with open(os.path.join(self.profile, "DevToolsActivePort")) as f:
+                port = int(f.readline())
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/json/version", timeout=2) as r:
+                self.browser_ws = json.load(r)["webSocketDebuggerUrl"]
+            return port
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def endpoint(self):
+        with self.lock:
+            port = self._running()
+            if port:
+                return port
+            os.makedirs(self.profile, exist_ok=True)
+            try:
+                os.remove(os.path.join(self.profile, "DevToolsActivePort"))
+            except FileNotFoundError:
+                pass
+            subprocess.Popen([
+                self.binary, "--headless", "--disable-gpu",
+                "--remote-debugging-port=0", f"--user-data-dir={self.profile}",
+                "about:blank"
+            ], stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+               stderr=subprocess.DEVNULL, start_new_session=True)
+            deadline = time.monotonic() + 20
+            while time.monotonic() < deadline:
+                port = self._running()
+                if port:
+                    return port
+                time.sleep(0.1)
+            raise RuntimeError("headless Chrome did not open a DevTools port")
+
+    def __call__(self, html_path, pdf_path, timeout=PDF_TIMEOUT):
+        port = self.endpoint()
+        new_tab = urllib.request.Request(f"http://127.0.0.1:{port}/json/new?about:blank", method="PUT")
+        with urllib.request.urlopen(new_tab, timeout=10) as r:
+            target = json.load(r)
+        try:
+            page = DevToolsSession(target["webSocketDebuggerUrl"], timeout)
+            try:
+                page.call("Page.enable")
+                page.call("Page.navigate", url=f"file://{os.path.abspath(html_path)}")
+                page.wait_event("Page.loadEventFired")
+                stream = page.call("Page.printToPDF", preferCSSPageSize=True, printBackground=True,
+                                   transferMode="ReturnAsStream")["stream"]
+                with open(pdf_path + ".tmp", "wb") as f:
+                    while True:
+                        chunk = page.call("IO.read", handle=stream, size=1 << 20)
+                        data = chunk.get("data", "")
+                        f.write(base64.b64decode(data) if chunk.get("base64Encoded") else data.encode())
+                        if chunk.get("eof"):
+                            break
+                page.call("IO.close", handle=stream)
+                os.replace(pdf_path + ".tmp", pdf_path)
+            finally:
+                page.close()
+        finally:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/json/close/{target['id']}", timeout=10).close()
+
+    def stop(self):
+        """Close the browser if one is running; returns whether it was."""
+        if not self._running():
+            return False
+        session = DevToolsSession(self.browser_ws, 10)
+        try:
+            session.send("Browser.close")
+        finally:
+            session.close()
+        return True
+
+def pdf_printer(name=None):
+    """The named backend, else the first available in PDF_BACKENDS order."""
+    chrome = find_chrome()
+    wkhtmltopdf = shutil.which("wkhtmltopdf")
+    backends = {
+        "devtools": chrome and (lambda: DevToolsPrinter(chrome)),
+        "chrome": chrome and (lambda: ChromePrinter(chrome)),
+        "wkhtmltopdf": wkhtmltopdf and (lambda: WkhtmltopdfPrinter(wkhtmltopdf)),
+        "weasyprint": weasyprint and WeasyPrintPrinter,
+    }
+    for key in ([name] if name else PDF_BACKENDS):
+        if backends.get(key):
+            return backends[key]()
+    return None
+
+_CHAPTER_TITLE = re.compile(r'<h1\b[^>]*>(.*?)</h1>', re.S)
+_ANCHOR = re.compile(r'\bid="([^"]+)"')
+
+def print_pdf_sharded(shards, out_pdf, print_one, workers=None):
+    """Print each shard with `print_one`, in parallel, and merge in order.
+
+    Every chapter opens on a new page, so the merged book paginates as the
+    single-file print would. Pages are numbered continuously, each shard
+    gets a bookmark at its first page, and contents links that pointed
+    into another shard are rewritten to jump to that shard's page.
+    Returns the shards that failed to print; nothing is merged if any did.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    pdfs = [os.path.splitext(h)[0] + ".pdf" for h in shards]
+    def one(job):
+        html_path, pdf_path = job
+        try:
+            print_one(html_path, pdf_path)
+        except Exception:
+            return False
+        return os.path.exists(pdf_path) and os.path.getsize(pdf_path) > 0
+    with ThreadPoolExecutor(workers or os.cpu_count() or 1) as pool:
+        ok = list(pool.map(one, zip(shards, pdfs)))
+    failed = [h for h, good in zip(shards, ok) if not good]
+    if failed:
+        return failed
+
+    writer = pypdf.PdfWriter()
+    anchors = {}
+    for html_path, pdf_path in zip(shards, pdfs):
+        start = len(writer.pages)
+        with open(html_path) as f:
+            text = f.read()
+        body = text[text.find("<body>"):]
+        for anchor in _ANCHOR.findall(body):
+            anchors.setdefault(anchor, start)
+        writer.append(pdf_path)
+        title = _CHAPTER_TITLE.search(body)
+        label = (re.sub(r"<[^>]+>", "", title.group(1)).strip() if title
+                 else os.path.basename(html_path)[3:-5].capitalize())
+        writer.add_outline_item(htmlmod.unescape(label), start)
+    writer.set_page_label(0, len(writer.pages) - 1, style="/D", start=1)
+
+    for page in writer.pages:
+        for annot in page.get("/Annots") or ():
+            annot = annot.get_object()
+            action = annot.get("/A")
+            uri = action.get_object().get("/URI", "") if action else ""
+            if uri.startswith("file:") and "#" in uri:
+                target = anchors.get(uri.rsplit("#", 1)[1])
+                if target is not None:
+                    annot[NameObject("/A")] = DictionaryObject({
+                        NameObject("/S"): NameObject("/GoTo"),
+                        NameObject("/D"): ArrayObject([writer.pages[target].indirect_reference,
+                                                       NameObject("/Fit")]),
+                    })
+    with open(out_pdf + ".tmp", "wb") as f:
+        writer.write(f)
+    os.replace(out_pdf + ".tmp", out_pdf)
+    return []
+
 
 # ═══ MAIN ═══
 if __name__ == "__main__":
@@ -1832,50 +2655,107 @@ if __name__ == "__main__":
     print("  Language is code.")
     print("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
 
+    if "--bench-render" in sys.argv:
+        print("  Render check: esc() against esc_cascade()...")
+        n, bad, t = bench_render(iter_transcript(), read_file(os.path.join(L7_DIR, "BOOTSTRAP.md")))
+        print(f"        {n} blocks, {bad} mismatches")
+        print(f"        cascade: {t['esc_cascade']:.2f}s  single-pass: {t['esc']:.2f}s"
+              f"  ({t['esc_cascade'] / max(t['esc'], 1e-9):.1f}x)")
+        sys.exit(1 if bad else 0)
+
+    jobs = int(sys.argv[sys.argv.index("--jobs") + 1]) if "--jobs" in sys.argv else 1
+    backend = sys.argv[sys.argv.index("--pdf-backend") + 1] if "--pdf-backend" in sys.argv else None
+
+    if "--stop-browser" in sys.argv:
+        chrome = find_chrome()
+        stopped = chrome and DevToolsPrinter(chrome).stop()
+        print(f"  Persistent browser: {'stopped' if stopped else 'not running'}")
+        sys.exit(0)
+
+    if "--bench-parallel" in sys.argv:
+        cpus = os.cpu_count() or 1
+        sizes = sorted({2, 4, cpus} - {1}) if jobs == 1 else [jobs]
+        print(f"  Parallel check: serial build against --jobs {', '.join(map(str, sizes))} ({cpus} CPUs)...")
+        t, bad = bench_parallel(get_git_history(), list(iter_transcript()), sizes)
+        for n, secs in t.items():
+            print(f"        jobs={n:<3} {secs:6.2f}s  ({t[1] / max(secs, 1e-9):.1f}x)")
+        print(f"        {'mismatch at jobs=' + ', '.join(map(str, bad)) if bad else 'output identical'}")
+        sys.exit(1 if bad else 0)
+
     os.makedirs(PUB_DIR, exist_ok=True)
 
     print("  [1/5] Reading git history...")
     commits = get_git_history()
     print(f"        {len(commits)} commits")
 
-    print("  [2/5] Parsing transcript...")
-    messages = parse_transcript()
-    print(f"        {len(messages)} messages")
-    print(f"        {sum(1 for m in messages if m['thinking'])} thinking blocks")
+    print("  [2/5] Opening transcript...")
+    print(f"        {TRANSCRIPT} (read as the dialogue is built)")
+    counts = {"messages": 0, "thinking": 0}
+
+    def counted(messages):
+        for m in messages:
+            counts["messages"] += 1
+            counts["thinking"] += bool(m.thinking)
+            yield m
 
     print("  [3/5] Reading founding documents...")
     bootstrap_ok = os.path.exists(os.path.join(L7_DIR, "BOOTSTRAP.md"))
     print(f"        BOOTSTRAP.md: {'found' if bootstrap_ok else 'MISSING'}")
 
     print("  [4/5] Building HTML document...")
-    html_doc = build_document(commits, messages)
-    with open(OUT_HTML, "w") as f:
-        f.write(html_doc)
+    cache = None if "--no-render-cache" in sys.argv else RenderCache()
+    chapters = None if "--full-rebuild" in sys.argv else ChapterCache()
+    sharded = "--shard-pdf" in sys.argv
+    if sharded and pypdf is None:
+        print("        --shard-pdf needs pypdf (pip install pypdf); printing whole")
+        sharded = False
+    shards = write_document(OUT_HTML, commits, counted(iter_transcript()), render=cache.render if cache else esc,
+                            cache=chapters, jobs=jobs, shard_dir=SHARD_DIR if sharded else None)
+    print(f"        {counts['messages']} messages, {counts['thinking']} thinking blocks")
+    if chapters:
+        chapters.prune()
+        print(f"        Chapters: {chapters.built} rebuilt, {chapters.reused} reused")
+    if cache:
+        cache.close()
+        print(f"        Render cache: {cache.hits} hits, {cache.misses} rendered")
     print(f"        HTML: {OUT_HTML}")
     print(f"        Size: {os.path.getsize(OUT_HTML):,} bytes")
 
-    print("  [5/5] Converting to PDF via Chrome headless...")
-    try:
-        result = subprocess.run([
-            CHROME,
-            "--headless",
-            "--disable-gpu",
-            f"--print-to-pdf={OUT_PDF}",
-            "--no-pdf-header-footer",
-            "--print-to-pdf-no-header",
-            f"file://{OUT_HTML}"
-        ], capture_output=True, text=True, timeout=120)
-
-        if os.path.exists(OUT_PDF) and os.path.getsize(OUT_PDF) > 10000:
-            size_mb = os.path.getsize(OUT_PDF) / (1024 * 1024)
-            print(f"        PDF: {OUT_PDF}")
-            print(f"        Size: {size_mb:.1f} MB")
-        else:
-            print(f"        Chrome stderr: {result.stderr[:300]}")
-            print(f"        PDF generation may have failed. HTML is ready.")
-    except Exception as e:
-        print(f"        Error: {e}")
+    printer = pdf_printer(backend)
+    if printer is None:
+        print(f"  [5/5] No PDF backend{' ' + backend if backend else ''} found "
+              "(Chrome/Chromium, wkhtmltopdf, WeasyPrint).")
         print(f"        HTML is ready at: {OUT_HTML}")
+    elif sharded:
+        print(f"  [5/5] Converting to PDF via {printer.name}, {len(shards)} shards...")
+        try:
+            start = time.perf_counter()
+            failed = print_pdf_sharded(shards, OUT_PDF, printer, workers=jobs if jobs > 1 else None)
+            if failed:
+                print(f"        Failed shards: {', '.join(os.path.basename(h) for h in failed)}")
+                print(f"        PDF generation may have failed. HTML is ready.")
+            else:
+                size_mb = os.path.getsize(OUT_PDF) / (1024 * 1024)
+                print(f"        PDF: {OUT_PDF}")
+                print(f"        Size: {size_mb:.1f} MB in {time.perf_counter() - start:.1f}s")
+        except Exception as e:
+            print(f"        Error: {e}")
+            print(f"        HTML is ready at: {OUT_HTML}")
+    else:
+        print(f"  [5/5] Converting to PDF via {printer.name}...")
+        try:
+            start = time.perf_counter()
+            printer(OUT_HTML, OUT_PDF)
+
+            if os.path.exists(OUT_PDF) and os.path.getsize(OUT_PDF) > 10000:
+                size_mb = os.path.getsize(OUT_PDF) / (1024 * 1024)
+                print(f"        PDF: {OUT_PDF}")
+                print(f"        Size: {size_mb:.1f} MB in {time.perf_counter() - start:.1f}s")
+            else:
+                print(f"        PDF generation may have failed. HTML is ready.")
+        except Exception as e:
+            print(f"        Error: {e}")
+            print(f"        HTML is ready at: {OUT_HTML}")
 
     print("")
     print("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Audit trail for the filing flows: a record of what each step left on the
+page, kept cheaply.
+
+By default a step is recorded as its HTML, gzipped and stored under its
+SHA-256, so an unchanged page costs nothing, with the URL and time in the
+trail's manifest. Images are opt-in. A viewport or element screenshot is
+grabbed as a JPEG, then re-encoded to WebP and compared by perceptual
+hash on a background thread, so the flow moves on right away and a frame
+that looks like one already kept is not stored twice. A full-page PNG is
+taken for a page someone reviews before approving (full=True), kept as
+is and never deduplicated, and when a step fails.
+
+    trail = AuditTrail(page, 'annual-report')
+    trail.capture('Loading entity')                     # HTML + hash
+    trail.capture('Saving officer', image=True)         # + viewport frame
+    trail.capture('Agent form', element='#editor')      # + element frame
+    trail.capture('Final review', full=True)            # + full-page PNG
+    trail.failure('Saving officer')                     # + full-page PNG
+    trail.close()
+
+A trail lives in AUDIT/<name>/<started>/ as manifest.jsonl, html/ and
+frames/. Pillow is optional: without it, frames stay JPEG and only exact
+repeats are dropped.
+
+Usage: python3 audit.py [DIR]   — summarise trails (default: all under AUDIT)
+"""
+import gzip
+import hashlib
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+AUDIT = os.path.expanduser('~/.l7/audit')
+JPEG_QUALITY = 70
+WEBP_QUALITY = 60
+# Frames whose 64-bit hashes differ in this many bits or fewer look the same
+PHASH_DISTANCE = 4
+
+
+def dhash(image, size=8):
+    """64-bit difference hash: one bit per pixel, set where it is brighter
+    than its right-hand neighbour on a (size+1) x size greyscale thumbnail."""
+    small = image.convert('L').resize((size + 1, size), Image.BILINEAR)
+    px = small.tobytes()
+    bits = 0
+    for row in range(size):
+        for col in range(size):
+            i = row * (size + 1) + col
+            bits = bits << 1 | (px[i] > px[i + 1])
+    return bits
+
+def write_atomic(path, data):
+    with open(path + '.tmp', 'wb') as f:
+        f.write(data)
+    os.replace(path + '.tmp', path)
+
+
+class AuditTrail:
+    """Records flow steps on `page` into a new trail directory."""
+
+    def __init__(self, page, name, root=AUDIT, log=print):
+        self.page = page
+        self.log = log
+        self.dir = os.path.join(root, name, time.strftime('%Y%m%d-%H%M%S'))
+        for sub in ('html', 'frames'):
+            os.makedirs(os.path.join(self.dir, sub), exist_ok=True)
+        self.manifest = open(os.path.join(self.dir, 'manifest.jsonl'), 'a')
+        # One worker: entries land in the manifest in step order, and the
+        # frame hashes are only touched from that thread
+        self.pool = ThreadPoolExecutor(max_workers=1)
+        self.pending = []
+        self.frames = []
+        self.n = 0
+        self.stats = {'snapshots': 0, 'pages': 0, 'html_bytes': 0,
+                      'frames': 0, 'duplicates': 0, 'frame_bytes': 0}
+
+    # ── capture (browser thread) ──
+
+    def capture(self, label, image=False, element=None, full=False):
+        """Snapshot the page's HTML; with image=True also the viewport, with
+        element=selector also that element, with full=True the whole page
+        as a PNG. Returns without waiting for anything to be encoded or
+        written."""
+        self.n += 1
+        entry = {'n': self.n, 'label': label, 'url': self.page.url,
+                 'time': time.strftime('%Y-%m-%d %H:%M:%S')}
+        html = self.page.content()
+        shot = None
+        if full:
+            entry['full'] = True
+            shot = self.page.screenshot(full_page=True)
+        elif element:
+            shot = self.page.locator(element).first.screenshot(type='jpeg', quality=JPEG_QUALITY)
+        elif image:
+            shot = self.page.screenshot(type='jpeg', quality=JPEG_QUALITY)
+        self.pending.append(self.pool.submit(self._store, entry, html, shot))
+
+    def failure(self, label):
+        """Full-page PNG plus the HTML, for a step that failed. Synchronous:
+        the page may not survive whatever comes next."""
+        self.n += 1
+        entry = {'n': self.n, 'label': label, 'url': self.page.url,
+                 'time': time.strftime('%Y-%m-%d %H:%M:%S'), 'failed': True}
+        name = f'{self.n:03d}-failure.png'
+        path = os.path.join(self.dir, 'frames', name)
+        try:
+            html = self.page.content()
+            self.page.screenshot(path=path, full_page=True)
+            entry['frame'] = name
+        except Exception as e:
+            entry['error'] = str(e)
+            html = ''
+        self.pending.append(self.pool.submit(self._store, entry, html, None))
+        self.log(f"      Failure captured: {path}")
+        return path
+
+    # ── storage (worker thread) ──
+
+    def _store(self, entry, html, shot):
+        if html:
+            data = html.encode()
+            digest = hashlib.sha256(data).hexdigest()
+            entry['html'] = digest
+            path = os.path.join(self.dir, 'html', f'{digest}.html.gz')
+            self.stats['snapshots'] += 1
+            if not os.path.exists(path):
+                write_atomic(path, gzip.compress(data, compresslevel=6))
+                self.stats['pages'] += 1
+                self.stats['html_bytes'] += os.path.getsize(path)
+        if shot is not None and entry.get('full'):
+            # A page approved from is kept whole, even if it looks like one before
+            name = f"{entry['n']:03d}-full.png"
+            write_atomic(os.path.join(self.dir, 'frames', name), shot)
+            entry['frame'] = name
+            self.stats['frames'] += 1
+            self.stats['frame_bytes'] += len(shot)
+        elif shot is not None:
+            entry.update(self._frame(entry['n'], shot))
+        self.manifest.write(json.dumps(entry) + '\n')
+        self.manifest.flush()
+
+    def _frame(self, n, shot):
+        if Image is None:
+            digest = int(hashlib.sha256(shot).hexdigest()[:16], 16)
+            same = lambda h: h == digest
+            ext, encode = 'jpg', lambda: shot
+        else:
+            image = Image.open(io.BytesIO(shot))
+            digest = dhash(image)
+            same = lambda h: bin(h ^ digest).count('1') <= PHASH_DISTANCE
+            def encode():
+                out = io.BytesIO()
+                image.save(out, 'WEBP', quality=WEBP_QUALITY, method=4)
+                return out.getvalue()
+            ext = 'webp'
+        for h, name in self.frames:
+            if same(h):
+                self.stats['duplicates'] += 1
+                return {'frame': name, 'duplicate': True, 'phash': f'{digest:016x}'}
+        name = f'{n:03d}.{ext}'
+        data = encode()
+        write_atomic(os.path.join(self.dir, 'frames', name), data)
+        self.frames.append((digest, name))
+        self.stats['frames'] += 1
+        self.stats['frame_bytes'] += len(data)
+        return {'frame': name, 'phash': f'{digest:016x}'}
+
+    # ── finish ──
+
+    def close(self):
+        """Wait for pending writes and print what the trail holds."""
+        for future in self.pending:
+            future.result()
+        self.pool.shutdown()
+        self.manifest.close()
+        s = self.stats
+        self.log(f"      Audit: {s['snapshots']} snapshots ({s['pages']} distinct, "
+                 f"{s['html_bytes'] / 1024:.0f} KB), {s['frames']} frames "
+                 f"({s['frame_bytes'] / 1024:.0f} KB, {s['duplicates']} near-duplicates skipped)")
+        self.log(f"      Trail: {self.dir}")
+        return s
+
+
+def trails(root=AUDIT):
+    for dirpath, _, files in sorted(os.walk(root)):
+        if 'manifest.jsonl' in files:
+            yield dirpath
+
+if __name__ == '__main__':
+    root = sys.argv[1] if len(sys.argv) > 1 else AUDIT
+    for trail in trails(root):
+        with open(os.path.join(trail, 'manifest.jsonl')) as f:
+            entries = [json.loads(line) for line in f if line.strip()]
+        size = sum(os.path.getsize(os.path.join(d, name))
+                   for d, _, names in os.walk(trail) for name in names)
+        failed = [e['label'] for e in entries if e.get('failed')]
+        print(f"{os.path.relpath(trail, root)}: {len(entries)} steps, {size / 1024:.0f} KB"
+              + (f", FAILED at {failed[-1]}" if failed else ''))
+        for e in entries:
+            mark = ' (same as earlier)' if e.get('duplicate') else ''
+            print(f"  {e['n']:>3}. {e['label']:<40} {e.get('frame', '') + mark}")
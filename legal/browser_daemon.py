@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+One long-lived Chromium for the legal/ scripts. Scripts attach to it over
+CDP instead of launching their own, so they skip the browser start and
+find the cache, cookies and open tabs the last script left behind.
+
+    python3 browser_daemon.py start [--headed]
+    python3 browser_daemon.py status
+    python3 browser_daemon.py forget annual-report
+    python3 browser_daemon.py stop
+
+In a script, a Session stands in for launch() + new_page():
+
+    with sync_playwright() as p:
+        session = Session(p, 'annual-report', resume=True)
+        page = session.page
+        ...
+        session.close()
+
+A Session is a named tab plus a record of the steps done in it. With
+resume=True (flows.run_flow) the tab is in the daemon profile's own
+context and outlives the script: the next Session with the same name
+gets it back on the page it was left on, and done() lists the steps
+already finished there, so a flow resumes instead of replaying. Any
+other Session gets a context of its own in the daemon, seeded from its
+saved storage_state, so a probe run while a flow is paused cannot touch
+the flow's cookies or its server-side session. The daemon is started on
+first use. With L7_NO_DAEMON=1 (or shared=False) the script gets its own
+browser, seeded the same way: logins carry over, steps start again.
+"""
+import sys
+sys.path.insert(0, '/Users/rnir_hrc_avd/Library/Python/3.9/lib/python/site-packages')
+
+import argparse
+import json
+import os
+import signal
+import subprocess
+import time
+import urllib.request
+
+import tracing
+
+CACHE = os.path.expanduser('~/.l7/cache/legal')
+PROFILE = os.path.join(CACHE, 'chrome-profile')
+SESSIONS = os.path.join(CACHE, 'sessions')
+USER_AGENT = ('Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) '
+              'AppleWebKit/537.36 (KHTML, like Gecko) '
+              'Chrome/120.0.0.0 Safari/537.36')
+
+# ── daemon ──
+
+def running(profile=PROFILE):
+    """DevTools port of the daemon browser on `profile`, else None."""
+    try:
+        with open(os.path.join(profile, 'DevToolsActivePort')) as f:
+            port = int(f.readline())
+        urllib.request.urlopen(f'http://127.0.0.1:{port}/json/version', timeout=2).close()
+        return port
+    except (OSError, ValueError):
+        return None
+
+def start(binary, headless=True, profile=PROFILE):
+    """Start the daemon if it isn't running; returns its DevTools port."""
+    port = running(profile)
+    if port:
+        return port
+    os.makedirs(profile, exist_ok=True)
+    try:
+        os.remove(os.path.join(profile, 'DevToolsActivePort'))
+    except FileNotFoundError:
+        pass
+    args = [binary, '--remote-debugging-port=0', f'--user-data-dir={profile}',
+            f'--user-agent={USER_AGENT}', '--no-first-run', '--no-default-browser-check',
+            'about:blank']
+    if headless:
+        args[1:1] = ['--headless=new', '--disable-gpu']
+    proc = subprocess.Popen(args, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                            stderr=subprocess.DEVNULL, start_new_session=True)
+    with open(os.path.join(profile, 'daemon.pid'), 'w') as f:
+        f.write(str(proc.pid))
+    deadline = time.monotonic() + 20
+    while time.monotonic() < deadline:
+        port = running(profile)
+        if port:
+            return port
+        time.sleep(0.1)
+    raise RuntimeError('Chromium did not open a DevTools port')
+
+def stop(profile=PROFILE):
+    """Shut the daemon down; returns whether one was running."""
+    if not running(profile):
+        return False
+    try:
+        with open(os.path.join(profile, 'daemon.pid')) as f:
+            os.kill(int(f.read()), signal.SIGTERM)
+    except (OSError, ValueError):
+        return False
+    deadline = time.monotonic() + 10
+    while running(profile) and time.monotonic() < deadline:
+        time.sleep(0.1)
+    return True
+
+# ── sessions ──
+
+def load(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def target_id(context, page):
+    cdp = context.new_cdp_session(page)
+    try:
+        return cdp.send('Target.getTargetInfo')['targetInfo']['targetId']
+    finally:
+        cdp.detach()
+
+
+class Session:
+    """A named flow's tab in the shared browser, and the steps done in it.
+
+    Only a resume=True session uses the daemon's persistent context and
+    keeps its tab; others get a new context that is closed with them.
+    resumed is True when the tab was found still on the page the last run
+    left it on; only then does done() report earlier steps. fresh=True
+    reuses the tab but forgets its steps. The page is traced (tracing.py)
+    unless trace=False or L7_NO_TRACE is set.
+    """
+
+    def __init__(self, p, name, shared=None, headless=True, fresh=False, trace=True, resume=False):
+        if shared is None:
+            shared = not os.environ.get('L7_NO_DAEMON')
+        self.name = name
+        self.shared = shared
+        self.resume = shared and resume
+        self.path = os.path.join(SESSIONS, f'{name}.json')
+        self.state_path = os.path.join(SESSIONS, f'{name}.state.json')
+        saved = load(self.path)
+        os.makedirs(SESSIONS, exist_ok=True)
+        if shared:
+            port = start(p.chromium.executable_path, headless)
+            self.browser = p.chromium.connect_over_cdp(f'http://127.0.0.1:{port}')
+        else:
+            self.browser = p.chromium.launch(headless=headless)
+        if self.resume:
+            self.context = self.browser.contexts[0]
+            self.page = next((pg for pg in self.context.pages
+                              if target_id(self.context, pg) == saved.get('target')), None)
+            self.resumed = bool(self.page) and not fresh and self.page.url == saved.get('url')
+            if self.page is None:
+                self.page = self.context.new_page()
+                state = load(self.state_path)
+                if state.get('cookies'):
+                    self.context.add_cookies(state['cookies'])
+            self.target = target_id(self.context, self.page)
+        else:
+            self.context = self.browser.new_context(
+                user_agent=USER_AGENT,
+                storage_state=self.state_path if os.path.exists(self.state_path) else None)
+            self.page = self.context.new_page()
+            self.resumed = False
+            self.target = None
+        self.steps = list(saved.get('done', [])) if self.resumed else []
+        self.trace = tracing.Tracer(name) if trace and tracing.enabled() else None
+        if self.trace:
+            self.trace.attach(self.page)
+
+    def done(self, step):
+        return step in self.steps
+
+    def checkpoint(self, step):
+        """Record `step` as finished, with the page it left the tab on."""
+        if step not in self.steps:
+            self.steps.append(step)
+        self.save()
+
+    def complete(self):
+        """The flow finished: forget its steps, so the next run does them
+        all again instead of resuming."""
+        self.steps = []
+        self.save()
+
+    def save(self):
+        self.context.storage_state(path=self.state_path)
+        with open(self.path + '.tmp', 'w') as f:
+            json.dump({'target': self.target, 'url': self.page.url, 'done': self.steps,
+                       'saved': time.strftime('%Y-%m-%d %H:%M:%S')}, f, indent=1)
+        os.replace(self.path + '.tmp', self.path)
+
+    def close(self, keep=None):
+        """Save and detach. The tab stays open in the daemon if `keep`,
+        which by default means the flow has checkpoints to resume from."""
+        if self.trace:
+            self.trace.close()
+        self.save()
+        if keep is None:
+            keep = bool(self.steps)
+        if self.resume and not keep:
+            self.page.close()
+        elif not self.resume:
+            self.context.close()
+        # Over CDP this only disconnects; the daemon and its tabs stay up
+        self.browser.close()
+
+
+def sessions():
+    names = sorted(f[:-len('.json')] for f in os.listdir(SESSIONS)
+                   if f.endswith('.json') and not f.endswith('.state.json')) \
+        if os.path.isdir(SESSIONS) else []
+    return [(name, load(os.path.join(SESSIONS, f'{name}.json'))) for name in names]
+
+def forget(name, profile=PROFILE):
+    """Close a session's tab and drop its checkpoints and saved state."""
+    saved = load(os.path.join(SESSIONS, f'{name}.json'))
+    port = running(profile)
+    if port and saved.get('target'):
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/json/close/{saved['target']}",
+                                   timeout=5).close()
+        except OSError:
+            pass
+    for path in (f'{name}.json', f'{name}.state.json'):
+        try:
+            os.remove(os.path.join(SESSIONS, path))
+        except FileNotFoundError:
+            pass
+
+if __name__ == '__main__':
+    ap = argparse.ArgumentParser(description='Shared Chromium for the legal/ scripts')
+    ap.add_argument('command', choices=['start', 'stop', 'status', 'forget'])
+    ap.add_argument('name', nargs='?', help='session to forget')
+    ap.add_argument('--headed', action='store_true', help='show the browser window')
+    args = ap.parse_args()
+
+    if args.command == 'start':
+        from playwright.sync_api import sync_playwright
+        with sync_playwright() as p:
+            binary = p.chromium.executable_path
+        print(f"Browser on port {start(binary, headless=not args.headed)} ({PROFILE})")
+    elif args.command == 'stop':
+        print('Stopped' if stop() else 'Not running')
+    elif args.command == 'forget':
+        if not args.name:
+            ap.error('forget needs a session name')
+        forget(args.name)
+        print(f"Forgot {args.name}")
+    else:
+        port = running()
+        print(f"Browser: {'port ' + str(port) if port else 'not running'}")
+        for name, saved in sessions():
+            print(f"  {name:<24} {len(saved.get('done', []))} steps  {saved.get('saved', '')}  {saved.get('url', '')}")
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Local store of Sunbiz entity records, keyed by document number, so a
+status check doesn't go back to the registry every time a script runs.
+
+Each row holds the parsed record (sunbiz_http.parse_detail), the detail
+page it came from and that page's validators. A row younger than its TTL
+is served as-is; an older one is revalidated at its detail URL: with
+If-None-Match / If-Modified-Since when the registry sent validators, and
+a 304 or an identical record only refreshes the row's clock.
+
+    with LookupClient(cache=EntityCache()) as client:
+        client.entity('L19000154273')['status']     # registry once, then local
+
+The lookup scripts get one through client_from_args unless --no-cache.
+
+Usage: python3 entity_cache.py L19000154273 [...]   # records, cache first
+       python3 entity_cache.py --list
+       python3 entity_cache.py --selftest          # against sunbiz_fixture
+"""
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+CACHE_DB = os.path.expanduser('~/.l7/cache/legal/entities.sqlite3')
+TTL = 24 * 3600
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS entities (
+    doc           TEXT PRIMARY KEY,
+    url           TEXT NOT NULL,
+    record        TEXT NOT NULL,
+    html          BLOB NOT NULL,
+    digest        TEXT NOT NULL,
+    etag          TEXT,
+    last_modified TEXT,
+    fetched       REAL NOT NULL,
+    checked       REAL NOT NULL,
+    changed       REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entities_url ON entities (url);
+'''
+
+
+def digest(record):
+    return hashlib.sha256(json.dumps(record, sort_keys=True).encode()).hexdigest()
+
+
+class EntityCache:
+    """SQLite-backed entity records; safe to share between lookup threads.
+
+    `ttl` is how many seconds a record is served without asking the
+    registry. stats counts hits, revalidations that found nothing new,
+    and records stored.
+    """
+
+    def __init__(self, path=CACHE_DB, ttl=None):
+        self.path = path
+        self.ttl = TTL if ttl is None else ttl
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.executescript(SCHEMA)
+        self.lock = threading.Lock()
+        self.stats = {'hits': 0, 'unchanged': 0, 'stored': 0}
+
+    def close(self):
+        with self.lock:
+            self.db.close()
+
+    def _row(self, where, value):
+        with self.lock:
+            row = self.db.execute(f'SELECT * FROM entities WHERE {where} = ?', (value,)).fetchone()
+        if row is None:
+            return None
+        row = dict(row)
+        row['record'] = json.loads(row['record'])
+        row['html'] = zlib.decompress(row['html']).decode()
+        return row
+
+    def get(self, doc):
+        return self._row('doc', doc.strip().upper())
+
+    def by_url(self, url):
+        return self._row('url', url)
+
+    def fresh(self, row, max_age=None):
+        """Whether `row` can be served without asking the registry; counts a hit if so."""
+        ok = time.time() - row['checked'] < (self.ttl if max_age is None else max_age)
+        if ok:
+            with self.lock:
+                self.stats['hits'] += 1
+        return ok
+
+    def touch(self, doc, unchanged=False):
+        with self.lock:
+            self.db.execute('UPDATE entities SET checked = ? WHERE doc = ?', (time.time(), doc))
+            self.db.commit()
+            if unchanged:
+                self.stats['unchanged'] += 1
+
+    def put(self, doc, url, record, html, etag=None, last_modified=None):
+        """Store a freshly fetched record; returns whether it differs from the cached one."""
+        now = time.time()
+        new = digest(record)
+        with self.lock:
+            old = self.db.execute('SELECT digest, changed FROM entities WHERE doc = ?', (doc,)).fetchone()
+            changed = old is None or old['digest'] != new
+            self.db.execute(
+                'INSERT OR REPLACE INTO entities VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (doc, url, json.dumps(record), zlib.compress(html.encode(), 6), new,
+                 etag, last_modified, now, now, now if changed else old['changed']))
+            self.db.commit()
+            self.stats['stored' if changed else 'unchanged'] += 1
+        return changed
+
+    def forget(self, doc=None):
+        """Drop one record, or all of them."""
+        with self.lock:
+            if doc is None:
+                self.db.execute('DELETE FROM entities')
+            else:
+                self.db.execute('DELETE FROM entities WHERE doc = ?', (doc.strip().upper(),))
+            self.db.commit()
+
+    def rows(self):
+        with self.lock:
+            return [dict(r) for r in self.db.execute(
+                'SELECT doc, url, record, checked, changed FROM entities ORDER BY doc')]
+
+
+def age(seconds):
+    if seconds < 60:
+        return f'{seconds:.0f}s'
+    if seconds < 3600:
+        return f'{seconds / 60:.0f}m'
+    return f'{seconds / 3600:.1f}h'
+
+def show(record):
+    if record is None:
+        print("  (no entity record on the page)")
+        return
+    print(f"  {record['doc']}  {record['name']}")
+    print(f"    Status {record['status']}  Filed {record['filed']}  FEI {record['fei']}")
+    if record['last_event']:
+        print(f"    Last event {record['last_event']} ({record['event_date']})")
+    print(f"    Agent {record['agent']['name']}")
+    for o in record['officers']:
+        print(f"    {o['title']:<5} {o['name']}")
+    if record['reports']:
+        print(f"    Annual reports {', '.join(year for year, _ in record['reports'])}")
+    # Records cached before filing history was read have none
+    for date, what in record.get('filings', [])[:3]:
+        print(f"    Filed {date}  {what}")
+
+def selftest():
+    """Fetch, serve from cache, revalidate with a 304, against sunbiz_fixture."""
+    import tempfile
+    from sunbiz_fixture import ENTITIES, serve
+    from sunbiz_http import LookupClient
+    server, base = serve(latency=0.05)
+    ok = True
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = EntityCache(os.path.join(tmp, 'entities.sqlite3'))
+        with LookupClient(rate=0, base=base, cache=cache) as client:
+            runs = []
+            for label, max_age in (('cold', None), ('cached', None), ('stale', 0)):
+                before = client.requests
+                start = time.monotonic()
+                records = client.entities(list(ENTITIES), max_age)
+                runs.append((label, time.monotonic() - start, client.requests - before))
+                for doc, record in zip(ENTITIES, records):
+                    e = ENTITIES[doc]
+                    if record is None or (record['name'], record['status'], record['fei']) != \
+                            (e['name'], e['status'], e['fei']):
+                        print(f"  {label} {doc}: got {record}")
+                        ok = False
+            for label, seconds, requests in runs:
+                print(f"  {label:<7} {len(ENTITIES)} records in {seconds * 1000:7.1f} ms, {requests} requests")
+            print(f"  cache: {cache.stats}")
+            if runs[1][2] != 0 or cache.stats['unchanged'] != len(ENTITIES):
+                ok = False
+    server.shutdown()
+    server.server_close()
+    print(f"  {'ok' if ok else 'FAILED'}")
+    return ok
+
+if __name__ == '__main__':
+    from sunbiz_http import add_lookup_args, client_from_args
+    ap = add_lookup_args(argparse.ArgumentParser(description='Cached Sunbiz entity records'))
+    ap.add_argument('docs', nargs='*', metavar='DOC', help='document numbers to look up')
+    ap.add_argument('--list', action='store_true', help='list cached records')
+    ap.add_argument('--forget', metavar='DOC', help="drop a cached record ('all' for every one)")
+    ap.add_argument('--selftest', action='store_true', help='exercise the cache against sunbiz_fixture')
+    args = ap.parse_args()
+
+    if args.selftest:
+        raise SystemExit(0 if selftest() else 1)
+    if args.list or args.forget:
+        cache = EntityCache()
+        if args.forget:
+            cache.forget(None if args.forget == 'all' else args.forget)
+        now = time.time()
+        for row in cache.rows():
+            record = json.loads(row['record'])
+            print(f"  {row['doc']}  {record['status']:<9} {record['name']:<40} "
+                  f"checked {age(now - row['checked'])} ago, changed {age(now - row['changed'])} ago")
+        cache.close()
+        raise SystemExit(0)
+    with client_from_args(args) as client:
+        for doc in args.docs:
+            start = time.monotonic()
+            before = client.requests
+            record = client.entity(doc, args.max_age * 3600 if args.max_age is not None else None)
+            took = (time.monotonic() - start) * 1000
+            source = 'cache' if client.requests == before else f'registry, {client.requests - before} requests'
+            if record is None:
+                print(f"  {doc}: not found ({source}, {took:.1f} ms)")
+            else:
+                show(record)
+                print(f"    ({source}, {took:.1f} ms)")
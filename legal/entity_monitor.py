@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Status of the whole entity portfolio, Florida and Missouri, in one run.
+
+Each entry in the portfolio names a jurisdiction and a document/charter
+number or an exact entity name. The lookups fan out on a thread pool
+through one adapter per jurisdiction, every adapter returning the same
+snapshot shape; the snapshots are diffed against the last run's (kept
+in MONITOR_STATE) and printed as a short change report.
+
+    python3 entity_monitor.py                       # PORTFOLIO, live registries
+    python3 entity_monitor.py --portfolio mine.json --changes-only
+    python3 entity_monitor.py --selftest            # against both fixtures
+
+A portfolio file is a JSON list of {"jurisdiction": "FL", "id": "L19000154273"}
+or {"jurisdiction": "MO", "name": "Avli Cloud LLC"}. Florida lookups go
+through the entity cache (see entity_cache.py); --max-age 0 revalidates
+every one.
+"""
+import argparse
+import json
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin
+
+from sunbiz_http import DETAIL as FL_DETAIL, SUNBIZ, LookupClient, parse_detail
+
+MO_SOS = 'https://bsd.sos.mo.gov'
+MO_SEARCH = '/BusinessEntity/BESearch.aspx?SearchType=0'
+MO_DETAIL = 'BusinessEntityDetail.aspx'
+MO_SEARCH_BUTTON = 'ctl00$MainContent$btnSearch'
+MO_LABEL = re.compile(r'<span id="MainContent_lbl(\w+)">(.*?)</span>', re.S)
+
+MONITOR_STATE = os.path.expanduser('~/.l7/cache/legal/monitor-state.json')
+
+PORTFOLIO = [
+    {'jurisdiction': 'FL', 'id': 'L19000154273'},        # AVALIA CONSULTING LLC
+    {'jurisdiction': 'FL', 'name': 'Avli Cloud LLC'},     # articles filed via file_avli_cloud.py
+    {'jurisdiction': 'MO', 'name': 'Avli Cloud LLC'},
+    {'jurisdiction': 'MO', 'name': 'Stillwater Holdings LLC'},   # name held for the MO filing
+]
+
+# Fields compared between runs, in report order
+TRACKED = ('name', 'status', 'type', 'agent', 'officers', 'last_event')
+
+
+def key(entry):
+    return f"{entry['jurisdiction']}:{entry.get('id') or ' '.join(entry['name'].upper().split())}"
+
+def snapshot(jurisdiction, id, name, status, type='', agent='', officers=(), last_event='', filed=''):
+    return {'jurisdiction': jurisdiction, 'id': id, 'name': name, 'status': status.upper(),
+            'type': type, 'agent': agent, 'officers': sorted(officers),
+            'last_event': last_event, 'filed': filed}
+
+def plain(text):
+    return ' '.join(re.sub(r'<br\s*/?>', '\n', text).replace('&amp;', '&').split())
+
+def same_name(a, b):
+    return ' '.join(a.upper().replace(',', ' ').replace('.', ' ').split()) == \
+        ' '.join(b.upper().replace(',', ' ').replace('.', ' ').split())
+
+
+# ═══ Adapters ═══
+
+class FloridaAdapter:
+    """Sunbiz, through LookupClient and its entity cache."""
+    jurisdiction = 'FL'
+
+    def __init__(self, client, max_age=None):
+        self.client = client
+        self.max_age = max_age
+
+    def lookup(self, entry):
+        if entry.get('id'):
+            record = self.client.entity(entry['id'], self.max_age)
+        else:
+            hits = self.client.search_page('name', entry['name']).links(FL_DETAIL)
+            href = next((h for t, h in hits if same_name(t, entry['name'])), None)
+            record = parse_detail(self.client.get(href)) if href else None
+        if record is None:
+            return None
+        return snapshot('FL', record['doc'], record['name'], record['status'],
+                        type=record['type'], agent=record['agent']['name'],
+                        officers=[f"{o['title']} {o['name']}" for o in record['officers']],
+                        last_event=record['last_event'], filed=record['filed'])
+
+
+class MissouriAdapter:
+    """Missouri SOS business entity search: a WebForms postback, then the detail page."""
+    jurisdiction = 'MO'
+
+    def __init__(self, client):
+        self.client = client
+
+    def detail(self, url):
+        fields = {k: plain(v) for k, v in MO_LABEL.findall(self.client.get(url).html)}
+        if not fields.get('CharterNo'):
+            return None
+        return snapshot('MO', fields['CharterNo'], fields.get('Name', ''), fields.get('Status', ''),
+                        type=fields.get('Type', ''), agent=fields.get('AgentName', ''),
+                        filed=fields.get('DateFormed', ''))
+
+    def lookup(self, entry):
+        form_page = self.client.get(MO_SEARCH)
+        form, field = form_page.search_form()
+        if form is None:
+            raise RuntimeError(f"No search box on {form_page.url}")
+        term = entry.get('name') or entry['id']
+        # The submit button's name has to be in the postback for the search to run
+        fields = dict(form['fields'], **{field: term, MO_SEARCH_BUTTON: 'Search'})
+        results = self.client.fetch(urljoin(form_page.url, form['action']), fields)
+        for text, href in results.links(MO_DETAIL):
+            if entry.get('name') and not same_name(text, entry['name']):
+                continue
+            found = self.detail(href)
+            if found and (not entry.get('id') or found['id'] == entry['id']):
+                return found
+        return None
+
+
+# ═══ Monitor ═══
+
+def load_state(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {'checked': None, 'entities': {}}
+
+def save_state(path, state):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path + '.tmp', 'w') as f:
+        json.dump(state, f, indent=1, sort_keys=True)
+    os.replace(path + '.tmp', path)
+
+def diff(old, new):
+    """[(field, before, after)] for tracked fields that differ."""
+    return [(f, old.get(f), new.get(f)) for f in TRACKED if old.get(f) != new.get(f)]
+
+def check(portfolio, adapters, state, workers=8):
+    """Look every entry up concurrently; returns (results, changes).
+
+    results: [(entry, snapshot or None, error or None)] in portfolio order.
+    changes: [(entry, kind, detail)] with kind new/changed/gone/error.
+    An entry with no recorded state is only recorded: its first lookup is
+    the baseline, not a change. 'new' is an entity on the register that
+    was recorded as not found.
+    state['entities'] is updated in place; a failed lookup keeps its old entry.
+    """
+    def one(entry):
+        try:
+            return adapters[entry['jurisdiction']].lookup(entry), None
+        except Exception as e:
+            return None, f'{type(e).__name__}: {e}'
+
+    with ThreadPoolExecutor(workers) as pool:
+        results = [(entry, *r) for entry, r in zip(portfolio, pool.map(one, portfolio))]
+
+    known = state['entities']
+    changes = []
+    for entry, snap, error in results:
+        k = key(entry)
+        before = known.get(k)
+        if error:
+            changes.append((entry, 'error', error))
+            continue
+        if snap is None:
+            if before and before.get('status') != 'NOT FOUND':
+                changes.append((entry, 'gone', before.get('name')))
+            snap = {'jurisdiction': entry['jurisdiction'], 'id': entry.get('id', ''),
+                    'name': entry.get('name', '').upper(), 'status': 'NOT FOUND'}
+        elif before is None:
+            pass
+        elif before.get('status') == 'NOT FOUND':
+            changes.append((entry, 'new', snap))
+        else:
+            fields = diff(before, snap)
+            if fields:
+                changes.append((entry, 'changed', fields))
+        known[k] = snap
+    state['checked'] = time.strftime('%Y-%m-%d %H:%M:%S')
+    return results, changes
+
+def report(results, changes, since, seconds, changes_only=False):
+    jurisdictions = sorted({e['jurisdiction'] for e, _, _ in results})
+    print(f"Entity status: {len(results)} entities, {'/'.join(jurisdictions)}, {seconds:.2f}s")
+    if not changes_only:
+        for entry, snap, error in results:
+            ident = (snap or {}).get('id') or entry.get('id') or '-'
+            name = (snap or {}).get('name') or entry.get('name', '').upper()
+            status = 'ERROR' if error else snap['status'] if snap else 'NOT FOUND'
+            print(f"  {entry['jurisdiction']} {ident:<13} {name[:38]:<38} {status}")
+    if not since:
+        print("First run; recorded as the baseline.")
+        return
+    if not changes:
+        print(f"No changes since {since}.")
+        return
+    print(f"Changes since {since}:")
+    for entry, kind, detail in changes:
+        label = f"  {entry['jurisdiction']} {entry.get('id') or entry.get('name', '').upper()}"
+        if kind == 'changed':
+            for field, before, after in detail:
+                if isinstance(before, list) or isinstance(after, list):
+                    added = sorted(set(after or []) - set(before or []))
+                    removed = sorted(set(before or []) - set(after or []))
+                    after = ', '.join([f'+{a}' for a in added] + [f'-{r}' for r in removed])
+                    print(f"{label}: {field} {after}")
+                else:
+                    print(f"{label}: {field} {before or '(none)'} → {after or '(none)'}")
+        elif kind == 'new':
+            print(f"{label}: now on the register as {detail['name']} ({detail['status']})")
+        elif kind == 'gone':
+            print(f"{label}: {detail} no longer found")
+        else:
+            print(f"{label}: lookup failed, {detail}")
+
+def run(portfolio, adapters, state_path=MONITOR_STATE, workers=8, changes_only=False):
+    state = load_state(state_path)
+    since = state['checked'] if state['entities'] else None
+    start = time.monotonic()
+    results, changes = check(portfolio, adapters, state, workers)
+    report(results, changes, since, time.monotonic() - start, changes_only)
+    save_state(state_path, state)
+    return changes
+
+
+def selftest():
+    """Three runs against both fixtures: the baseline, no change, then a change in each state."""
+    import tempfile
+    import mo_sos_fixture
+    import sunbiz_fixture
+    from entity_cache import EntityCache
+    fl_server, fl_base = sunbiz_fixture.serve(latency=0.05)
+    mo_server, mo_base = mo_sos_fixture.serve(latency=0.05)
+    portfolio = [
+        {'jurisdiction': 'FL', 'id': 'L19000154273'},
+        {'jurisdiction': 'FL', 'id': 'P98000041122'},
+        {'jurisdiction': 'FL', 'name': 'City Bird Holdings LLC'},
+        {'jurisdiction': 'FL', 'name': 'Avli Cloud LLC'},
+        {'jurisdiction': 'MO', 'name': 'Avli Cloud LLC'},
+        {'jurisdiction': 'MO', 'id': 'LC012001432', 'name': 'City Bird LLC'},
+        {'jurisdiction': 'MO', 'name': 'Stillwater Holdings LLC'},
+    ]
+    ok = True
+    with tempfile.TemporaryDirectory() as tmp:
+        state = os.path.join(tmp, 'state.json')
+        fl = LookupClient(rate=0, base=fl_base, cache=EntityCache(os.path.join(tmp, 'e.sqlite3')))
+        mo = LookupClient(rate=0, base=mo_base)
+        adapters = {'FL': FloridaAdapter(fl, max_age=0), 'MO': MissouriAdapter(mo)}
+        with fl, mo:
+            print("-- first run")
+            ok &= run(portfolio, adapters, state) == []
+            print("-- nothing changed")
+            ok &= run(portfolio, adapters, state) == []
+            print("-- a change in each state")
+            sunbiz_fixture.ENTITIES['L19000154273']['status'] = 'INACTIVE'
+            sunbiz_fixture.ENTITIES['L19000154273']['officers'].append(
+                ('AMBR', 'VALIDO DELGADO, ALBERTO', '1812 SW 17TH ST\nBOCA RATON, FL 33486'))
+            mo_sos_fixture.ENTITIES['1391204']['status'] = 'Revoked'
+            changes = run(portfolio, adapters, state)
+            kinds = sorted((e['jurisdiction'], k) for e, k, _ in changes)
+            ok &= kinds == [('FL', 'changed'), ('MO', 'changed')]
+    for server in (fl_server, mo_server):
+        server.shutdown()
+        server.server_close()
+    print(f"  {'ok' if ok else 'FAILED'}")
+    return ok
+
+if __name__ == '__main__':
+    ap = argparse.ArgumentParser(description='Batch status check of the entity portfolio')
+    ap.add_argument('--portfolio', metavar='FILE', help='JSON list of entities (default: PORTFOLIO)')
+    ap.add_argument('--fl-base', default=SUNBIZ, help='Florida registry host')
+    ap.add_argument('--mo-base', default=MO_SOS, help='Missouri registry host')
+    ap.add_argument('--workers', type=int, default=8, help='lookups in flight at once')
+    ap.add_argument('--rate', type=float, default=4.0, help='requests per second per host (0 = no cap)')
+    ap.add_argument('--max-age', type=float, metavar='HOURS',
+                    help='serve cached Florida records younger than this (default: the cache TTL)')
+    ap.add_argument('--state', default=MONITOR_STATE, help='where the last known state is kept')
+    ap.add_argument('--changes-only', action='store_true', help='print only what changed')
+    ap.add_argument('--selftest', action='store_true', help='run against local stand-ins for both registries')
+    args = ap.parse_args()
+
+    if args.selftest:
+        raise SystemExit(0 if selftest() else 1)
+    from entity_cache import EntityCache
+    portfolio = PORTFOLIO
+    if args.portfolio:
+        with open(args.portfolio) as f:
+            portfolio = json.load(f)
+    with LookupClient(args.workers, args.rate, args.fl_base, cache=EntityCache()) as fl, \
+            LookupClient(args.workers, args.rate, args.mo_base) as mo:
+        adapters = {'FL': FloridaAdapter(fl, args.max_age * 3600 if args.max_age is not None else None),
+                    'MO': MissouriAdapter(mo)}
+        changes = run(portfolio, adapters, args.state, args.workers, args.changes_only)
+    raise SystemExit(1 if changes else 0)
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Registry records read off a live page in one round trip, instead of
+scanning page.inner_text('body') line by line for keywords.
+
+Each extractor is a single page.evaluate() that pulls its fields from the
+nodes the registry puts them in, and returns plain dicts:
+
+    entity_detail(page)      Sunbiz SearchResultDetail page -> the same record
+                             sunbiz_http.parse_detail builds over HTTP (name,
+                             status, doc, officers, reports, filings, ...)
+    search_results(page)     Sunbiz result rows -> [{name, doc, status, url}]
+    mo_results(page)         Missouri SOS results grid -> [{name, charter,
+                             type, status, url}], None if there's no grid
+    links(page, contains)    [(text, absolute url)], like sunbiz_http.Page.links
+
+The JS is exported too (DETAIL_JS, ...) for the async scripts:
+await page.evaluate(LINKS_JS, 'SearchResultDetail').
+
+Usage: python3 extract.py --selftest   # browser vs HTTP records on sunbiz_fixture
+"""
+import sys
+sys.path.insert(0, '/Users/rnir_hrc_avd/Library/Python/3.9/lib/python/site-packages')
+
+import argparse
+
+from sunbiz_http import detail_record
+
+# Filing Information spans, and every detailSection as (is the name
+# section, its text lines), for sunbiz_http.detail_record. Lines break at
+# every element but links and table cells, not where the stylesheet puts
+# them, so the sections read the same as sunbiz_http's text.
+DETAIL_JS = r'''() => {
+  const INLINE = new Set(['A', 'B', 'EM', 'FONT', 'I', 'STRONG', 'TD', 'TH']);
+  const lines = el => {
+    const out = [''];
+    const walk = node => {
+      for (const child of node.childNodes) {
+        if (child.nodeType === Node.TEXT_NODE) out[out.length - 1] += child.textContent;
+        if (child.nodeType !== Node.ELEMENT_NODE || child.tagName === 'SCRIPT') continue;
+        const block = !INLINE.has(child.tagName);
+        if (block) out.push('');
+        walk(child);
+        out.push(block ? '' : out.pop() + ' ');
+      }
+    };
+    walk(el);
+    return out.map(l => l.replace(/\s+/g, ' ').trim()).filter(Boolean);
+  };
+  const fields = {};
+  for (const label of document.querySelectorAll('label[for^="Detail_"]')) {
+    const span = label.nextElementSibling;
+    if (span && span.tagName === 'SPAN') fields[label.htmlFor.slice(7)] = span.textContent.trim();
+  }
+  const sections = [...document.querySelectorAll('div.detailSection')]
+    .map(div => [div.classList.contains('corporationName'), lines(div)]);
+  return {fields, sections};
+}'''
+
+# One row per detail link: Name | Document Number | Status
+RESULTS_JS = r'''(limit) => [...document.querySelectorAll('a[href*="SearchResultDetail"]')]
+  .slice(0, limit || undefined).map(a => {
+    const row = a.closest('tr');
+    const cells = row ? [...row.cells].map(c => c.innerText.trim()) : [];
+    return {name: a.innerText.trim(), doc: cells[1] || '', status: cells[2] || '', url: a.href};
+  })'''
+
+# A results grid as {header: cell text} per row, plus the row's first link
+GRID_JS = r'''(selector) => {
+  const table = document.querySelector(selector);
+  if (!table) return null;
+  const heads = [...table.querySelectorAll('th')].map(th => th.innerText.trim());
+  return [...table.querySelectorAll('tr')].filter(tr => tr.querySelector('td')).map(tr => {
+    const row = {};
+    [...tr.cells].forEach((td, i) => { row[heads[i] || i] = td.innerText.trim(); });
+    const a = tr.querySelector('a[href]');
+    row.url = a ? a.href : '';
+    return row;
+  });
+}'''
+
+LINKS_JS = r'''(contains) => [...document.querySelectorAll('a[href]')]
+  .filter(a => a.getAttribute('href').includes(contains))
+  .map(a => [a.innerText.replace(/\s+/g, ' ').trim(), a.href])'''
+
+MO_GRID = '#MainContent_gvResults'
+MO_COLUMNS = {'Name': 'name', 'Charter No.': 'charter', 'Type': 'type', 'Status': 'status'}
+
+
+def entity_detail(page):
+    """The entity record on the Sunbiz detail page `page` is showing, or
+    None if it isn't one."""
+    found = page.evaluate(DETAIL_JS)
+    return detail_record(found['fields'], found['sections'])
+
+def search_results(page, limit=None):
+    """Hits on a Sunbiz search result page, first `limit` of them."""
+    return page.evaluate(RESULTS_JS, limit)
+
+def mo_results(page):
+    """Rows of the Missouri SOS results grid; None when the search found
+    nothing (there is no grid then)."""
+    rows = page.evaluate(GRID_JS, MO_GRID)
+    if rows is None:
+        return None
+    return [{MO_COLUMNS.get(k, k): v for k, v in row.items()} for row in rows]
+
+def links(page, contains=''):
+    """(text, absolute url) for every link whose href contains `contains`."""
+    return [tuple(link) for link in page.evaluate(LINKS_JS, contains)]
+
+
+def selftest():
+    """Read every sunbiz_fixture entity in a browser and over HTTP; the
+    records must match."""
+    from playwright.sync_api import sync_playwright
+    from sunbiz_fixture import ENTITIES, detail_href, serve
+    from sunbiz_http import LookupClient, parse_detail
+    server, base = serve()
+    ok = True
+    with sync_playwright() as p, LookupClient(rate=0, base=base) as client:
+        browser = p.chromium.launch()
+        page = browser.new_page()
+        page.goto(f'{base}/Inquiry/CorporationSearch/ByName')
+        page.fill('#SearchTerm', 'A')
+        with page.expect_navigation():
+            page.click('input[type="submit"], button[type="submit"]')
+        hits = search_results(page)
+        want = sorted(d for d, e in ENTITIES.items() if e['name'].startswith('A'))
+        if sorted(h['doc'] for h in hits) != want:
+            print(f"  search: got {hits}")
+            ok = False
+        for doc in ENTITIES:
+            url = base + detail_href(doc)
+            page.goto(url)
+            got, expected = entity_detail(page), parse_detail(client.get(url))
+            same = got == expected
+            ok &= same
+            print(f"  {doc}  {(got or {}).get('name', '-'):<32} {'ok' if same else 'MISMATCH'}")
+            if not same:
+                for k in expected:
+                    if got is None or got.get(k) != expected[k]:
+                        print(f"      {k}: browser {got and got.get(k)!r}, http {expected[k]!r}")
+        if len(links(page, '/DocumentImages/')) != len(got['filings']):
+            ok = False
+        browser.close()
+    server.shutdown()
+    server.server_close()
+    print(f"  {'ok' if ok else 'FAILED'}")
+    return ok
+
+if __name__ == '__main__':
+    ap = argparse.ArgumentParser(description='In-browser record extractors')
+    ap.add_argument('--selftest', action='store_true', help='compare with sunbiz_http against sunbiz_fixture')
+    args = ap.parse_args()
+    if args.selftest:
+        raise SystemExit(0 if selftest() else 1)
+    ap.print_help()
@@ -2,11 +2,15 @@
 """
 File Articles of Organization for Avli Cloud LLC on Sunbiz.
 Fills all fields, stops at "Continue" for review before payment.
+The steps are the FLOW below, run by flows.py; a rerun resumes where the
+last one stopped, --fresh starts over.
 """
 import sys
 sys.path.insert(0, '/Users/rnir_hrc_avd/Library/Python/3.9/lib/python/site-packages')
 
-from playwright.sync_api import sync_playwright
+import argparse
+
+from flows import add_flow_args, run_flow
 
 FILING = {
     # LLC Name
@@ -57,101 +61,35 @@ FILING = {
     'off1_name_cntry': 'US',
 }
 
-def file_llc():
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page(
-            user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        )
-
-        # Step 1: Accept disclaimer
-        print("[1/4] Loading Sunbiz filing page...")
-        page.goto('https://efile.sunbiz.org/llc_file.html')
-        page.wait_for_load_state('networkidle')
-        page.check('#disclaimer_read')
-        submits = page.query_selector_all('input[type="submit"]')
-        submits[0].click()
-        page.wait_for_load_state('networkidle')
-        print(f"      Page: {page.title()}")
-        print(f"      URL:  {page.url}")
-
-        # Step 2: Check Certificate of Status
-        print("\n[2/4] Filling form fields...")
-        cos = page.query_selector('input[name="cos_num_flag"]')
-        if cos:
-            cos.check()
-            print("      [x] Certificate of Status ($5)")
-
-        # Step 3: Fill all text fields
-        for field_name, value in FILING.items():
-            if field_name == 'same_addr_flag':
-                if value:
-                    cb = page.query_selector('input[name="same_addr_flag"]')
-                    if cb:
-                        cb.check()
-                        print("      [x] Mailing = Principal address")
-                continue
-
-            inp = page.query_selector(f'input[name="{field_name}"], textarea[name="{field_name}"]')
-            if inp:
-                inp.fill(str(value))
-                # Truncate display for clean output
-                display = value if len(str(value)) < 40 else str(value)[:37] + '...'
-                print(f"      {field_name}: {display}")
-            else:
-                print(f"      WARNING: field '{field_name}' not found on page")
-
-        # Step 4: Screenshot before submit
-        print("\n[3/4] Taking pre-submission screenshot...")
-        page.screenshot(
-            path='/Users/rnir_hrc_avd/Backup/L7_WAY/legal/sunbiz_preflight.png',
-            full_page=True
-        )
-        print("      Saved: legal/sunbiz_preflight.png")
-
-        # Step 5: DO NOT CLICK CONTINUE — dump the page state
-        print("\n[4/4] PRE-FLIGHT CHECK — Form state before submission:")
-        print("=" * 60)
-
-        # Read back all filled values to verify
-        fields_to_check = [
-            'corp_name', 'princ_addr1', 'princ_addr2', 'princ_city',
-            'princ_st', 'princ_zip', 'princ_cntry',
-            'ra_name_last_name', 'ra_name_first_name', 'ra_name_m_name',
-            'ra_name_title_name', 'ra_addr1', 'ra_addr2', 'ra_city',
-            'ra_zip', 'ra_signature',
-            'purpose',
-            'ret_name', 'ret_email_addr', 'email_addr_verify',
-            'signature',
-            'off1_name_title', 'off1_name_last_name', 'off1_name_first_name',
-            'off1_name_addr1', 'off1_name_city', 'off1_name_st',
-            'off1_name_zip', 'off1_name_cntry',
-        ]
-
-        all_ok = True
-        for fname in fields_to_check:
-            inp = page.query_selector(f'input[name="{fname}"], textarea[name="{fname}"]')
-            if inp:
-                val = inp.input_value()
-                expected = str(FILING.get(fname, ''))
-                match = 'OK' if val == expected else f'MISMATCH (got: {val})'
-                if val != expected:
-                    all_ok = False
-                print(f"  {fname}: \"{val}\" [{match}]")
-            else:
-                print(f"  {fname}: FIELD NOT FOUND")
-                all_ok = False
-
-        print("=" * 60)
-        if all_ok:
-            print("ALL FIELDS VERIFIED. Ready to click 'Continue'.")
-        else:
-            print("WARNING: Some fields did not match. Review above.")
-
-        print("\n*** FORM IS FILLED BUT NOT SUBMITTED ***")
-        print("*** To submit: approve, then run file_avli_cloud_submit.py ***")
-
-        browser.close()
+FLOW = {
+    'name': 'file_avli_cloud',
+    'start': 'https://efile.sunbiz.org',
+    'steps': [
+        {'label': 'Loading Sunbiz filing page',
+         'goto': '{base}/llc_file.html',
+         'ready': '#disclaimer_read', 'check': '#disclaimer_read',
+         'click': 'input[type="submit"]', 'navigate': True,
+         'shows': 'input[name="corp_name"]'},
+
+        # Certificate of Status ($5), then every field in FILING
+        {'label': 'Filling form fields',
+         'check': 'input[name="cos_num_flag"]',
+         'fill': FILING, 'optional': True},
+
+        # The picture reviewed before anyone approves payment
+        {'label': 'Taking pre-submission screenshot',
+         'capture': True, 'image': 'full'},
+
+        # DO NOT CLICK CONTINUE — read every field back instead
+        {'label': 'PRE-FLIGHT CHECK — Form state before submission',
+         'expect': {'values': FILING}, 'optional': True, 'always': True},
+    ],
+}
 
 if __name__ == '__main__':
-    file_llc()
+    ap = add_flow_args(argparse.ArgumentParser(description='File Articles of Organization for Avli Cloud LLC'), FLOW)
+    args = ap.parse_args()
+    run_flow(FLOW, args.base, args.audit, args.images, args.fresh)
+
+    print("\n*** FORM IS FILLED BUT NOT SUBMITTED ***")
+    print("*** To submit: approve, then run file_avli_cloud_submit.py ***")
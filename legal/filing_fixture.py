@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Local mock of the services.sunbiz.org annual-report flow: document number,
+the filing page whose manager and agent editors load in place over XHR,
+certificate choice, and Final Review. Nothing is ever paid.
+
+Responses are delayed like the real site's, so waits can be exercised:
+--profile fast answers in tens of milliseconds, slow in one to three seconds
+with the editors appearing well after the click, jitter mixes the two.
+
+Usage: python3 filing_fixture.py [--port 8767] [--profile fast|slow|jitter]
+       python3 filing_fixture.py --selftest [--profile ...]   # the annual-report FLOW against it
+"""
+import argparse
+import html
+import json
+import os
+import random
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from sunbiz_fixture import ENTITIES
+
+PROFILES = {
+    'fast': (0.01, 0.05),
+    'slow': (1.0, 3.0),
+    'jitter': (0.01, 2.0),
+}
+FEE = '$138.75'
+START = '/Filings/AnnualReport/FilingStart'
+FILING = '/Filings/AnnualReport/Filing'
+REVIEW = '/Filings/AnnualReport/FinalReview'
+
+def blank_filing(doc):
+    e = ENTITIES[doc]
+    title, name, _ = e['officers'][0]
+    last, _, first = name.partition(', ')
+    agent_last, _, agent_first = e['agent'][0].partition(', ')
+    return {
+        'doc': doc,
+        'officer': {'Title': title, 'LastName': last, 'FirstName': first},
+        'agent': {'LastName': agent_last, 'FirstName': agent_first, 'AgentSignature': ''},
+        'certificate': None,
+    }
+
+def page(title, body, script=''):
+    return f'''<!DOCTYPE html><html><head><meta charset="utf-8"><title>{title}</title></head>
+<body><div id="main"><h2>{title}</h2>
+{body}
+</div>{f"<script>{script}</script>" if script else ""}</body></html>'''
+
+# The editors load over XHR and are inserted after a delay the server picks,
+# the way the real page renders them after a click.
+EDITOR_JS = '''
+async function openEditor(which) {
+  const r = await fetch('/Filings/AnnualReport/Editor?which=' + which);
+  const j = await r.json();
+  await new Promise(ok => setTimeout(ok, j.render_ms));
+  document.getElementById('editor').innerHTML = j.html;
+}
+async function saveEditor(which) {
+  const data = new URLSearchParams();
+  document.querySelectorAll('#editor input').forEach(i => data.append(i.name, i.value));
+  const r = await fetch('/Filings/AnnualReport/Save?which=' + which, {method: 'POST', body: data});
+  const j = await r.json();
+  await new Promise(ok => setTimeout(ok, j.render_ms));
+  document.getElementById('editor').innerHTML = '';
+  document.getElementById(which + '-summary').textContent = j.summary;
+}
+'''
+
+def filing_page(f):
+    e = ENTITIES[f['doc']]
+    o, a = f['officer'], f['agent']
+    return page('Annual Report', f'''
+<p id="entity">{html.escape(e['name'])} — {f['doc']} — {FEE}</p>
+<h3>Manager/Authorized Member/Authorized Representative</h3>
+<p>Title {html.escape(o['Title'])}: <span id="officer-summary">{html.escape(o['LastName'])}, {html.escape(o['FirstName'])}</span></p>
+<button type="button" onclick="openEditor('officer')">Edit or Delete Manager</button>
+<h3>Registered Agent</h3>
+<p><span id="agent-summary">{html.escape(a['LastName'])}, {html.escape(a['FirstName'])}</span></p>
+<button type="button" onclick="openEditor('agent')">Edit Agent / Signature</button>
+<div id="editor"></div>
+<form method="post" action="{REVIEW}">
+<p>Would you like a Certificate of Status?
+<label><input type="radio" name="Certificate" value="true"> Yes</label>
+<label><input type="radio" name="Certificate" value="false"> No</label></p>
+<input type="submit" value="Move on to the Final Review">
+</form>''', EDITOR_JS)
+
+def editor_html(f, which):
+    if which == 'officer':
+        o = f['officer']
+        return (f'<input name="Officer.LastName" value="{html.escape(o["LastName"])}">'
+                f'<input name="Officer.FirstName" value="{html.escape(o["FirstName"])}">'
+                '<button type="button" onclick="saveEditor(\'officer\')">'
+                'Save Manager/Authorized Member/Authorized Representative</button>')
+    a = f['agent']
+    return (f'<input name="RegisteredAgentName.LastName" value="{html.escape(a["LastName"])}">'
+            f'<input name="RegisteredAgentName.FirstName" value="{html.escape(a["FirstName"])}">'
+            f'<input name="RegisteredAgentName.AgentSignature" value="{html.escape(a["AgentSignature"])}">'
+            '<button type="button" onclick="saveEditor(\'agent\')">Save Registered Agent</button>')
+
+def review_page(f):
+    e = ENTITIES[f['doc']]
+    o, a = f['officer'], f['agent']
+    return page('Final Review', f'''
+<p>{html.escape(e['name'])}</p>
+<p>Document Number {f['doc']}</p>
+<p>FEI/EIN Number {e['fei']}</p>
+<p>Manager/Authorized Member: Title {html.escape(o['Title'])} {html.escape(o['LastName'])}, {html.escape(o['FirstName'])}</p>
+<p>Registered Agent: {html.escape(a['LastName'])}, {html.escape(a['FirstName'])}</p>
+<p>Registered Agent Signature: {html.escape(a['AgentSignature'])}</p>
+<p>Certificate of Status: {'Yes' if f['certificate'] == 'true' else 'No'}</p>
+<p>Total Due {FEE}</p>
+<button type="button" disabled>Continue to Payment</button>''')
+
+
+class FilingHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    delay = PROFILES['fast']
+    filing = None
+
+    def setup(self):
+        super().setup()
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def log_message(self, fmt, *args):
+        pass
+
+    def wait(self):
+        time.sleep(random.uniform(*self.delay))
+
+    def reply(self, status, body, ctype='text/html; charset=utf-8', headers=()):
+        data = body.encode()
+        self.send_response(status)
+        self.send_header('Content-Type', ctype)
+        self.send_header('Content-Length', str(len(data)))
+        for k, v in headers:
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def form(self):
+        raw = self.rfile.read(int(self.headers.get('Content-Length') or 0)).decode()
+        return {k: v[0] for k, v in parse_qs(raw, keep_blank_values=True).items()}
+
+    def do_GET(self):
+        self.wait()
+        url = urlsplit(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        cls = type(self)
+        if url.path == START:
+            self.reply(200, page('File Annual Report', f'''
+<form method="post" action="{START}">
+<label>Document Number <input type="text" name="DocumentId"></label>
+<input type="submit" value="Submit">
+</form>'''))
+        elif url.path == FILING and cls.filing:
+            self.reply(200, filing_page(cls.filing))
+        elif url.path == '/Filings/AnnualReport/Editor' and cls.filing:
+            render_ms = int(random.uniform(*self.delay) * 1000)
+            self.reply(200, json.dumps({'html': editor_html(cls.filing, query.get('which')),
+                                        'render_ms': render_ms}), 'application/json')
+        else:
+            self.reply(404, page('Error', '<p>Page not found</p>'))
+
+    def do_POST(self):
+        self.wait()
+        url = urlsplit(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        form = self.form()
+        cls = type(self)
+        if url.path == START:
+            doc = form.get('DocumentId', '').strip().upper()
+            if doc not in ENTITIES:
+                self.reply(200, page('File Annual Report', '<p class="error">Document number not found</p>'))
+                return
+            cls.filing = blank_filing(doc)
+            self.reply(303, '', headers=[('Location', FILING)])
+        elif url.path == '/Filings/AnnualReport/Save' and cls.filing:
+            which = query.get('which')
+            target = cls.filing[which]
+            prefix = 'Officer.' if which == 'officer' else 'RegisteredAgentName.'
+            for k in target:
+                if prefix + k in form:
+                    target[k] = form[prefix + k]
+            summary = f"{target['LastName']}, {target['FirstName']}"
+            self.reply(200, json.dumps({'summary': summary,
+                                        'render_ms': int(random.uniform(*self.delay) * 1000)}),
+                       'application/json')
+        elif url.path == REVIEW and cls.filing:
+            cls.filing['certificate'] = form.get('Certificate')
+            self.reply(200, review_page(cls.filing))
+        else:
+            self.reply(404, page('Error', '<p>Page not found</p>'))
+
+
+def serve(port=0, profile='fast'):
+    """Start the mock on a background thread; returns (server, base_url)."""
+    handler = type('Handler', (FilingHandler,), {'delay': PROFILES[profile], 'filing': None})
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_address[1]}'
+
+def selftest(profile='fast'):
+    """Run sunbiz_ar_complete's FLOW against the mock in a browser of its
+    own: every step must pass and end on Final Review with the new officer
+    and agent saved. Then a wait for something that never shows must raise
+    StepTimeout, within its budget."""
+    import tempfile
+    from playwright.sync_api import sync_playwright
+    from audit import AuditTrail
+    from flows import Flow
+    from steps import MIN_TIMEOUT, StepRunner, StepTimeout
+    from sunbiz_ar_complete import FLOW
+    server, base = serve(profile=profile)
+    ok = True
+    with tempfile.TemporaryDirectory() as tmp, sync_playwright() as p:
+        browser = p.chromium.launch()
+        page = browser.new_page()
+        run = StepRunner(page, timings=os.path.join(tmp, 'timings.json'))
+        trail = AuditTrail(page, 'selftest', root=tmp, log=lambda *a: None)
+        try:
+            Flow(FLOW, run, trail, base).execute()
+        except Exception as e:
+            print(f"  flow stopped: {type(e).__name__}: {e}")
+            ok = False
+        trail.close()
+        run.summary()
+        filing = server.RequestHandlerClass.filing or {}
+        if len(run.steps) != len(FLOW['steps']) or not all(s['ok'] for s in run.steps):
+            ok = False
+        if REVIEW not in page.url or filing.get('officer', {}).get('LastName') != 'Valido Delgado' \
+                or filing.get('agent', {}).get('LastName') != 'Valido Delgado':
+            print(f"  ended at {page.url} with {filing}")
+            ok = False
+
+        run.seen['ready #never-there'] = 0.0
+        start = time.monotonic()
+        try:
+            with run.step('Waiting for nothing'):
+                run.wait_for(ready='#never-there')
+            print("  no StepTimeout for a selector that never shows")
+            ok = False
+        except StepTimeout as e:
+            took = time.monotonic() - start
+            print(f"  StepTimeout after {took:.1f}s: {e}")
+            if took > MIN_TIMEOUT + 2 or "'Waiting for nothing'" not in str(e):
+                ok = False
+        browser.close()
+    server.shutdown()
+    server.server_close()
+    print(f"  {'ok' if ok else 'FAILED'}")
+    return ok
+
+if __name__ == '__main__':
+    ap = argparse.ArgumentParser(description='Local mock of the Sunbiz annual-report flow')
+    ap.add_argument('--port', type=int, default=8767)
+    ap.add_argument('--profile', choices=sorted(PROFILES), default='fast')
+    ap.add_argument('--selftest', action='store_true', help="run the annual-report FLOW against the mock")
+    args = ap.parse_args()
+    if args.selftest:
+        raise SystemExit(0 if selftest(args.profile) else 1)
+    server, base = serve(args.port, args.profile)
+    print(f"Filing mock at {base}{START} ({args.profile})")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
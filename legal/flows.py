@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Declarative filing flows. A flow is a dict, a name and a list of steps,
+each step a dict of what to do on the page, and run_flow() interprets it:
+every step waits on the page (steps.StepRunner) rather than sleeping and
+is checkpointed in the flow's browser_daemon.Session when it finishes, so
+a rerun after a failure starts at the step that failed.
+
+    FLOW = {
+        'name': 'annual-report',
+        'start': 'https://services.sunbiz.org',
+        'steps': [
+            {'label': 'Loading entity',
+             'goto': '{base}/Filings/AnnualReport/FilingStart',
+             'ready': 'input[name="DocumentId"]',
+             'fill': {'DocumentId': DOC_NUMBER},
+             'click': 'input[type="submit"]', 'navigate': True,
+             'shows': 'text=Edit or Delete Manager',
+             'capture': True},
+            ...
+        ],
+    }
+    run_flow(FLOW)
+
+Step keys, applied in this order:
+
+  goto        URL to load; '{base}' is the flow's start or --base
+  ready       selector to wait for before doing anything else
+  check       selector or list of boxes/radios to tick; ones not on the page are skipped
+  fill        field map {name: value}, like the FILING dicts; True/False ticks or clears
+  click       selector, or list of fallbacks tried in order until one is on the page
+  navigate    the click loads a new page
+  response    URL glob of a response the click triggers
+  shows       selector that appears once the click has taken effect
+  hides       selector that goes away once it has
+  expect      {'text': str or list on the page, 'url': substring, 'values': field map}
+  capture     record the page in the audit trail (audit.py): True, or a
+              selector to frame just that element when images are on
+  image       always add a frame to this step's capture; 'full' for a full-page
+              PNG that is never deduplicated (pages approved from)
+  dump        print the page text: True, or keywords a line must contain
+  always      run even on a resumed flow (read-only steps)
+  optional    a missing field or failed expectation warns instead of failing
+
+Any selector may be a list of fallbacks. A step that fails leaves a
+full-page screenshot in the trail.
+"""
+import sys
+sys.path.insert(0, '/Users/rnir_hrc_avd/Library/Python/3.9/lib/python/site-packages')
+
+from playwright.sync_api import sync_playwright
+
+from audit import AUDIT, AuditTrail
+from browser_daemon import Session
+from steps import StepRunner, StepTimeout
+
+
+class FlowError(Exception):
+    """A step's target was missing or its expectation failed."""
+
+
+def field(name):
+    return f'input[name="{name}"], textarea[name="{name}"], select[name="{name}"]'
+
+def shown(value, width=40):
+    value = str(value)
+    return value if len(value) < width else value[:width - 3] + '...'
+
+def as_list(x):
+    return x if isinstance(x, (list, tuple)) else [x]
+
+
+class Flow:
+    """Runs one flow dict on a page. Use run_flow() unless you already have a page."""
+
+    def __init__(self, flow, run, audit, base=None, images=False, log=print):
+        self.flow = flow
+        self.run = run
+        self.page = run.page
+        self.audit = audit
+        self.base = (base or flow.get('start', '')).rstrip('/')
+        self.images = images
+        self.log = log
+
+    def problem(self, step, message):
+        if step.get('optional'):
+            self.log(f"      WARNING: {message}")
+        else:
+            raise FlowError(f"{step['label']}: {message}")
+
+    def pick(self, selectors):
+        """First selector in the fallback list that is on the page, else None."""
+        for sel in as_list(selectors):
+            el = self.page.query_selector(sel)
+            if el and el.is_visible():
+                return sel
+        return None
+
+    def execute(self):
+        steps = self.flow['steps']
+        self.run.total = len(steps)
+        for step in steps:
+            if step.get('always') or self.run.todo(step['label']):
+                with self.run.step(step['label']):
+                    try:
+                        self.do(step)
+                    except Exception:
+                        # The page may be what failed; keep that error, not the capture's
+                        try:
+                            self.audit.failure(step['label'])
+                        except Exception as e:
+                            self.log(f"      Failure capture skipped: {type(e).__name__}: {e}")
+                        raise
+
+    def do(self, step):
+        page, run = self.page, self.run
+        if 'goto' in step:
+            run.goto(step['goto'].format(base=self.base))
+        if 'ready' in step:
+            sel = self.pick(step['ready'])
+            run.wait_for(ready=sel or as_list(step['ready'])[0])
+        for sel in as_list(step.get('check', [])):
+            if self.pick(sel):
+                page.check(sel)
+                self.log(f"      [x] {sel}")
+        for name, value in step.get('fill', {}).items():
+            self.fill(step, name, value)
+        if 'click' in step:
+            self.click(step)
+        if 'expect' in step:
+            self.expect(step, step['expect'])
+        if step.get('capture'):
+            full = step.get('image') == 'full'
+            image = self.images or bool(step.get('image'))
+            element = step['capture'] if image and isinstance(step['capture'], str) else None
+            self.audit.capture(step['label'], image=image, element=element, full=full)
+        if 'dump' in step:
+            self.dump(step['dump'])
+
+    def fill(self, step, name, value):
+        el = self.page.query_selector(field(name))
+        if el is None:
+            self.problem(step, f"field '{name}' not found on page")
+            return
+        if isinstance(value, bool):
+            el.set_checked(value)
+            self.log(f"      [{'x' if value else ' '}] {name}")
+        elif el.evaluate('e => e.tagName') == 'SELECT':
+            el.select_option(str(value))
+            self.log(f"      {name}: {shown(value)}")
+        else:
+            el.fill(str(value))
+            self.log(f"      {name}: {shown(value)}")
+
+    def click(self, step):
+        sel = self.pick(step['click'])
+        if sel is None:
+            # Nothing there yet; give the first choice its wait budget
+            sel = as_list(step['click'])[0]
+            self.run.wait_for(ready=sel)
+        self.run.click(sel, navigate=step.get('navigate', False), response=step.get('response'),
+                       ready=step.get('shows'), gone=step.get('hides'))
+
+    def expect(self, step, expect):
+        if 'url' in expect and expect['url'] not in self.page.url:
+            self.problem(step, f"expected URL with {expect['url']!r}, at {self.page.url}")
+        if 'text' in expect:
+            body = self.page.inner_text('body')
+            for text in as_list(expect['text']):
+                if text.upper() in body.upper():
+                    self.log(f"      VERIFIED: {text}")
+                else:
+                    self.problem(step, f"{text!r} not on the page")
+        mismatched = 0
+        for name, want in expect.get('values', {}).items():
+            el = self.page.query_selector(field(name))
+            if el is None:
+                self.log(f"  {name}: FIELD NOT FOUND")
+                mismatched += 1
+                continue
+            got = el.is_checked() if isinstance(want, bool) else el.input_value()
+            ok = got == (want if isinstance(want, bool) else str(want))
+            mismatched += not ok
+            self.log(f"  {name}: \"{got}\" [{'OK' if ok else 'MISMATCH'}]")
+        if mismatched:
+            self.problem(step, f"{mismatched} field(s) did not read back as filled")
+
+    def dump(self, keywords):
+        for line in self.page.inner_text('body').split('\n'):
+            line = line.strip()
+            if not line or len(line) <= 2 or len(line) >= 300:
+                continue
+            if keywords is True or any(kw in line.upper() for kw in keywords):
+                self.log(f"        {line}")
+
+
+def run_flow(flow, base=None, audit=AUDIT, images=False, fresh=False):
+    """Run `flow` in its session's tab, resuming a run that stopped
+    part-way; after one that finished, the next starts over. The steps'
+    captures go to a new trail under `audit`; `images` adds viewport
+    frames to them."""
+    with sync_playwright() as p:
+        session = Session(p, flow['name'], fresh=fresh, resume=True)
+        if session.resumed and session.steps:
+            print(f"Resuming {flow['name']} at {session.page.url} "
+                  f"({len(session.steps)} of {len(flow['steps'])} steps done)")
+        run = StepRunner(session.page, session=session)
+        trail = AuditTrail(session.page, flow['name'], audit)
+        stopped, finished = None, False
+        try:
+            Flow(flow, run, trail, base, images).execute()
+            finished = True
+        except (FlowError, StepTimeout) as e:
+            stopped = e
+        finally:
+            # Whatever ended the run, the timings, trail and trace are written
+            run.summary()
+            trail.close()
+            if finished:
+                # Only a run that stopped part-way resumes; the tab stays on
+                # the last page for review
+                session.complete()
+                session.close(keep=True)
+            else:
+                session.close()
+        if stopped:
+            print(f"\n  STOPPED: {stopped}")
+            print("  Run again to pick up from this step.")
+            raise SystemExit(1)
+        return run
+
+def add_flow_args(ap, flow):
+    ap.add_argument('--base', default=flow.get('start'), help='site to run against, e.g. a local fixture')
+    ap.add_argument('--audit', default=AUDIT, help='directory for audit trails')
+    ap.add_argument('--images', action='store_true', help='add viewport screenshots to the audit trail')
+    ap.add_argument('--fresh', action='store_true', help='start over instead of resuming the last run')
+    return ap
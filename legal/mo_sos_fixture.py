@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Missouri SOS business entity search
+(bsd.sos.mo.gov/BusinessEntity): the WebForms search page, its postback
+results grid and the entity detail page, served from a small in-memory
+registry. Like the real one, a search only works as a postback carrying
+the page's __VIEWSTATE.
+
+Usage: python3 mo_sos_fixture.py [--port 8766] [--latency 0.3]
+"""
+import argparse
+import html
+import secrets
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+SEARCH = '/BusinessEntity/BESearch.aspx'
+DETAIL = '/BusinessEntity/BusinessEntityDetail.aspx'
+TERM_FIELD = 'ctl00$MainContent$txtSearchTerm'
+SEARCH_BUTTON = 'ctl00$MainContent$btnSearch'
+
+# Internal ID -> entity
+ENTITIES = {
+    '1391204': {
+        'name': 'AVLI CLOUD LLC',
+        'charter': 'LC014870311',
+        'type': 'LLC - Domestic',
+        'status': 'Active',
+        'formed': '03/12/2026',
+        'agent': 'MISSOURI REGISTERED AGENT LLC',
+        'agent_address': '3100 BROADWAY STE 1040\nKANSAS CITY, MO 64111',
+    },
+    '1187733': {
+        'name': 'CITY BIRD LLC',
+        'charter': 'LC012001432',
+        'type': 'LLC - Domestic',
+        'status': 'Administratively Dissolved',
+        'formed': '08/04/2017',
+        'agent': 'VALIDO, ALBERTO',
+        'agent_address': '1200 MAIN ST\nKANSAS CITY, MO 64105',
+    },
+    '1290017': {
+        'name': 'MERIDIAN BRIDGE PARTNERS LLC',
+        'charter': 'LC013550228',
+        'type': 'LLC - Domestic',
+        'status': 'Active',
+        'formed': '11/19/2021',
+        'agent': 'CT CORPORATION SYSTEM',
+        'agent_address': '120 S CENTRAL AVE\nCLAYTON, MO 63105',
+    },
+}
+
+def matches(term):
+    term = ' '.join(term.upper().split())
+    if not term:
+        return []
+    return sorted((i for i, e in ENTITIES.items() if e['name'].startswith(term)),
+                  key=lambda i: ENTITIES[i]['name'])
+
+def page(title, body):
+    return f'''<!DOCTYPE html><html><head><meta charset="utf-8"><title>{title} - Missouri Secretary of State</title></head>
+<body><div id="MainContent"><h1>{title}</h1>
+{body}
+</div></body></html>'''
+
+def search_form(viewstate, term='', results=''):
+    return page('Business Entity Search', f'''
+<form method="post" action="{SEARCH}?SearchType=0" id="form1">
+<input type="hidden" name="__VIEWSTATE" value="{viewstate}">
+<input type="hidden" name="__EVENTVALIDATION" value="{viewstate[::-1]}">
+<label for="MainContent_txtSearchTerm">Business Name</label>
+<input type="text" name="{TERM_FIELD}" id="MainContent_txtSearchTerm" value="{html.escape(term)}">
+<input type="submit" name="{SEARCH_BUTTON}" value="Search" id="MainContent_btnSearch">
+</form>
+{results}''')
+
+def render_detail(entity_id):
+    e = ENTITIES[entity_id]
+    lines = '<br/>'.join(html.escape(l) for l in e['agent_address'].split('\n'))
+    return page('Business Entity Detail', f'''
+<table id="MainContent_tblDetail">
+<tr><td>Name(s)</td><td><span id="MainContent_lblName">{html.escape(e['name'])}</span></td></tr>
+<tr><td>Type</td><td><span id="MainContent_lblType">{e['type']}</span></td></tr>
+<tr><td>Charter No.</td><td><span id="MainContent_lblCharterNo">{e['charter']}</span></td></tr>
+<tr><td>Status</td><td><span id="MainContent_lblStatus">{e['status']}</span></td></tr>
+<tr><td>Date Formed</td><td><span id="MainContent_lblDateFormed">{e['formed']}</span></td></tr>
+<tr><td>Registered Agent</td><td><span id="MainContent_lblAgentName">{html.escape(e['agent'])}</span><br/>
+<span id="MainContent_lblAgentAddress">{lines}</span></td></tr>
+</table>''')
+
+
+class MoSosHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    latency = 0.0
+    viewstate = ''
+
+    def setup(self):
+        super().setup()
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def log_message(self, fmt, *args):
+        pass
+
+    def reply(self, status, body):
+        data = body.encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        url = urlsplit(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        if url.path == SEARCH:
+            self.reply(200, search_form(self.viewstate))
+        elif url.path == DETAIL and query.get('ID') in ENTITIES:
+            self.reply(200, render_detail(query['ID']))
+        else:
+            self.reply(404, page('Error', '<p>The requested page was not found.</p>'))
+
+    def do_POST(self):
+        time.sleep(self.latency)
+        url = urlsplit(self.path)
+        raw = self.rfile.read(int(self.headers.get('Content-Length') or 0)).decode()
+        form = {k: v[0] for k, v in parse_qs(raw, keep_blank_values=True).items()}
+        if url.path != SEARCH:
+            self.reply(404, page('Error', '<p>The requested page was not found.</p>'))
+            return
+        term = form.get(TERM_FIELD, '')
+        if form.get('__VIEWSTATE') != self.viewstate or SEARCH_BUTTON not in form:
+            # Not a postback of our page: WebForms just re-renders the form
+            self.reply(200, search_form(self.viewstate, term))
+            return
+        ids = matches(term)
+        if not ids:
+            results = '<p id="MainContent_lblNoResults">No records found.</p>'
+        else:
+            rows = ''.join(
+                f'<tr><td><a href="{DETAIL}?page=beSearch&amp;ID={i}">{html.escape(ENTITIES[i]["name"])}</a></td>'
+                f'<td>{ENTITIES[i]["charter"]}</td><td>{ENTITIES[i]["type"]}</td>'
+                f'<td>{ENTITIES[i]["status"]}</td></tr>' for i in ids)
+            results = (f'<table id="MainContent_gvResults"><tr><th>Name</th><th>Charter No.</th>'
+                       f'<th>Type</th><th>Status</th></tr>{rows}</table>')
+        self.reply(200, search_form(self.viewstate, term, results))
+
+
+def serve(port=0, latency=0.0):
+    """Start the fixture on a background thread; returns (server, base_url)."""
+    handler = type('Handler', (MoSosHandler,), {'latency': latency,
+                                                'viewstate': secrets.token_urlsafe(24)})
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_address[1]}'
+
+if __name__ == '__main__':
+    ap = argparse.ArgumentParser(description='Local stand-in for the Missouri SOS entity search')
+    ap.add_argument('--port', type=int, default=8766)
+    ap.add_argument('--latency', type=float, default=0.0, help='seconds added to every request')
+    args = ap.parse_args()
+    server, base = serve(args.port, args.latency)
+    print(f"Missouri SOS fixture at {base}{SEARCH}?SearchType=0 ({len(ENTITIES)} entities)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
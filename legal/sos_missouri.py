@@ -5,12 +5,13 @@ sys.path.insert(0, '/Users/rnir_hrc_avd/Library/Python/3.9/lib/python/site-packa
 
 from playwright.sync_api import sync_playwright
 
+from browser_daemon import Session
+from extract import mo_results
+
 def search_missouri():
     with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page(
-            user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        )
+        session = Session(p, 'sos_missouri')
+        page = session.page
 
         searches = [
             'Avli Cloud',
@@ -40,12 +41,12 @@ def search_missouri():
                         submit.click()
                         page.wait_for_load_state('networkidle', timeout=15000)
 
-                        body = page.inner_text('body')
-                        lines = [l.strip() for l in body.split('\n') if l.strip()]
-                        # Print relevant results
-                        for line in lines:
-                            if any(kw in line.lower() for kw in [term.lower().split()[0].lower(), 'llc', 'active', 'inactive', 'charter', 'good standing', 'no record', 'no results']):
-                                print(f"  {line[:200]}")
+                        rows = mo_results(page)
+                        if rows is None:
+                            print("  No records found")
+                        for row in rows or []:
+                            print(f"  {row.get('name', ''):<40} {row.get('charter', ''):<12} "
+                                  f"{row.get('type', ''):<16} {row.get('status', '')}")
                     else:
                         print("  Could not find submit button")
                         # Dump form structure
@@ -64,7 +65,7 @@ def search_missouri():
             except Exception as e:
                 print(f"  Error: {e}")
 
-        browser.close()
+        session.close()
 
 if __name__ == '__main__':
     search_missouri()
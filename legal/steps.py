@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Step runner for the filing scripts — waits on what the page actually does
+(a selector appearing or going away, a navigation, a response) instead of
+fixed time.sleep() calls on top of networkidle.
+
+    run = StepRunner(page, total=7)
+    with run.step('Loading entity'):
+        run.goto(START, ready='input[name="DocumentId"]')
+        page.fill('input[name="DocumentId"]', DOC_NUMBER)
+        run.click('input[type="submit"]', navigate=True, ready='text=Edit or Delete Manager')
+    ...
+    run.summary()
+
+Timeouts adapt: a wait's budget is ADAPT_FACTOR times the slowest it has
+recently taken (kept across runs in TIMINGS), within MIN_TIMEOUT..MAX_TIMEOUT.
+A wait never seen before gets DEFAULT_TIMEOUT. So a missing element fails
+in seconds, and a site that is slow today still gets the time it needs.
+
+Given a browser_daemon.Session, each finished step is checkpointed, and
+todo() lets a resumed run skip the steps its tab has already been through:
+
+    if run.todo('Saving officer'):
+        with run.step('Saving officer'):
+            ...
+
+With the session's tracing.Tracer (or trace=), each step and each wait is
+a span in the run's trace, and the summary adds what each step downloaded.
+"""
+import sys
+sys.path.insert(0, '/Users/rnir_hrc_avd/Library/Python/3.9/lib/python/site-packages')
+
+import contextlib
+import json
+import os
+import time
+
+from playwright.sync_api import TimeoutError as PlaywrightTimeout
+
+TIMINGS = os.path.expanduser('~/.l7/cache/legal/step-timings.json')
+DEFAULT_TIMEOUT = 20.0
+MIN_TIMEOUT = 3.0
+MAX_TIMEOUT = 60.0
+ADAPT_FACTOR = 4.0
+DECAY = 0.9
+
+
+class StepTimeout(Exception):
+    """A step's wait ran out; says which step and what it was waiting for."""
+
+
+class StepRunner:
+    def __init__(self, page, total=None, log=print, timings=TIMINGS, session=None, trace=None):
+        self.page = page
+        self.session = session
+        self.trace = trace if trace is not None else getattr(session, 'trace', None)
+        self.total = total
+        self.log = log
+        self.timings_path = timings
+        try:
+            with open(timings) as f:
+                self.seen = json.load(f)
+        except (OSError, ValueError):
+            self.seen = {}
+        self.steps = []
+        self.current = None
+
+    # ── budgets ──
+
+    def budget(self, key):
+        """Seconds to allow for the wait `key`."""
+        slowest = self.seen.get(key)
+        if slowest is None:
+            return DEFAULT_TIMEOUT
+        return min(MAX_TIMEOUT, max(MIN_TIMEOUT, slowest * ADAPT_FACTOR))
+
+    def _observe(self, key, seconds):
+        # Slowest seen, decaying, so a site that speeds up gets tighter budgets
+        self.seen[key] = max(seconds, self.seen.get(key, 0.0) * DECAY)
+        if self.current is not None:
+            self.current['waits'].append((key, seconds))
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.timings_path), exist_ok=True)
+        with open(self.timings_path + '.tmp', 'w') as f:
+            json.dump(self.seen, f, indent=1, sort_keys=True)
+        os.replace(self.timings_path + '.tmp', self.timings_path)
+
+    # ── steps ──
+
+    def _header(self, label, note=''):
+        n = len(self.steps) + 1
+        self.log((f"[{n}/{self.total}] " if self.total else f"[{n}] ") + f"{label}...{note}")
+
+    def todo(self, label):
+        """False (and logged as skipped) if a resumed session already did `label`."""
+        if self.session is None or not self.session.done(label):
+            return True
+        self._header(label, ' already done, skipped')
+        self.steps.append({'label': label, 'waits': [], 'seconds': 0.0, 'ok': True, 'skipped': True})
+        return False
+
+    @contextlib.contextmanager
+    def step(self, label):
+        self._header(label)
+        self.current = {'label': label, 'waits': [], 'seconds': 0.0, 'ok': False}
+        self.steps.append(self.current)
+        span = self.trace.open(label, 'step', self.page) if self.trace else None
+        start = time.monotonic()
+        try:
+            yield self
+            self.current['ok'] = True
+            if self.session is not None:
+                self.session.checkpoint(label)
+        finally:
+            self.current['seconds'] = time.monotonic() - start
+            if span:
+                self.trace.finish(span, ok=self.current['ok'])
+                self.current['bytes'] = span['args']['bytes']
+            waited = ', '.join(f"{k} {s:.2f}s" for k, s in self.current['waits'])
+            self.log(f"      {'done' if self.current['ok'] else 'FAILED'} in "
+                     f"{self.current['seconds']:.2f}s" + (f" (waited: {waited})" if waited else ''))
+            self.current = None
+
+    # ── waits ──
+
+    def _wait(self, key, fn, kind='wait'):
+        limit = self.budget(key)
+        span = self.trace.open(key, kind, self.page, budget=limit) if self.trace else None
+        start = time.monotonic()
+        try:
+            result = fn(limit * 1000)
+        except PlaywrightTimeout as e:
+            where = f" in '{self.current['label']}'" if self.current else ''
+            raise StepTimeout(f"Gave up{where} after {limit:.1f}s waiting for {key}") from e
+        finally:
+            if span:
+                self.trace.finish(span)
+        self._observe(key, time.monotonic() - start)
+        return result
+
+    def wait_for(self, ready=None, gone=None):
+        """Wait for selector `ready` to be visible and/or `gone` to be hidden."""
+        if ready:
+            self._wait(f"ready {ready}",
+                       lambda ms: self.page.wait_for_selector(ready, state='visible', timeout=ms))
+        if gone:
+            self._wait(f"gone {gone}",
+                       lambda ms: self.page.wait_for_selector(gone, state='hidden', timeout=ms))
+
+    def act(self, action, navigate=False, response=None, ready=None, gone=None):
+        """Run `action` and wait for what it should cause.
+
+        navigate: the action loads a new document. response: a URL glob,
+        regex or predicate for a response the action triggers. ready/gone:
+        selectors to appear/disappear afterwards. Returns the Response if
+        one was awaited.
+        """
+        key = ' + '.join(k for k in (navigate and 'navigation',
+                                     response and f"response {getattr(response, 'pattern', response)}") if k)
+        if not key:
+            action()
+            self.wait_for(ready, gone)
+            return None
+        def run(ms):
+            with contextlib.ExitStack() as stack:
+                nav = stack.enter_context(self.page.expect_navigation(
+                    wait_until='domcontentloaded', timeout=ms)) if navigate else None
+                resp = stack.enter_context(self.page.expect_response(response, timeout=ms)) \
+                    if response else None
+                action()
+            return resp.value if resp else nav.value
+        result = self._wait(key, run, 'navigation' if navigate else 'wait')
+        self.wait_for(ready, gone)
+        return result
+
+    def goto(self, url, ready=None):
+        key = f"load {url.split('?')[0]}"
+        result = self._wait(key, lambda ms: self.page.goto(url, wait_until='domcontentloaded', timeout=ms),
+                            'navigation')
+        self.wait_for(ready)
+        return result
+
+    def click(self, target, **waits):
+        """Click a selector string or a Locator, then wait as in act()."""
+        if isinstance(target, str):
+            return self.act(lambda: self.page.click(target), **waits)
+        return self.act(target.click, **waits)
+
+    # ── report ──
+
+    def summary(self):
+        """Per-step table; also saves what the waits took for the next run."""
+        self.save()
+        total = sum(s['seconds'] for s in self.steps)
+        self.log("\n      Step timings:")
+        for n, s in enumerate(self.steps, 1):
+            received = f"  {s['bytes'] / 1024:7.0f} KB" if 'bytes' in s else ''
+            self.log(f"      {n:>2}. {s['label']:<40} {s['seconds']:6.2f}s{received}"
+                     f"{'  skipped' if s.get('skipped') else '' if s['ok'] else '  FAILED'}")
+        self.log(f"          {'total':<40} {total:6.2f}s")
+        return total
@@ -13,6 +13,10 @@ sys.path.insert(0, '/Users/rnir_hrc_avd/Library/Python/3.9/lib/python/site-packa
 
 from playwright.sync_api import sync_playwright
 
+from browser_daemon import Session
+from entity_cache import show
+from extract import entity_detail, links, search_results
+
 DOC_NUMBER = 'L19000154273'
 ENTITY_NAME = 'AVALIA CONSULTING LLC'
 
@@ -31,12 +35,8 @@ NEW_RA = {
 
 def explore_efile():
     with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page(
-            user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) '
-                       'AppleWebKit/537.36 (KHTML, like Gecko) '
-                       'Chrome/120.0.0.0 Safari/537.36'
-        )
+        session = Session(p, 'sunbiz_amend')
+        page = session.page
 
         # Step 1: Check what filing options exist at efile.sunbiz.org
         print("=" * 60)
@@ -49,10 +49,7 @@ def explore_efile():
         print(f"URL: {page.url}")
 
         # Find all links on the main page
-        links = page.query_selector_all('a')
-        for link in links:
-            text = link.inner_text().strip()
-            href = link.get_attribute('href') or ''
+        for text, href in links(page):
             if text and len(text) > 2 and len(text) < 100:
                 # Look for amendment, change, annual report, LLC-related links
                 if any(kw in text.lower() for kw in [
@@ -146,11 +143,9 @@ def explore_efile():
         page.wait_for_load_state('networkidle')
 
         # Get ALL links
-        all_links = page.query_selector_all('a')
+        all_links = links(page)
         print(f"  Total links on main page: {len(all_links)}")
-        for link in all_links:
-            text = link.inner_text().strip()
-            href = link.get_attribute('href') or ''
+        for text, href in all_links:
             if text and len(text) > 2:
                 print(f"  [{text}] -> {href}")
 
@@ -166,30 +161,18 @@ def explore_efile():
         page.click('input[type="submit"], button[type="submit"]')
         page.wait_for_load_state('networkidle')
 
-        results = page.query_selector_all('a[href*="SearchResultDetail"]')
-        for r in results[:5]:
-            text = r.inner_text().strip()
-            if 'AVALIA' in text:
-                print(f"  Found: {text}")
-                href = r.get_attribute('href')
-                full_url = f'https://search.sunbiz.org{href}' if href.startswith('/') else href
-                page.goto(full_url)
+        for hit in search_results(page, limit=5):
+            if 'AVALIA' in hit['name']:
+                print(f"  Found: {hit['name']}  {hit['doc']}  {hit['status']}")
+                page.goto(hit['url'])
                 page.wait_for_load_state('networkidle')
 
-                # Dump the full entity detail
-                body = page.inner_text('body')
                 print("\n  --- CURRENT ENTITY RECORD ---")
-                for line in body.split('\n'):
-                    line = line.strip()
-                    if line and len(line) > 2 and len(line) < 200:
-                        print(f"  {line}")
+                show(entity_detail(page))
 
                 # Look for any filing/amendment links on the detail page
-                detail_links = page.query_selector_all('a')
                 print("\n  --- LINKS ON DETAIL PAGE ---")
-                for dl in detail_links:
-                    dt = dl.inner_text().strip()
-                    dh = dl.get_attribute('href') or ''
+                for dt, dh in links(page):
                     if dt and len(dt) > 2 and any(kw in dt.lower() for kw in [
                         'file', 'amend', 'change', 'annual', 'report', 'update', 'efile'
                     ]):
@@ -204,7 +187,7 @@ def explore_efile():
         )
         print("\n  Screenshot saved: legal/sunbiz_entity_current.png")
 
-        browser.close()
+        session.close()
 
 if __name__ == '__main__':
     explore_efile()
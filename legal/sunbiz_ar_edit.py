@@ -11,17 +11,15 @@ sys.path.insert(0, '/Users/rnir_hrc_avd/Library/Python/3.9/lib/python/site-packa
 
 from playwright.sync_api import sync_playwright
 
+from browser_daemon import Session
+
 DOC_NUMBER = 'L19000154273'
 SS = '/Users/rnir_hrc_avd/Backup/L7_WAY/legal/'
 
 def file_ar():
     with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page(
-            user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) '
-                       'AppleWebKit/537.36 (KHTML, like Gecko) '
-                       'Chrome/120.0.0.0 Safari/537.36'
-        )
+        session = Session(p, 'sunbiz_ar_edit')
+        page = session.page
 
         # Step 1: Load entity
         print("[1] Loading entity...")
@@ -240,7 +238,7 @@ def file_ar():
         print("\n*** FORM IS NOT SUBMITTED — Review screenshots ***")
         print(f"*** Fee: $138.75 ***")
 
-        browser.close()
+        session.close()
 
 if __name__ == '__main__':
     file_ar()
@@ -13,17 +13,15 @@ sys.path.insert(0, '/Users/rnir_hrc_avd/Library/Python/3.9/lib/python/site-packa
 
 from playwright.sync_api import sync_playwright
 
+from browser_daemon import Session
+
 DOC_NUMBER = 'L19000154273'
 SS = '/Users/rnir_hrc_avd/Backup/L7_WAY/legal/'
 
 def file_ar():
     with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page(
-            user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) '
-                       'AppleWebKit/537.36 (KHTML, like Gecko) '
-                       'Chrome/120.0.0.0 Safari/537.36'
-        )
+        session = Session(p, 'sunbiz_ar_submit')
+        page = session.page
 
         # ======== STEP 1: Load entity ========
         print("[1/6] Loading entity...")
@@ -65,7 +63,7 @@ def file_ar():
         else:
             print(f"      ERROR: Officer fields not found")
             page.screenshot(path=f'{SS}ar_2_error.png', full_page=True)
-            browser.close()
+            session.close()
             return
 
         # ======== STEP 3: Edit Registered Agent ========
@@ -221,7 +219,7 @@ def file_ar():
         print(f"  *** No payment has been made ***")
         print(f"  *** Screenshots: ar_1 through ar_7 ***")
 
-        browser.close()
+        session.close()
 
 if __name__ == '__main__':
     file_ar()
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Shared Sunbiz search engine — many searches at once on a pool of browser
+contexts, instead of one page walking the list.
+
+    async with SearchEngine(contexts=4) as engine:
+        hits = await engine.search('name', 'Avalia')
+        many = await engine.search_many([('name', 'Apex'), ('officer', 'Valido Alberto')])
+
+Each hit is (text, absolute detail URL). Repeated queries (same kind, same
+term up to case and spacing) run once and share the result. Page loads to
+one host are spaced by a rate limit so a sweep doesn't hammer the state.
+With shared=True the contexts open in the browser_daemon.py browser rather
+than a freshly launched one. Every page is traced (tracing.py), rate-limit
+waits included.
+
+Usage: python3 sunbiz_engine.py --selftest   # a sweep against sunbiz_fixture
+"""
+import sys
+sys.path.insert(0, '/Users/rnir_hrc_avd/Library/Python/3.9/lib/python/site-packages')
+
+import argparse
+import asyncio
+import time
+from urllib.parse import urlsplit
+
+from playwright.async_api import async_playwright
+
+import browser_daemon
+import tracing
+from extract import LINKS_JS
+
+SUNBIZ = 'https://search.sunbiz.org'
+USER_AGENT = ('Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) '
+              'AppleWebKit/537.36 (KHTML, like Gecko) '
+              'Chrome/120.0.0.0 Safari/537.36')
+
+SEARCH_PATHS = {
+    'name': '/Inquiry/CorporationSearch/ByName',
+    'officer': '/Inquiry/CorporationSearch/ByOfficerOrRegisteredAgent',
+    'agent': '/Inquiry/CorporationSearch/ByRegisteredAgent',
+    'document': '/Inquiry/CorporationSearch/ByDocumentNumber',
+    'fei': '/Inquiry/CorporationSearch/ByFeiEinNumber',
+}
+RESULT_LINKS = 'SearchResultDetail'
+
+# Result pages are server-rendered; none of this is needed to read them
+SKIP_RESOURCES = {'image', 'font', 'media', 'stylesheet'}
+
+
+def query_key(kind, term):
+    return kind, ' '.join(term.upper().split())
+
+
+class HostLimiter:
+    """Spaces request starts to each host at least 1/rate seconds apart."""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0.0
+        self.next_slot = {}
+        self.lock = asyncio.Lock()
+
+    async def wait(self, url):
+        if not self.interval:
+            return
+        host = urlsplit(url).netloc
+        async with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot.get(host, 0.0))
+            self.next_slot[host] = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+class SearchEngine:
+    """Runs Sunbiz searches on `contexts` browser contexts in parallel.
+
+    Each context has its own cookies, so concurrent form posts don't share
+    session state. `rate` caps page loads per second per host (0 = no cap).
+    """
+
+    def __init__(self, contexts=4, rate=4.0, base=SUNBIZ, headless=True, shared=False):
+        self.size = contexts
+        self.base = base.rstrip('/')
+        self.headless = headless
+        self.shared = shared
+        self.rate = rate
+        self.results = {}
+        self.searches = 0
+        self.deduped = 0
+
+    async def __aenter__(self):
+        # asyncio primitives bind to the running loop on 3.9, so build them here
+        self.limiter = HostLimiter(self.rate)
+        self.playwright = await async_playwright().start()
+        if self.shared:
+            port = await asyncio.to_thread(browser_daemon.start,
+                                           self.playwright.chromium.executable_path, self.headless)
+            # Closing a CDP connection drops our contexts but leaves the browser up
+            self.browser = await self.playwright.chromium.connect_over_cdp(f'http://127.0.0.1:{port}')
+        else:
+            self.browser = await self.playwright.chromium.launch(headless=self.headless)
+        self.trace = tracing.Tracer('sunbiz_engine') if tracing.enabled() else None
+        self.pages = asyncio.Queue()
+        for _ in range(self.size):
+            context = await self.browser.new_context(user_agent=USER_AGENT)
+            await context.route('**/*', self._filter)
+            page = await context.new_page()
+            if self.trace:
+                await self.trace.attach_async(page)
+            await self.pages.put(page)
+        return self
+
+    async def __aexit__(self, *exc):
+        if self.trace:
+            self.trace.close()
+        await self.browser.close()
+        await self.playwright.stop()
+
+    async def _filter(self, route):
+        if route.request.resource_type in SKIP_RESOURCES:
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def pace(self, page, url):
+        """Wait for the host's rate limit, as a span in the trace."""
+        span = self.trace.open(f'rate limit {urlsplit(url).netloc}', 'sleep', page) if self.trace else None
+        await self.limiter.wait(url)
+        if span:
+            self.trace.finish(span)
+
+    async def goto(self, page, url):
+        await self.pace(page, url)
+        await page.goto(url, wait_until='domcontentloaded')
+
+    def search(self, kind, term):
+        """Hits for one query; a repeat of an earlier query shares its result."""
+        key = query_key(kind, term)
+        if key in self.results:
+            self.deduped += 1
+        else:
+            self.results[key] = asyncio.ensure_future(self._search(kind, key[1]))
+        return self.results[key]
+
+    async def search_many(self, queries):
+        """Hits for each (kind, term), in the order given."""
+        return await asyncio.gather(*(self.search(kind, term) for kind, term in queries))
+
+    async def _search(self, kind, term):
+        page = await self.pages.get()
+        try:
+            self.searches += 1
+            await self.goto(page, self.base + SEARCH_PATHS[kind])
+            box = await page.query_selector('#SearchTerm') or \
+                await page.query_selector('input[type="text"]')
+            if box is None:
+                raise RuntimeError(f"No search box on {page.url}")
+            await box.fill(term)
+            await self.pace(page, page.url)
+            async with page.expect_navigation(wait_until='domcontentloaded'):
+                await page.click('input[type="submit"], button[type="submit"]')
+            # One round trip for every row, not two per link
+            return [tuple(hit) for hit in await page.evaluate(LINKS_JS, RESULT_LINKS)]
+        finally:
+            self.pages.put_nowait(page)
+
+
+async def selftest():
+    """A sweep against sunbiz_fixture: the hits must match sunbiz_http's,
+    repeats must share one search, and the rate limit must hold."""
+    from sunbiz_fixture import serve
+    from sunbiz_http import LookupClient
+    server, base = serve(latency=0.02)
+    queries = [('name', n) for n in ('Avalia', 'AVLI', 'City Bird', 'Opus', 'Emerald', 'Nothing')] + \
+              [('officer', 'Saavedra Rodrigo'), ('agent', 'Saavedra'), ('document', 'L19000154273'),
+               ('fei', '84-2183945'), ('name', 'avalia '), ('name', 'AVLI')]
+    ok = True
+    rate = 20.0
+    with LookupClient(rate=0, base=base) as client:
+        expected = client.search_many(queries)
+    async with SearchEngine(contexts=4, rate=rate, base=base) as engine:
+        start = time.monotonic()
+        hits = await engine.search_many(queries)
+        took = time.monotonic() - start
+        pooled = engine.pages.qsize()
+    server.shutdown()
+    server.server_close()
+    for (kind, term), got, want in zip(queries, hits, expected):
+        if got != want:
+            print(f"  {kind} {term!r}: got {got}, expected {want}")
+            ok = False
+    unique = len({query_key(kind, term) for kind, term in queries})
+    # Two paced page loads per search, all to the one fixture host
+    floor = (2 * unique - 1) / rate
+    print(f"  {len(queries)} queries: {engine.searches} searches, {engine.deduped} shared, "
+          f"{took:.2f}s (rate limit floor {floor:.2f}s), {pooled} of {engine.size} pages back in the pool")
+    if engine.searches != unique or engine.deduped != len(queries) - unique:
+        ok = False
+    if took < floor * 0.95 or pooled != engine.size:
+        ok = False
+    print(f"  {'ok' if ok else 'FAILED'}")
+    return ok
+
+if __name__ == '__main__':
+    ap = argparse.ArgumentParser(description='Parallel Sunbiz searches in a browser')
+    ap.add_argument('--selftest', action='store_true', help='sweep sunbiz_fixture and check the hits')
+    args = ap.parse_args()
+    if args.selftest:
+        raise SystemExit(0 if asyncio.run(selftest()) else 1)
+    ap.print_help()
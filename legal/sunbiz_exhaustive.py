@@ -1,121 +1,122 @@
 #!/usr/bin/env python3
-"""Exhaustive Sunbiz search — every possible name the Philosopher might have used."""
+"""Exhaustive Sunbiz search — every possible name the Philosopher might have used.
+
+All queries go out at once and duplicates run once: over plain HTTP by
+default (sunbiz_http), or on browser contexts with --browser
+(sunbiz_engine). --base points it at another host, e.g. sunbiz_fixture.py;
+--workers 1 reproduces the old one-by-one sweep.
+"""
 import sys
 sys.path.insert(0, '/Users/rnir_hrc_avd/Library/Python/3.9/lib/python/site-packages')
 
-from playwright.sync_api import sync_playwright
-
-def search():
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page(
-            user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        )
-
-        # Every possible entity name
-        names = [
-            'Apex',
-            'Apex Cloud',
-            'Apex Avli',
-            'Avalia',
-            'Avalia Cloud',
-            'Valido',
-            'Valido Cloud',
-            'L7',
-            'L7 Way',
-            'L7 Cloud',
-            'Emerald',
-            'Emerald Tablet',
-            'Prima',
-            'Valhalla',
-            'Newdawn',
-            'New Dawn',
-            'Malkuth',
-            'Philosopher',
-            'Great Work',
-            'Forge',
-            'City Bird',
-            'Lapis',
-            'Transmutation',
-            'Dodecahedron',
-            'Astrocyte',
-            'IQS',
-            'IQS 888',
-            'Rubedo',
-            'Citrinitas',
-            'Albedo',
-            'Nigredo',
-            'Opus',
-            'Opus Cloud',
-            'Craft',
-            'Craft L7',
-            'L7Way',
-            'L7 Way',
-            'Avli',
-            'Cloud Avli',
-            'Alberto Valido',
-            'Valido Delgado',
-            'Avalia Cloud',
-            'Avalia',
-            'Vargas Lujan',
-            'Vargas-Lujan',
-        ]
+import argparse
+import asyncio
+import time
 
-        for name in names:
-            page.goto('https://search.sunbiz.org/Inquiry/CorporationSearch/ByName')
-            page.wait_for_load_state('networkidle')
-            si = page.query_selector('#SearchTerm')
-            si.fill(name)
-            page.click('input[type="submit"], button[type="submit"]')
-            page.wait_for_load_state('networkidle')
+from sunbiz_http import add_lookup_args, client_from_args
 
-            results = page.query_selector_all('a[href*="SearchResultDetail"]')
-            hits = []
-            if results:
-                for r in results[:5]:
-                    text = r.inner_text().strip()
-                    # Only show exact or very close matches
-                    if name.upper().split()[0] in text.upper():
-                        hits.append(text)
+# Every possible entity name
+NAMES = [
+    'Apex',
+    'Apex Cloud',
+    'Apex Avli',
+    'Avalia',
+    'Avalia Cloud',
+    'Valido',
+    'Valido Cloud',
+    'L7',
+    'L7 Way',
+    'L7 Cloud',
+    'Emerald',
+    'Emerald Tablet',
+    'Prima',
+    'Valhalla',
+    'Newdawn',
+    'New Dawn',
+    'Malkuth',
+    'Philosopher',
+    'Great Work',
+    'Forge',
+    'City Bird',
+    'Lapis',
+    'Transmutation',
+    'Dodecahedron',
+    'Astrocyte',
+    'IQS',
+    'IQS 888',
+    'Rubedo',
+    'Citrinitas',
+    'Albedo',
+    'Nigredo',
+    'Opus',
+    'Opus Cloud',
+    'Craft',
+    'Craft L7',
+    'L7Way',
+    'L7 Way',
+    'Avli',
+    'Cloud Avli',
+    'Alberto Valido',
+    'Valido Delgado',
+    'Avalia Cloud',
+    'Avalia',
+    'Vargas Lujan',
+    'Vargas-Lujan',
+]
 
-            if hits:
-                print(f"{name}:")
-                for h in hits:
-                    print(f"  -> {h}")
-            else:
-                print(f"{name}: (no close match)")
+OFFICER_TERMS = [
+    'Alberto Valido',
+    'Valido Alberto',
+    'Valido, Alberto',
+    'Delgado Alberto',
+    'Delgado, Alberto',
+]
 
-        # Now search officer/RA for Alberto, Valido, Delgado
-        print("\n" + "=" * 50)
-        print("OFFICER/RA SEARCHES")
-        print("=" * 50)
+def report(by_name, by_officer):
+    for name, results in zip(NAMES, by_name):
+        # Only show exact or very close matches
+        hits = [text for text, _ in results[:5] if name.upper().split()[0] in text.upper()]
+        if hits:
+            print(f"{name}:")
+            for h in hits:
+                print(f"  -> {h}")
+        else:
+            print(f"{name}: (no close match)")
 
-        officer_terms = [
-            'Alberto Valido',
-            'Valido Alberto',
-            'Valido, Alberto',
-            'Delgado Alberto',
-            'Delgado, Alberto',
-        ]
+    # Now search officer/RA for Alberto, Valido, Delgado
+    print("\n" + "=" * 50)
+    print("OFFICER/RA SEARCHES")
+    print("=" * 50)
 
-        for term in officer_terms:
-            page.goto('https://search.sunbiz.org/Inquiry/CorporationSearch/ByOfficerOrRegisteredAgent')
-            page.wait_for_load_state('networkidle')
-            si = page.query_selector('#SearchTerm')
-            if si:
-                si.fill(term)
-                page.click('input[type="submit"], button[type="submit"]')
-                page.wait_for_load_state('networkidle')
-                results = page.query_selector_all('a[href*="SearchResultDetail"]')
-                if results:
-                    print(f"\n{term}:")
-                    for r in results[:15]:
-                        text = r.inner_text().strip()
-                        print(f"  -> {text}")
-                else:
-                    print(f"{term}: (no results)")
+    for term, results in zip(OFFICER_TERMS, by_officer):
+        if results:
+            print(f"\n{term}:")
+            for text, _ in results[:15]:
+                print(f"  -> {text}")
+        else:
+            print(f"{term}: (no results)")
 
-        browser.close()
+def search(args):
+    queries = [('name', n) for n in NAMES] + [('officer', t) for t in OFFICER_TERMS]
+    start = time.monotonic()
+    if args.browser:
+        from sunbiz_engine import SearchEngine
+        async def run():
+            async with SearchEngine(contexts=args.workers, rate=args.rate, base=args.base,
+                                    shared=args.shared_browser) as engine:
+                return engine, await engine.search_many(queries)
+        client, results = asyncio.run(run())
+    else:
+        with client_from_args(args) as client:
+            results = client.search_many(queries)
+    report(results[:len(NAMES)], results[len(NAMES):])
+    print(f"\n{client.searches} searches ({client.deduped} duplicates skipped) "
+          f"in {time.monotonic() - start:.1f}s on {args.workers} "
+          f"{'browser contexts' if args.browser else 'connections'}")
 
 if __name__ == '__main__':
-    search()
+    ap = add_lookup_args(argparse.ArgumentParser(description=__doc__.split('\n')[0]), workers=4)
+    ap.add_argument('--browser', action='store_true', help='search in headless Chromium instead of over HTTP')
+    ap.add_argument('--shared-browser', action='store_true',
+                    help='with --browser, use the browser_daemon.py browser instead of launching one')
+    search(ap.parse_args())
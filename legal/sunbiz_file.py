@@ -5,12 +5,12 @@ sys.path.insert(0, '/Users/rnir_hrc_avd/Library/Python/3.9/lib/python/site-packa
 
 from playwright.sync_api import sync_playwright
 
+from browser_daemon import Session
+
 def map_filing_form():
     with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page(
-            user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        )
+        session = Session(p, 'sunbiz_file')
+        page = session.page
 
         print("=" * 60)
         print("SUNBIZ LLC FILING FORM — efile.sunbiz.org")
@@ -70,7 +70,7 @@ def map_filing_form():
         page.screenshot(path='/Users/rnir_hrc_avd/Backup/L7_WAY/legal/sunbiz_filing_form.png', full_page=True)
         print("\n[Screenshot saved to legal/sunbiz_filing_form.png]")
 
-        browser.close()
+        session.close()
 
 if __name__ == '__main__':
     map_filing_form()
@@ -5,12 +5,14 @@ sys.path.insert(0, '/Users/rnir_hrc_avd/Library/Python/3.9/lib/python/site-packa
 
 from playwright.sync_api import sync_playwright
 
+from browser_daemon import Session
+from entity_cache import show
+from extract import entity_detail, search_results
+
 def search():
     with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page(
-            user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        )
+        session = Session(p, 'sunbiz_final')
+        page = session.page
 
         # New terms from the Philosopher
         names = [
@@ -25,26 +27,18 @@ def search():
             si.fill(name)
             page.click('input[type="submit"], button[type="submit"]')
             page.wait_for_load_state('networkidle')
-            results = page.query_selector_all('a[href*="SearchResultDetail"]')
-            if results:
+            hits = search_results(page, limit=5)
+            if hits:
                 print(f"\n{name}:")
-                for r in results[:5]:
-                    text = r.inner_text().strip()
-                    print(f"  -> {text}")
-
-                    # Click into exact/close matches
-                    if name.upper().replace(' ', '') in text.upper().replace(' ', ''):
-                        href = r.get_attribute('href')
-                        page.goto(f'https://search.sunbiz.org{href}' if href.startswith('/') else href)
-                        page.wait_for_load_state('networkidle')
-                        body = page.inner_text('body')
-                        for line in body.split('\n'):
-                            line = line.strip()
-                            if line and len(line) > 2 and len(line) < 200:
-                                print(f"     {line}")
-                        page.go_back()
-                        page.wait_for_load_state('networkidle')
-                        break
+                for hit in hits:
+                    print(f"  -> {hit['name']}  {hit['doc']}  {hit['status']}")
+                # Open the first exact/close match
+                key = name.upper().replace(' ', '')
+                match = next((h for h in hits if key in h['name'].upper().replace(' ', '')), None)
+                if match:
+                    page.goto(match['url'])
+                    page.wait_for_load_state('networkidle')
+                    show(entity_detail(page))
             else:
                 print(f"{name}: (no results)")
 
@@ -60,37 +54,16 @@ def search():
         page.click('input[type="submit"], button[type="submit"]')
         page.wait_for_load_state('networkidle')
 
-        results = page.query_selector_all('a[href*="SearchResultDetail"]')
-        entries = []
-        for r in results[:15]:
-            text = r.inner_text().strip()
-            href = r.get_attribute('href')
-            if 'DELGADO, ALBERTO' in text or 'DELGADO , ALBERTO' in text:
-                entries.append((text, href))
+        entries = [h for h in search_results(page, limit=15)
+                   if 'DELGADO, ALBERTO' in h['name'] or 'DELGADO , ALBERTO' in h['name']]
 
-        for i, (text, href) in enumerate(entries[:10]):
-            print(f"\n--- Entry {i+1}: {text} ---")
-            full_url = f'https://search.sunbiz.org{href}' if href.startswith('/') else href
-            page.goto(full_url)
+        for i, hit in enumerate(entries[:10]):
+            print(f"\n--- Entry {i+1}: {hit['name']} ---")
+            page.goto(hit['url'])
             page.wait_for_load_state('networkidle')
-            body = page.inner_text('body')
-            for line in body.split('\n'):
-                line = line.strip()
-                if line and len(line) > 2 and len(line) < 200:
-                    # Filter to key details
-                    if any(kw in line for kw in [
-                        'Document', 'Date Filed', 'Status', 'EIN', 'FEI',
-                        'Principal', 'Registered', 'Name', 'Address',
-                        'DELGADO', 'VALIDO', 'ALBERTO', 'LLC', 'Corp',
-                        'Title', 'AMBR', 'MGR', 'Active', 'Inactive',
-                        'Fort Lauderdale', 'Miami', 'Florida',
-                        'Profit', 'Limited', 'Avli', 'Avalia',
-                        'Cloud', 'Technology', 'L7', 'Apex',
-                        'Saavedra', 'Bonterra', 'YHVH',
-                    ]):
-                        print(f"  {line}")
+            show(entity_detail(page))
 
-        browser.close()
+        session.close()
 
 if __name__ == '__main__':
     search()
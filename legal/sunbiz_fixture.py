@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for search.sunbiz.org — the search forms, result lists and
+entity detail pages the legal/ scripts drive, served from a small in-memory
+registry. Point a script at it with --base to run it without touching the
+state's site; --latency adds a per-request delay like the real one.
+
+Usage: python3 sunbiz_fixture.py [--port 8765] [--latency 0.3]
+"""
+import argparse
+import hashlib
+import html
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, urlsplit
+
+SEARCH_PAGES = {
+    'ByName': 'Entity Name',
+    'ByOfficerOrRegisteredAgent': 'Officer/Registered Agent Name',
+    'ByRegisteredAgent': 'Registered Agent Name',
+    'ByDocumentNumber': 'Document Number',
+    'ByFeiEinNumber': 'FEI/EIN Number',
+}
+
+# Document number -> entity. Enough variety for name prefixes, shared
+# agents and officers, and an inactive record.
+ENTITIES = {
+    'L19000154273': {
+        'name': 'AVALIA CONSULTING LLC',
+        'type': 'Florida Limited Liability Company',
+        'fei': '84-2183945',
+        'filed': '06/11/2019',
+        'state': 'FL',
+        'status': 'ACTIVE',
+        'last_event': 'REINSTATEMENT',
+        'event_date': '10/09/2025',
+        'address': '1812 SW 17TH ST\nBOCA RATON, FL 33486',
+        'agent': ('DENORCHIA, ALEC', '1812 SW 17TH ST\nBOCA RATON, FL 33486'),
+        'officers': [('AMBR', 'DENORCHIA, ALEC', '1812 SW 17TH ST\nBOCA RATON, FL 33486')],
+        'reports': [('2023', '09/28/2025'), ('2024', '10/09/2025'), ('2025', '10/09/2025')],
+    },
+    'P14000052811': {
+        'name': 'AVLI INC',
+        'type': 'Florida Profit Corporation',
+        'fei': '47-1234567',
+        'filed': '06/19/2014',
+        'state': 'FL',
+        'status': 'ACTIVE',
+        'last_event': '',
+        'event_date': '',
+        'address': '200 S BISCAYNE BLVD\nMIAMI, FL 33131',
+        'agent': ('SAAVEDRA, RODRIGO', '200 S BISCAYNE BLVD\nMIAMI, FL 33131'),
+        'officers': [('P', 'SAAVEDRA, RODRIGO', '200 S BISCAYNE BLVD\nMIAMI, FL 33131')],
+        'reports': [('2024', '01/22/2024'), ('2025', '02/03/2025'), ('2026', '01/15/2026')],
+    },
+    'L21000311902': {
+        'name': 'CITY BIRD HOLDINGS LLC',
+        'type': 'Florida Limited Liability Company',
+        'fei': 'NONE',
+        'filed': '07/02/2021',
+        'state': 'FL',
+        'status': 'INACTIVE',
+        'last_event': 'ADMIN DISSOLUTION FOR ANNUAL REPORT',
+        'event_date': '09/22/2023',
+        'address': '55 MERRICK WAY\nCORAL GABLES, FL 33134',
+        'agent': ('SAAVEDRA, RODRIGO', '55 MERRICK WAY\nCORAL GABLES, FL 33134'),
+        'officers': [('MGR', 'SAAVEDRA, RODRIGO', '55 MERRICK WAY\nCORAL GABLES, FL 33134')],
+        'reports': [('2022', '04/30/2022')],
+    },
+    'L23000087310': {
+        'name': 'EMERALD TABLET STUDIO LLC',
+        'type': 'Florida Limited Liability Company',
+        'fei': 'NONE',
+        'filed': '02/14/2023',
+        'state': 'FL',
+        'status': 'ACTIVE',
+        'last_event': '',
+        'event_date': '',
+        'address': '9 HERMES LN\nORLANDO, FL 32801',
+        'agent': ('REGISTERED AGENTS INC', '7901 4TH ST N STE 300\nST PETERSBURG, FL 33702'),
+        'officers': [('MGR', 'TRISMEGISTUS, HERMES', '9 HERMES LN\nORLANDO, FL 32801')],
+        'reports': [('2024', '03/01/2024'), ('2025', '02/27/2025')],
+    },
+    'P98000041122': {
+        'name': 'OPUS MAGNUM CORP',
+        'type': 'Florida Profit Corporation',
+        'fei': '65-0812345',
+        'filed': '05/05/1998',
+        'state': 'FL',
+        'status': 'ACTIVE',
+        'last_event': 'AMENDMENT',
+        'event_date': '11/12/2019',
+        'address': '1 ALCHEMY CT\nTAMPA, FL 33602',
+        'agent': ('FLAMEL, NICOLAS', '1 ALCHEMY CT\nTAMPA, FL 33602'),
+        'officers': [('P', 'FLAMEL, NICOLAS', '1 ALCHEMY CT\nTAMPA, FL 33602'),
+                     ('VP', 'FLAMEL, PERENELLE', '1 ALCHEMY CT\nTAMPA, FL 33602')],
+        'reports': [('2024', '01/05/2024'), ('2025', '01/06/2025'), ('2026', '01/04/2026')],
+    },
+}
+
+def detail_href(doc_number):
+    return ('/Inquiry/CorporationSearch/SearchResultDetail?inquirytype=DocumentNumber'
+            f'&directionType=Initial&aggregateId={quote(doc_number)}')
+
+def matches(page, term):
+    """Document numbers of entities a search page returns for `term`."""
+    term = ' '.join(term.upper().replace(',', ' ').split())
+    if not term:
+        return []
+    found = []
+    for doc, e in ENTITIES.items():
+        if page == 'ByName':
+            hit = e['name'].startswith(term)
+        elif page == 'ByDocumentNumber':
+            hit = doc == term
+        elif page == 'ByFeiEinNumber':
+            hit = e['fei'].replace('-', '') == term.replace('-', '')
+        else:
+            people = [e['agent'][0]]
+            if page == 'ByOfficerOrRegisteredAgent':
+                people += [name for _, name, _ in e['officers']]
+            hit = any(' '.join(p.replace(',', ' ').split()).startswith(term) for p in people)
+        if hit:
+            found.append(doc)
+    return sorted(found, key=lambda d: ENTITIES[d]['name'])
+
+def lines(text):
+    return '<br/>'.join(html.escape(l) for l in text.split('\n'))
+
+def render_detail(doc):
+    e = ENTITIES[doc]
+    officers = ''.join(
+        f'<span>Title&nbsp;{html.escape(t)}</span><br/><br/>{html.escape(n)}<br/>'
+        f'<span><div>{lines(a)}</div></span><br/>' for t, n, a in e['officers'])
+    reports = ''.join(f'<tr><td>{y}</td><td>{d}</td></tr>' for y, d in e['reports'])
+    # Document Images: every filing, newest first
+    filed = [(d, 'ANNUAL REPORT') for _, d in e['reports']] + [(e['filed'], e['type'])]
+    if e['last_event'] and e['event_date']:
+        filed.append((e['event_date'], e['last_event']))
+    filed.sort(key=lambda f: f[0][6:] + f[0][:5], reverse=True)
+    images = ''.join(
+        f'<tr><td><a href="/DocumentImages/{doc}-{n}.pdf">{d} -- {html.escape(what)}</a></td>'
+        f'<td><span>View image in PDF format</span></td></tr>' for n, (d, what) in enumerate(filed))
+    return f'''<div class="searchResultDetail">
+<div class="detailSection corporationName"><p>{html.escape(e['type'])}</p><p>{html.escape(e['name'])}</p></div>
+<div class="detailSection filingInformation"><span>Filing Information</span><div>
+<label for="Detail_DocumentId">Document Number</label><span>{doc}</span>
+<label for="Detail_FeiEinNumber">FEI/EIN Number</label><span>{e['fei']}</span>
+<label for="Detail_FileDate">Date Filed</label><span>{e['filed']}</span>
+<label for="Detail_EntityStateCountry">State</label><span>{e['state']}</span>
+<label for="Detail_Status">Status</label><span>{e['status']}</span>
+<label for="Detail_LastEvent">Last Event</label><span>{html.escape(e['last_event'])}</span>
+<label for="Detail_LastEventFileDate">Event Date Filed</label><span>{e['event_date']}</span>
+</div></div>
+<div class="detailSection"><span>Principal Address</span><div>{lines(e['address'])}</div></div>
+<div class="detailSection"><span>Registered Agent Name &amp; Address</span>
+<span>{html.escape(e['agent'][0])}</span><br/><span><div>{lines(e['agent'][1])}</div></span></div>
+<div class="detailSection"><span>Authorized Person(s) Detail</span><span>Name &amp; Address</span><br/><br/>{officers}</div>
+<div class="detailSection"><span>Annual Reports</span><table>
+<tr><td class="AnnualReportHeader">Report Year</td><td class="AnnualReportHeader">Filed Date</td></tr>{reports}</table></div>
+<div class="detailSection"><span>Document Images</span><table>{images}</table></div>
+</div>'''
+
+def page(title, body):
+    return f'''<!DOCTYPE html><html><head><meta charset="utf-8"><title>{title}</title></head>
+<body><div id="maincontent"><h2>{title}</h2>
+{body}
+<nav>{' '.join(f'<a href="/Inquiry/CorporationSearch/{k}">Search by {v}</a>' for k, v in SEARCH_PAGES.items())}</nav>
+</div></body></html>'''
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive, like the real site
+    latency = 0.0
+
+    def setup(self):
+        super().setup()
+        # Headers and body go out as two writes; don't let Nagle hold the body
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def log_message(self, fmt, *args):
+        pass
+
+    def reply(self, status, body, etag=None):
+        data = body.encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        if etag:
+            self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def redirect(self, location, status=302):
+        self.send_response(status)
+        self.send_header('Location', location)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        url = urlsplit(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        name = url.path.rsplit('/', 1)[-1]
+        if name in SEARCH_PAGES:
+            self.reply(200, page(f'Search by {SEARCH_PAGES[name]}', f'''
+<form method="post" action="{url.path}">
+<label for="SearchTerm">{SEARCH_PAGES[name]}</label>
+<input id="SearchTerm" name="SearchTerm" type="text" value="">
+<input type="submit" value="Search Now">
+</form>'''))
+        elif name == 'GetDocument':
+            # Old-style permalink: the registry answers with a redirect to the detail page
+            self.redirect(detail_href(query.get('aggregateId', '')))
+        elif name == 'SearchByDocumentNumber':
+            self.results('ByDocumentNumber', query.get('SearchTerm', ''))
+        elif name == 'SearchResultDetail':
+            doc = query.get('aggregateId', '')
+            if doc in ENTITIES:
+                body = page('Detail by Document Number', render_detail(doc))
+                etag = '"%s"' % hashlib.sha1(body.encode()).hexdigest()[:16]
+                if self.headers.get('If-None-Match') == etag:
+                    self.reply(304, '', etag)
+                else:
+                    self.reply(200, body, etag)
+            else:
+                self.reply(404, page('Error', '<p>No Records Found</p>'))
+        else:
+            self.reply(404, page('Error', '<p>Page not found</p>'))
+
+    def do_POST(self):
+        time.sleep(self.latency)
+        name = urlsplit(self.path).path.rsplit('/', 1)[-1]
+        form = parse_qs(self.rfile.read(int(self.headers.get('Content-Length') or 0)).decode())
+        if name not in SEARCH_PAGES:
+            self.reply(404, page('Error', '<p>Page not found</p>'))
+            return
+        self.results(name, form.get('SearchTerm', [''])[0])
+
+    def results(self, name, term):
+        docs = matches(name, term)
+        if not docs:
+            self.reply(200, page('Search Results', '<p>No Records Found</p>'))
+            return
+        rows = ''.join(
+            f'<tr><td><a href="{detail_href(d)}">{html.escape(ENTITIES[d]["name"])}</a></td>'
+            f'<td>{d}</td><td>{ENTITIES[d]["status"].title()}</td></tr>' for d in docs)
+        self.reply(200, page('Search Results', f'<table id="search-results">{rows}</table>'))
+
+
+def serve(port=0, latency=0.0):
+    """Start the fixture on a background thread; returns (server, base_url)."""
+    handler = type('Handler', (FixtureHandler,), {'latency': latency})
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_address[1]}'
+
+if __name__ == '__main__':
+    ap = argparse.ArgumentParser(description='Local stand-in for search.sunbiz.org')
+    ap.add_argument('--port', type=int, default=8765)
+    ap.add_argument('--latency', type=float, default=0.0, help='seconds added to every request')
+    args = ap.parse_args()
+    server, base = serve(args.port, args.latency)
+    print(f"Sunbiz fixture at {base} ({len(ENTITIES)} entities, latency {args.latency}s)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
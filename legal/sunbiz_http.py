@@ -0,0 +1,575 @@
+#!/usr/bin/env python3
+"""
+Sunbiz lookups over plain HTTP — no browser.
+
+Search forms, result lists and detail pages are server-rendered, so a
+read-only lookup is a form GET, a form POST and an HTML parse. LookupClient
+keeps keep-alive connections per host, runs lookups on a thread pool,
+spaces requests per host and shares repeated queries — the same contract as
+SearchEngine, without Chromium. Filing flows stay on Playwright.
+
+    with LookupClient() as client:
+        hits = client.search('name', 'Avalia')       # [(text, url), ...]
+        page = client.get(hits[0][1])                 # Page: .title, .text(), .links()
+
+Recorded fixtures: record=DIR saves every exchange as JSON keyed by method,
+path and body; replay=DIR answers from those files and never opens a socket.
+
+With cache= an entity_cache.EntityCache, detail pages and entity(doc) are
+answered from the local store while fresh and revalidated when stale.
+
+Usage: python3 sunbiz_http.py --selftest   # record + replay against sunbiz_fixture
+"""
+import argparse
+import hashlib
+import html as htmllib
+import http.client
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+from urllib.parse import urlencode, urljoin, urlsplit
+
+SUNBIZ = 'https://search.sunbiz.org'
+USER_AGENT = ('Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) '
+              'AppleWebKit/537.36 (KHTML, like Gecko) '
+              'Chrome/120.0.0.0 Safari/537.36')
+
+SEARCH_PATHS = {
+    'name': '/Inquiry/CorporationSearch/ByName',
+    'officer': '/Inquiry/CorporationSearch/ByOfficerOrRegisteredAgent',
+    'agent': '/Inquiry/CorporationSearch/ByRegisteredAgent',
+    'document': '/Inquiry/CorporationSearch/ByDocumentNumber',
+    'fei': '/Inquiry/CorporationSearch/ByFeiEinNumber',
+}
+DETAIL = 'SearchResultDetail'
+TIMEOUT = 30
+MAX_REDIRECTS = 5
+
+# Tags that start a new line in rendered text, as innerText would
+BLOCK_TAGS = {'address', 'article', 'br', 'div', 'form', 'h1', 'h2', 'h3', 'h4',
+              'h5', 'h6', 'header', 'footer', 'li', 'nav', 'ol', 'p', 'section',
+              'table', 'tr', 'ul'}
+
+
+# Filing Information labels on a detail page: <label for="Detail_X">
+DETAIL_FIELDS = {
+    'DocumentId': 'doc',
+    'FeiEinNumber': 'fei',
+    'FileDate': 'filed',
+    'EntityStateCountry': 'state',
+    'Status': 'status',
+    'LastEvent': 'last_event',
+    'LastEventFileDate': 'event_date',
+}
+DETAIL_LABEL = re.compile(r'<label for="Detail_(\w+)">[^<]*</label>\s*<span>([^<]*)</span>')
+DETAIL_SECTION = re.compile(r'<div class="detailSection[^"]*">')
+REPORT_ROW = re.compile(r'^(\d{4}) (\d{2}/\d{2}/\d{4})$')
+FILING_ROW = re.compile(r'^(\d{2}/\d{2}/\d{4}) -- (.+?)(?: View image in PDF format)?$')
+
+
+def query_key(kind, term):
+    return kind, ' '.join(term.upper().split())
+
+
+# ═══ Parsing ═══
+
+class _PageParser(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.title = ''
+        self.links = []      # [href, text]
+        self.forms = []      # {'action', 'method', 'fields', 'text_fields'}
+        self.chunks = []
+        self._in = []
+        self._link = None
+
+    def handle_starttag(self, tag, attrs):
+        a = dict(attrs)
+        if tag in ('script', 'style', 'title'):
+            self._in.append(tag)
+        if tag in BLOCK_TAGS:
+            self.chunks.append('\n')
+        if tag == 'a' and a.get('href') is not None:
+            self._link = [a['href'], '']
+            self.links.append(self._link)
+        elif tag == 'form':
+            self.forms.append({'action': a.get('action') or '', 'method': (a.get('method') or 'get').lower(),
+                               'fields': {}, 'text_fields': []})
+        elif tag in ('input', 'select', 'textarea') and self.forms and a.get('name'):
+            kind = (a.get('type') or 'text').lower()
+            if kind in ('submit', 'button', 'image', 'reset'):
+                return
+            if kind in ('checkbox', 'radio') and 'checked' not in a:
+                return
+            self.forms[-1]['fields'][a['name']] = a.get('value') or ''
+            if kind in ('text', 'search') and tag == 'input':
+                self.forms[-1]['text_fields'].append(a['name'])
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+
+    def handle_endtag(self, tag):
+        if self._in and self._in[-1] == tag:
+            self._in.pop()
+        if tag == 'a':
+            self._link = None
+        if tag in BLOCK_TAGS:
+            self.chunks.append('\n')
+        elif tag in ('label', 'span', 'td', 'th'):
+            self.chunks.append(' ')
+
+    def handle_data(self, data):
+        if 'title' in self._in:
+            self.title += data
+        if self._in:
+            return
+        self.chunks.append(data)
+        if self._link is not None:
+            self._link[1] += data
+
+
+class Page:
+    """A fetched page: url (after redirects), status and html, parsed on demand."""
+
+    def __init__(self, url, status, html, headers=()):
+        self.url = url
+        self.status = status
+        self.html = html
+        self.headers = headers
+        self._parsed = None
+
+    def header(self, name):
+        return next((v for k, v in self.headers if k.lower() == name), None)
+
+    @property
+    def parsed(self):
+        if self._parsed is None:
+            self._parsed = _PageParser()
+            self._parsed.feed(self.html)
+            self._parsed.close()
+        return self._parsed
+
+    @property
+    def title(self):
+        return ' '.join(self.parsed.title.split())
+
+    def text(self):
+        """Visible text, one block per line, like the browser's innerText."""
+        lines = (' '.join(l.split()) for l in ''.join(self.parsed.chunks).split('\n'))
+        return '\n'.join(l for l in lines if l)
+
+    def links(self, contains=''):
+        """(text, absolute url) for every link whose href contains `contains`."""
+        return [(' '.join(text.split()), urljoin(self.url, href))
+                for href, text in self.parsed.links if contains in href]
+
+    def search_form(self):
+        """The first form with a text box, preferring one named SearchTerm."""
+        forms = [f for f in self.parsed.forms if f['text_fields']]
+        for f in forms:
+            if 'SearchTerm' in f['text_fields']:
+                return f, 'SearchTerm'
+        return (forms[0], forms[0]['text_fields'][0]) if forms else (None, None)
+
+
+def parse_detail(page):
+    """The entity record on a SearchResultDetail page, or None if it isn't one.
+
+    Filing Information comes from its labelled spans; the other sections
+    are read as text, one detailSection at a time.
+    """
+    fields = {k: htmllib.unescape(v).strip() for k, v in DETAIL_LABEL.findall(page.html)}
+    starts = [m.start() for m in DETAIL_SECTION.finditer(page.html)] + [len(page.html)]
+    sections = [('corporationName' in page.html[a:a + 60],
+                 Page(page.url, 200, page.html[a:b]).text().split('\n'))
+                for a, b in zip(starts, starts[1:])]
+    return detail_record(fields, sections)
+
+def detail_record(fields, sections):
+    """Build the entity record from the Filing Information spans
+    {Detail_ suffix: text} and the page's other detailSections as
+    (is the name section, text lines). Shared by parse_detail and the
+    in-browser extract.entity_detail."""
+    fields = {DETAIL_FIELDS[k]: v for k, v in fields.items() if k in DETAIL_FIELDS}
+    if not fields.get('doc'):
+        return None
+    record = dict.fromkeys(DETAIL_FIELDS.values(), '')
+    record.update(fields, name='', type='', principal='', mailing='',
+                  agent={'name': '', 'address': ''}, officers=[], reports=[], filings=[])
+    for is_name, lines in sections:
+        head = lines[0] if lines else ''
+        if is_name:
+            record['type'], record['name'] = (lines + ['', ''])[:2]
+        elif head == 'Principal Address':
+            record['principal'] = '\n'.join(lines[1:])
+        elif head == 'Mailing Address':
+            record['mailing'] = '\n'.join(lines[1:])
+        elif head.startswith('Registered Agent'):
+            record['agent'] = {'name': (lines + [''])[1], 'address': '\n'.join(lines[2:])}
+        elif head.startswith(('Authorized Person', 'Officer/Director')):
+            for line in lines[1:]:
+                if line.startswith('Title '):
+                    record['officers'].append({'title': line[6:].strip(), 'name': '', 'address': ''})
+                elif record['officers'] and not record['officers'][-1]['name']:
+                    record['officers'][-1]['name'] = line
+                elif record['officers']:
+                    o = record['officers'][-1]
+                    o['address'] = (o['address'] + '\n' + line).strip()
+        elif head == 'Annual Reports':
+            record['reports'] = [list(m.groups()) for m in map(REPORT_ROW.match, lines) if m]
+        elif head == 'Document Images':
+            record['filings'] = [list(m.groups()) for m in map(FILING_ROW.match, lines) if m]
+    return record
+
+
+# ═══ Transport ═══
+
+class ConnectionPool:
+    """Idle keep-alive connections per (scheme, host), handed out one per request."""
+
+    def __init__(self, timeout=TIMEOUT):
+        self.timeout = timeout
+        self.idle = {}
+        self.lock = threading.Lock()
+        self.opened = 0
+
+    def _take(self, scheme, host):
+        with self.lock:
+            conns = self.idle.get((scheme, host))
+            if conns:
+                return conns.pop(), True
+            self.opened += 1
+        cls = http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+        return cls(host, timeout=self.timeout), False
+
+    def request(self, method, url, body=None, headers=None):
+        """One exchange; returns (status, headers, body bytes)."""
+        parts = urlsplit(url)
+        path = (parts.path or '/') + (f'?{parts.query}' if parts.query else '')
+        while True:
+            conn, reused = self._take(parts.scheme, parts.netloc)
+            try:
+                conn.request(method, path, body=body, headers=headers or {})
+                resp = conn.getresponse()
+                data = resp.read()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                conn.close()
+                if reused:
+                    continue  # the server dropped an idle connection; open a fresh one
+                raise
+            except Exception:
+                conn.close()
+                raise
+            if resp.will_close:
+                conn.close()
+            else:
+                with self.lock:
+                    self.idle.setdefault((parts.scheme, parts.netloc), []).append(conn)
+            return resp.status, resp.getheaders(), data
+
+    def close(self):
+        with self.lock:
+            for conns in self.idle.values():
+                for conn in conns:
+                    conn.close()
+            self.idle.clear()
+
+
+class HostLimiter:
+    """Spaces request starts to each host at least 1/rate seconds apart."""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0.0
+        self.next_slot = {}
+        self.lock = threading.Lock()
+
+    def wait(self, url):
+        if not self.interval:
+            return
+        host = urlsplit(url).netloc
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot.get(host, 0.0))
+            self.next_slot[host] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class Recorder:
+    """Exchanges on disk, keyed by method, path+query and body (not host)."""
+
+    def __init__(self, path, replay=False):
+        self.path = path
+        self.replay = replay
+        os.makedirs(path, exist_ok=True)
+
+    def file(self, method, url, body):
+        parts = urlsplit(url)
+        key = f"{method} {parts.path}?{parts.query}\n".encode() + (body or b'')
+        return os.path.join(self.path, hashlib.sha256(key).hexdigest()[:24] + '.json')
+
+    def load(self, method, url, body):
+        try:
+            with open(self.file(method, url, body)) as f:
+                r = json.load(f)
+        except FileNotFoundError:
+            raise LookupError(f"Not recorded: {method} {url}") from None
+        return r['status'], [tuple(h) for h in r['headers']], r['body'].encode('utf-8', 'surrogateescape')
+
+    def save(self, method, url, body, status, headers, data):
+        keep = [h for h in headers if h[0].lower() in ('location', 'set-cookie', 'content-type',
+                                                       'etag', 'last-modified')]
+        with open(self.file(method, url, body), 'w') as f:
+            json.dump({'method': method, 'url': url, 'request': (body or b'').decode(),
+                       'status': status, 'headers': keep,
+                       'body': data.decode('utf-8', 'surrogateescape')}, f, indent=1)
+
+
+# ═══ Client ═══
+
+class LookupClient:
+    """Read-only Sunbiz lookups on `workers` threads over pooled connections.
+
+    `rate` caps requests per second per host (0 = no cap). record/replay
+    take a directory of recorded exchanges.
+    """
+
+    def __init__(self, workers=8, rate=8.0, base=SUNBIZ, record=None, replay=None, cache=None):
+        self.base = base.rstrip('/')
+        self.cache = cache
+        self.pool = ConnectionPool()
+        self.limiter = HostLimiter(0 if replay else rate)
+        self.executor = ThreadPoolExecutor(workers)
+        self.recorder = Recorder(replay, replay=True) if replay else Recorder(record) if record else None
+        self.cookies = {}
+        self.lock = threading.Lock()
+        self.results = {}
+        self.requests = 0
+        self.searches = 0
+        self.deduped = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.executor.shutdown()
+        self.pool.close()
+        if self.cache is not None:
+            self.cache.close()
+
+    def _exchange(self, method, url, body, extra=None):
+        host = urlsplit(url).netloc
+        headers = {'User-Agent': USER_AGENT, 'Accept': 'text/html', **(extra or {})}
+        with self.lock:
+            self.requests += 1
+            jar = dict(self.cookies.get(host, {}))
+        if jar:
+            headers['Cookie'] = '; '.join(f'{k}={v}' for k, v in jar.items())
+        if body is not None:
+            headers['Content-Type'] = 'application/x-www-form-urlencoded'
+        if self.recorder and self.recorder.replay:
+            status, resp_headers, data = self.recorder.load(method, url, body)
+        else:
+            self.limiter.wait(url)
+            status, resp_headers, data = self.pool.request(method, url, body, headers)
+            if self.recorder:
+                self.recorder.save(method, url, body, status, resp_headers, data)
+        for name, value in resp_headers:
+            if name.lower() == 'set-cookie':
+                k, _, v = value.split(';', 1)[0].partition('=')
+                with self.lock:
+                    self.cookies.setdefault(host, {})[k.strip()] = v.strip()
+        return status, resp_headers, data
+
+    def fetch(self, url, data=None, headers=None):
+        """GET `url`, or POST the `data` form to it; follows redirects."""
+        method, body = ('POST', urlencode(data).encode()) if data is not None else ('GET', None)
+        for _ in range(MAX_REDIRECTS + 1):
+            status, resp_headers, raw = self._exchange(method, url, body, headers)
+            location = next((v for k, v in resp_headers if k.lower() == 'location'), None)
+            if status in (301, 302, 303, 307, 308) and location:
+                url = urljoin(url, location)
+                if status in (301, 302, 303):
+                    method, body = 'GET', None
+                continue
+            return Page(url, status, raw.decode('utf-8', 'replace'), resp_headers)
+        raise RuntimeError(f"Too many redirects from {url}")
+
+    def get(self, url):
+        url = urljoin(self.base + '/', url)
+        if self.cache is None or DETAIL not in url:
+            return self.fetch(url)
+        row = self.cache.by_url(url)
+        if row and self.cache.fresh(row):
+            return Page(url, 200, row['html'])
+        return self._detail(url, row)[0]
+
+    def _detail(self, url, row=None):
+        """Fetch a detail page into the cache, conditionally if `row` has
+        validators; returns (page, record)."""
+        headers = {}
+        if row and row['etag']:
+            headers['If-None-Match'] = row['etag']
+        if row and row['last_modified']:
+            headers['If-Modified-Since'] = row['last_modified']
+        page = self.fetch(url, headers=headers)
+        if page.status == 304 and row:
+            self.cache.touch(row['doc'], unchanged=True)
+            return Page(url, 200, row['html']), row['record']
+        record = parse_detail(page)
+        if record is not None:
+            self.cache.put(record['doc'], url, record, page.html,
+                           page.header('etag'), page.header('last-modified'))
+        return page, record
+
+    def entity(self, doc, max_age=None):
+        """The parsed record for document number `doc`; None if there is none.
+
+        Served from the cache while younger than `max_age` seconds (default:
+        the cache's TTL); a stale entry is revalidated at its detail URL, a
+        missing one found through the document-number search.
+        """
+        doc = doc.strip().upper()
+        row = self.cache.get(doc) if self.cache is not None else None
+        if row and urlsplit(row['url']).netloc != urlsplit(self.base).netloc:
+            row = None  # cached from another registry host (a fixture, say)
+        if row and self.cache.fresh(row, max_age):
+            return row['record']
+        if row:
+            return self._detail(row['url'], row)[1]
+        hits = self.search_page('document', doc).links(DETAIL)
+        if not hits:
+            return None
+        if self.cache is None:
+            return parse_detail(self.fetch(hits[0][1]))
+        return self._detail(hits[0][1])[1]
+
+    def entities(self, docs, max_age=None):
+        """entity() for each document number, in parallel, in the order given."""
+        return list(self.executor.map(lambda d: self.entity(d, max_age), docs))
+
+    def search_page(self, kind, term):
+        """The result page for one query, submitted through the site's own form."""
+        form_page = self.get(SEARCH_PATHS[kind])
+        form, field = form_page.search_form()
+        if form is None:
+            raise RuntimeError(f"No search box on {form_page.url}")
+        fields = dict(form['fields'], **{field: term})
+        action = urljoin(form_page.url, form['action'] or form_page.url)
+        if form['method'] == 'post':
+            return self.fetch(action, fields)
+        return self.fetch(f"{action.split('?')[0]}?{urlencode(fields)}")
+
+    def _search(self, kind, term):
+        with self.lock:
+            self.searches += 1
+        return self.search_page(kind, term).links(DETAIL)
+
+    def search_async(self, kind, term):
+        """Future of the hits for one query; repeats share the first one's future."""
+        key = query_key(kind, term)
+        with self.lock:
+            if key in self.results:
+                self.deduped += 1
+            else:
+                self.results[key] = self.executor.submit(self._search, kind, key[1])
+            return self.results[key]
+
+    def search(self, kind, term):
+        return self.search_async(kind, term).result()
+
+    def search_many(self, queries):
+        """Hits for each (kind, term), in the order given, fetched in parallel."""
+        futures = [self.search_async(kind, term) for kind, term in queries]
+        return [f.result() for f in futures]
+
+    def get_many(self, urls):
+        return list(self.executor.map(self.get, urls))
+
+
+def add_lookup_args(ap, workers=8):
+    """The --base/--workers/--rate/--record/--replay options lookup scripts share."""
+    ap.add_argument('--base', default=SUNBIZ, help='search host (default: the real Sunbiz)')
+    ap.add_argument('--workers', type=int, default=workers, help='lookups in flight at once')
+    ap.add_argument('--rate', type=float, default=8.0, help='requests per second per host (0 = no cap)')
+    ap.add_argument('--record', metavar='DIR', help='save every exchange to DIR')
+    ap.add_argument('--replay', metavar='DIR', help='answer from DIR, offline')
+    ap.add_argument('--max-age', type=float, metavar='HOURS',
+                    help='serve cached entity details younger than this (default: the cache TTL)')
+    ap.add_argument('--no-cache', action='store_true', help='always fetch entity details from the registry')
+    return ap
+
+def client_from_args(args):
+    cache = None
+    # Recording and replaying need every request to really happen
+    if not (args.no_cache or args.record or args.replay):
+        from entity_cache import EntityCache
+        cache = EntityCache(ttl=args.max_age * 3600 if args.max_age is not None else None)
+    return LookupClient(workers=args.workers, rate=args.rate, base=args.base,
+                        record=args.record, replay=args.replay, cache=cache)
+
+
+def selftest():
+    """Record a sweep against sunbiz_fixture, replay it offline, compare."""
+    import tempfile
+    from sunbiz_fixture import ENTITIES, serve
+    server, base = serve(latency=0.05)
+    queries = [('name', n) for n in ('Avalia', 'AVLI', 'City Bird', 'Opus', 'Emerald', 'Nothing')] + \
+              [('officer', 'Saavedra Rodrigo'), ('agent', 'Saavedra'), ('document', 'L19000154273'),
+               ('fei', '84-2183945'), ('name', 'avalia ')]
+    ok = True
+    with tempfile.TemporaryDirectory() as rec:
+        timings = {}
+        for workers in (1, 8):
+            with LookupClient(workers=workers, rate=0, base=base, record=rec) as c:
+                start = time.monotonic()
+                live = c.search_many(queries)
+                details = c.get_many([hits[0][1] for hits in live if hits])
+                timings[workers] = time.monotonic() - start
+                print(f"  live, {workers} worker(s): {c.searches} searches, {c.deduped} shared, "
+                      f"{c.requests} requests on {c.pool.opened} connections, {timings[workers]:.2f}s")
+        with LookupClient(rate=0, base=base) as c:
+            # A 302 to the detail page, with and without request headers of our own
+            for headers in (None, {'If-None-Match': '"stale"'}):
+                moved = c.fetch(f'{base}/Inquiry/CorporationSearch/GetDocument?aggregateId=L19000154273',
+                                headers=headers)
+                record = parse_detail(moved)
+                if moved.status != 200 or DETAIL not in moved.url or not record \
+                        or record['doc'] != 'L19000154273':
+                    print(f"  redirect: got {moved.status} at {moved.url}")
+                    ok = False
+        server.shutdown()
+        server.server_close()
+        with LookupClient(base='http://127.0.0.1:9', replay=rec) as c:
+            replayed = c.search_many(queries)
+            replayed_details = c.get_many([hits[0][1].replace(base, c.base) for hits in replayed if hits])
+        strip = lambda runs: [[(t, urlsplit(u).path + '?' + urlsplit(u).query) for t, u in hits] for hits in runs]
+        if strip(live) != strip(replayed) or [d.text() for d in details] != [d.text() for d in replayed_details]:
+            print("  replay differs from live run")
+            ok = False
+        expected = {'Avalia': ['AVALIA CONSULTING LLC'], 'Nothing': []}
+        for (kind, term), hits in zip(queries, live):
+            if term in expected and [t for t, _ in hits] != expected[term]:
+                print(f"  {kind} {term!r}: got {hits}")
+                ok = False
+        if not any(e['name'] in details[0].text() for e in ENTITIES.values()):
+            print("  detail page text missing the entity name")
+            ok = False
+    print(f"  replay offline: {'identical' if ok else 'MISMATCH'}; "
+          f"parallel speedup {timings[1] / max(timings[8], 1e-9):.1f}x")
+    return ok
+
+if __name__ == '__main__':
+    ap = argparse.ArgumentParser(description='Sunbiz lookups over HTTP')
+    ap.add_argument('--selftest', action='store_true', help='record and replay against sunbiz_fixture')
+    args = ap.parse_args()
+    if args.selftest:
+        raise SystemExit(0 if selftest() else 1)
+    ap.print_help()
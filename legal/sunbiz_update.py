@@ -10,16 +10,14 @@ sys.path.insert(0, '/Users/rnir_hrc_avd/Library/Python/3.9/lib/python/site-packa
 
 from playwright.sync_api import sync_playwright
 
+from browser_daemon import Session
+
 DOC_NUMBER = 'L19000154273'
 
 def update_entity():
     with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page(
-            user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) '
-                       'AppleWebKit/537.36 (KHTML, like Gecko) '
-                       'Chrome/120.0.0.0 Safari/537.36'
-        )
+        session = Session(p, 'sunbiz_update')
+        page = session.page
 
         # Step 1: Annual Report e-filing
         print("=" * 60)
@@ -185,7 +183,7 @@ def update_entity():
             full_page=True
         )
 
-        browser.close()
+        session.close()
 
 if __name__ == '__main__':
     update_entity()
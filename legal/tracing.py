@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Where a legal/ script's time goes: every page call it waits on, timed,
+with the bytes the page pulled in meanwhile, written as a Chrome trace.
+
+Each browser_daemon.Session traces its page; nothing to add to a script.
+The page's navigation, wait, input, screenshot and read calls (TRACED)
+become spans named by what they waited for: "wait_for_load_state
+networkidle", "click #submit". A StepRunner step is a span around its
+calls, and a StepRunner wait is one span under its own key ("ready
+#editor", "navigation"). Transferred bytes come from the page's CDP
+Network events and are charged to the spans open when they arrive.
+
+    trace = Tracer('annual-report')
+    trace.attach(page)                # or: await trace.attach_async(page)
+    with trace.span('Saving officer', 'step'):
+        ...
+    trace.close()                     # writes the trace, prints the tables
+
+A trace is TRACES/<name>/<started>.json; open it in chrome://tracing or
+ui.perfetto.dev. L7_NO_TRACE=1 turns tracing off.
+
+Usage: python3 tracing.py [FILE or NAME]   — tables for a trace (default: the latest)
+"""
+import collections
+import contextlib
+import glob
+import inspect
+import json
+import os
+import sys
+import time
+
+TRACES = os.path.expanduser('~/.l7/traces')
+
+# Page methods that are traced, and the kind of work each is
+TRACED = {
+    'goto': 'navigation', 'reload': 'navigation', 'go_back': 'navigation', 'go_forward': 'navigation',
+    'wait_for_load_state': 'wait', 'wait_for_selector': 'wait', 'wait_for_url': 'wait',
+    'wait_for_function': 'wait', 'wait_for_timeout': 'sleep',
+    'click': 'input', 'fill': 'input', 'type': 'input', 'press': 'input', 'check': 'input',
+    'select_option': 'input', 'set_input_files': 'input',
+    'screenshot': 'screenshot', 'pdf': 'screenshot',
+    'content': 'read', 'inner_text': 'read', 'evaluate': 'read',
+    'query_selector': 'read', 'query_selector_all': 'read',
+}
+SLOWEST = 8
+
+
+def enabled():
+    return not os.environ.get('L7_NO_TRACE')
+
+def reason(method, args):
+    """Span name for a page call: the method and what it was given."""
+    arg = args[0] if args and isinstance(args[0], str) else ''
+    if method in ('goto', 'wait_for_url'):
+        arg = arg.split('?')[0]
+    return f'{method} {arg[:60]}'.strip()
+
+def size(n):
+    return f'{n / 1048576:.1f} MB' if n >= 1048576 else f'{n / 1024:.0f} KB'
+
+
+class Tracer:
+    """Spans and network bytes for one script run, on one or more pages."""
+
+    def __init__(self, name, root=TRACES, log=print):
+        self.name = name
+        self.log = log
+        self.path = os.path.join(root, name, time.strftime('%Y%m%d-%H%M%S') + '.json')
+        self.started = time.strftime('%Y-%m-%d %H:%M:%S')
+        self.t0 = time.perf_counter()
+        self.events = [{'name': 'process_name', 'ph': 'M', 'pid': 1, 'args': {'name': name}}]
+        self.stacks = {}
+        self.tids = {}
+        self.bytes = 0
+        self.requests = 0
+
+    def _now(self):
+        return round((time.perf_counter() - self.t0) * 1e6)
+
+    # ── spans ──
+
+    def open(self, name, cat, page=None, **args):
+        return self._open(name, cat, self.tids.get(id(page), 0), args)
+
+    def _open(self, name, cat, tid, args):
+        span = {'name': name, 'cat': cat, 'tid': tid, 'ts': self._now(),
+                'args': dict(args, bytes=0, requests=0)}
+        self.stacks.setdefault(tid, []).append(span)
+        return span
+
+    def finish(self, span, **args):
+        stack = self.stacks[span['tid']]
+        if span in stack:
+            stack.remove(span)
+        span['args'].update(args)
+        self.events.append({'name': span['name'], 'cat': span['cat'], 'ph': 'X', 'pid': 1,
+                            'tid': span['tid'], 'ts': span['ts'],
+                            'dur': self._now() - span['ts'], 'args': span['args']})
+
+    @contextlib.contextmanager
+    def span(self, name, cat='step', page=None, **args):
+        span = self.open(name, cat, page, **args)
+        try:
+            yield span
+        finally:
+            self.finish(span)
+
+    def _received(self, tid, n):
+        self.bytes += n
+        self.requests += 1
+        for span in self.stacks.get(tid, []):
+            span['args']['bytes'] += n
+            span['args']['requests'] += 1
+        self.events.append({'name': 'network', 'ph': 'C', 'pid': 1, 'ts': self._now(),
+                            'args': {'KB': round(self.bytes / 1024)}})
+
+    # ── pages ──
+
+    def _traced(self, fn, method, cat, tid):
+        # Only calls made directly in a step (or outside any) get a span;
+        # inside a StepRunner wait the wait already names the reason
+        def nested():
+            stack = self.stacks[tid]
+            return stack and stack[-1]['cat'] != 'step'
+
+        if inspect.iscoroutinefunction(fn):
+            async def traced(*args, **kwargs):
+                if nested():
+                    return await fn(*args, **kwargs)
+                span = self._open(reason(method, args), cat, tid, {})
+                try:
+                    return await fn(*args, **kwargs)
+                finally:
+                    self.finish(span)
+        else:
+            def traced(*args, **kwargs):
+                if nested():
+                    return fn(*args, **kwargs)
+                span = self._open(reason(method, args), cat, tid, {})
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self.finish(span)
+        return traced
+
+    def _wrap(self, page):
+        tid = self.tids[id(page)] = len(self.tids)
+        self.stacks.setdefault(tid, [])
+        self.events.append({'name': 'thread_name', 'ph': 'M', 'pid': 1, 'tid': tid,
+                            'args': {'name': f'page {tid}'}})
+        for method, cat in TRACED.items():
+            if hasattr(page, method):
+                setattr(page, method, self._traced(getattr(page, method), method, cat, tid))
+        return tid
+
+    def attach(self, page):
+        """Trace `page` (sync API)."""
+        tid = self._wrap(page)
+        try:
+            cdp = page.context.new_cdp_session(page)
+            cdp.on('Network.loadingFinished', lambda e: self._received(tid, e['encodedDataLength']))
+            cdp.send('Network.enable')
+        except Exception:
+            # Not Chromium: the body size the server declared is the best there is
+            page.on('response', lambda r: self._received(tid, int(r.headers.get('content-length') or 0)))
+        return page
+
+    async def attach_async(self, page):
+        """Trace `page` (async API)."""
+        tid = self._wrap(page)
+        try:
+            cdp = await page.context.new_cdp_session(page)
+            cdp.on('Network.loadingFinished', lambda e: self._received(tid, e['encodedDataLength']))
+            await cdp.send('Network.enable')
+        except Exception:
+            page.on('response', lambda r: self._received(tid, int(r.headers.get('content-length') or 0)))
+        return page
+
+    # ── finish ──
+
+    def close(self):
+        """Write the trace and print where the time went."""
+        for stack in self.stacks.values():
+            for span in list(stack):
+                self.finish(span, unfinished=True)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path + '.tmp', 'w') as f:
+            json.dump({'traceEvents': self.events, 'displayTimeUnit': 'ms',
+                       'otherData': {'script': self.name, 'started': self.started}}, f)
+        os.replace(self.path + '.tmp', self.path)
+        report(self.events, self.log, steps=False)
+        self.log(f"      Trace: {self.path}")
+
+
+def report(events, log=print, steps=True):
+    """Tables for a trace: per step (if asked), per kind of call, and the
+    waits that cost the most in total."""
+    spans = [e for e in events if e.get('ph') == 'X']
+    calls = [e for e in spans if e['cat'] != 'step']
+    if steps:
+        rows = [e for e in spans if e['cat'] == 'step']
+        if rows:
+            log(f"\n      {'Step':<44} {'wall':>7} {'in calls':>9} {'bytes':>8} {'reqs':>5}")
+        for n, s in enumerate(rows, 1):
+            inside = sum(c['dur'] for c in calls if c['tid'] == s['tid'] and
+                         s['ts'] <= c['ts'] < s['ts'] + s['dur'])
+            log(f"      {n:>2}. {s['name'][:40]:<40} {s['dur'] / 1e6:6.2f}s {inside / 1e6:8.2f}s "
+                f"{size(s['args']['bytes']):>8} {s['args']['requests']:>5}")
+    kinds = collections.defaultdict(lambda: [0, 0, 0])
+    waits = collections.defaultdict(lambda: [0, 0, 0])
+    for c in calls:
+        for table, key in ((kinds, c['cat']), (waits, c['name'])):
+            row = table[key]
+            row[0] += 1
+            row[1] += c['dur']
+            row[2] = max(row[2], c['dur'])
+    total = sum(c['args']['requests'] for c in calls)
+    received = sum(c['args']['bytes'] for c in calls)
+    log(f"\n      Time in page calls ({len(calls)} calls, {size(received)} in {total} requests):")
+    for kind, (count, dur, _) in sorted(kinds.items(), key=lambda kv: -kv[1][1]):
+        log(f"      {kind:<44} {count:>4}x {dur / 1e6:7.2f}s")
+    log("      Slowest calls and waits, by total time:")
+    for name, (count, dur, longest) in sorted(waits.items(), key=lambda kv: -kv[1][1])[:SLOWEST]:
+        log(f"      {name[:44]:<44} {count:>4}x {dur / 1e6:7.2f}s  (longest {longest / 1e6:.2f}s)")
+
+def latest(which=None, root=TRACES):
+    if which and os.path.isfile(which):
+        return which
+    found = sorted(glob.glob(os.path.join(root, which or '*', '*.json')), key=os.path.getmtime)
+    return found[-1] if found else None
+
+if __name__ == '__main__':
+    path = latest(sys.argv[1] if len(sys.argv) > 1 else None)
+    if path is None:
+        raise SystemExit(f"No traces under {TRACES}")
+    with open(path) as f:
+        trace = json.load(f)
+    print(f"{path}  ({trace['otherData']['script']}, {trace['otherData']['started']})")
+    report(trace['traceEvents'])